@@ -0,0 +1,283 @@
+"""
+Benchmarks of the load -> filter -> render pipeline.
+
+Run from the repository root, e.g.::
+
+    python -m benchmarks.run_benchmarks --sizes 10000 100000 1000000
+    python -m benchmarks.run_benchmarks --compare old_results.json
+
+Each benchmark is timed over several runs, then run once more under
+tracemalloc to record its peak Python allocation. Results are written as
+JSON so that runs on different commits can be compared.
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import generate_fridges, generate_recipes
+from src.data_loader import DataLoader
+from src.filter import FilterCache, RecipeFilter
+from src.interaction_index import InteractionIndex
+from src.metrics import calculate_mtm_score, calculate_mtm_scores
+from src.nutrition import NUTRITION_COLUMNS, get_nutrition_lists
+from src.visualization.dashboard import RecipeVisualizer
+
+INTERACTIONS_FILE = "dataset/PP_interactions_final.csv.zip"
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+
+def measure(function, repeat: int) -> dict:
+    """
+    Time a function and measure its peak memory allocation.
+
+    Parameters:
+    ----------
+    function : callable
+        Function to benchmark, called without arguments.
+    repeat : int
+        Number of timed runs.
+
+    Returns:
+    -------
+    dict
+        Median and minimum duration in seconds and peak allocation in MB.
+    """
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "median_s": statistics.median(durations),
+        "min_s": min(durations),
+        "repeat": repeat,
+        "peak_mb": peak / 2**20,
+    }
+
+
+def benchmark_recipes(size: int, repeat: int, n_queries: int) -> list:
+    """
+    Run the recipe benchmarks on a synthetic dataset.
+
+    Parameters:
+    ----------
+    size : int
+        Number of synthetic recipes.
+    repeat : int
+        Number of timed runs per benchmark.
+    n_queries : int
+        Number of ingredient selections per filtering benchmark run.
+
+    Returns:
+    -------
+    list
+        One result dictionary per benchmark.
+    """
+    results = []
+    raw_recipes = generate_recipes(size)
+    fridges = generate_fridges(n_queries)
+
+    def record(name: str, function, runs: int = repeat) -> None:
+        result = {"benchmark": name, "size": size, **measure(function, runs)}
+        results.append(result)
+        print(
+            f"{name:<28} {size:>9}  {result['median_s'] * 1000:>10.2f} ms"
+            f"  {result['peak_mb']:>9.1f} MB"
+        )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_name = os.path.join(tmp_dir, "recipes.csv")
+        raw_recipes.to_csv(file_name, index=False)
+        data_loader = DataLoader(cache_dir=None)
+        record(
+            "load_and_parse_data",
+            lambda: data_loader.load_and_parse_data(file_name),
+            runs=1,
+        )
+        recipes_df, _, ingredient_index = data_loader.load_and_parse_data(file_name)
+
+    nutrition = recipes_df[NUTRITION_COLUMNS]
+    nutrition_lists = get_nutrition_lists(recipes_df)
+    record("mtm_scoring_batch", lambda: calculate_mtm_scores(nutrition))
+    record(
+        "mtm_scoring_scalar",
+        lambda: nutrition_lists.apply(calculate_mtm_score),
+        runs=1,
+    )
+
+    def filter_by_ingredients() -> None:
+        for fridge in fridges:
+            recipe_filter = RecipeFilter(recipes_df, ingredient_index)
+            recipe_filter.filter_by_ingredients(fridge)
+            recipe_filter.get_filtered_recipes()
+
+    def filter_cached() -> None:
+        cache = FilterCache()
+        for _ in range(2):
+            for fridge in fridges:
+                recipe_filter = RecipeFilter(recipes_df, ingredient_index)
+                recipe_filter.apply_query(fridge, cache=cache)
+                recipe_filter.get_filtered_recipes()
+
+    def filter_by_nutrition() -> None:
+        recipe_filter = RecipeFilter(recipes_df, ingredient_index)
+        recipe_filter.filter_by_nutrition(protein_min=10, carbs_min=20, fat_max=50)
+        recipe_filter.get_filtered_recipes()
+
+    visualizer = RecipeVisualizer(
+        recipes_df, pd.DataFrame(), ingredient_index=ingredient_index
+    )
+
+    def suggestions_matching() -> None:
+        for fridge in fridges:
+            visualizer.get_suggested_recipes(fridge[:3])
+
+    record("filter_by_ingredients", filter_by_ingredients)
+    record("filter_cached", filter_cached)
+    record("filter_by_nutrition", filter_by_nutrition)
+    record("suggestions_matching", suggestions_matching)
+    return results
+
+
+def benchmark_interactions(repeat: int, n_queries: int) -> list:
+    """
+    Run the popularity chart benchmarks on the real interactions file.
+
+    Parameters:
+    ----------
+    repeat : int
+        Number of timed runs per benchmark.
+    n_queries : int
+        Number of recipes looked up per run.
+
+    Returns:
+    -------
+    list
+        One result dictionary per benchmark, empty if the file is missing.
+    """
+    if not os.path.exists(INTERACTIONS_FILE):
+        print(f"Skipping interactions benchmarks: {INTERACTIONS_FILE} not found.")
+        return []
+
+    interactions_df, interaction_index = DataLoader(cache_dir=None).load_interactions(
+        INTERACTIONS_FILE
+    )
+    rng = np.random.default_rng(0)
+    recipe_ids = rng.choice(interactions_df["recipe_id"].unique(), n_queries)
+    size = len(interactions_df)
+
+    def popularity_lookup() -> None:
+        for recipe_id in recipe_ids:
+            interaction_index.get_daily_counts(recipe_id)
+
+    results = []
+    for name, function in [
+        ("interaction_index_build", lambda: InteractionIndex(interactions_df)),
+        ("popularity_chart_prep", popularity_lookup),
+    ]:
+        result = {"benchmark": name, "size": size, **measure(function, repeat)}
+        results.append(result)
+        print(
+            f"{name:<28} {size:>9}  {result['median_s'] * 1000:>10.2f} ms"
+            f"  {result['peak_mb']:>9.1f} MB"
+        )
+    return results
+
+
+def get_commit() -> str:
+    """
+    Get the current git commit, if any.
+
+    Returns:
+    -------
+    str
+        The commit hash, or None outside of a git checkout.
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: list, baseline_file: str) -> None:
+    """
+    Print the ratio of each median duration to a previous run.
+
+    Parameters:
+    ----------
+    results : list
+        Results of the current run.
+    baseline_file : str
+        JSON file written by a previous run.
+    """
+    with open(baseline_file, "r") as f:
+        baseline = {
+            (result["benchmark"], result["size"]): result
+            for result in json.load(f)["results"]
+        }
+
+    print(f"\nComparison with {baseline_file} (ratio > 1 is slower):")
+    for result in results:
+        old = baseline.get((result["benchmark"], result["size"]))
+        if old:
+            ratio = result["median_s"] / old["median_s"]
+            print(f"{result['benchmark']:<28} {result['size']:>9}  x{ratio:.2f}")
+
+
+def main() -> None:
+    """
+    Parse the command line, run the benchmarks and write the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="results of a previous run")
+    args = parser.parse_args()
+
+    # Keep the output readable; the app logs to files anyway
+    logging.basicConfig(level=logging.ERROR)
+
+    results = []
+    for size in args.sizes:
+        results += benchmark_recipes(size, args.repeat, args.queries)
+    results += benchmark_interactions(args.repeat, args.queries)
+
+    report = {
+        "commit": get_commit(),
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
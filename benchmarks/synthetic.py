@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+
+def generate_ingredient_names(n_ingredients: int = 1200) -> list:
+    """
+    Generate the names of a synthetic ingredient vocabulary.
+
+    Parameters:
+    ----------
+    n_ingredients : int, optional
+        Number of distinct ingredients (default is 1200, like the dataset).
+
+    Returns:
+    -------
+    list
+        Ingredient names, from the most to the least common.
+    """
+    return [f"ingredient {i:04d}" for i in range(n_ingredients)]
+
+
+def generate_recipes(
+    n_recipes: int, n_ingredients: int = 1200, seed: int = 0
+) -> pd.DataFrame:
+    """
+    Generate raw recipes shaped like "PP_recipes_final.csv".
+
+    Ingredients follow a Zipf-like distribution so that a few of them are
+    used by most recipes, as in the real dataset. The "nutrition",
+    "ingredient_PP" and "steps" columns are strings, as read from the CSV.
+
+    Parameters:
+    ----------
+    n_recipes : int
+        Number of recipes to generate.
+    n_ingredients : int, optional
+        Size of the ingredient vocabulary (default is 1200).
+    seed : int, optional
+        Seed of the random generator (default is 0).
+
+    Returns:
+    -------
+    pd.DataFrame
+        The raw recipes.
+    """
+    rng = np.random.default_rng(seed)
+    names = np.array(generate_ingredient_names(n_ingredients), dtype=object)
+
+    # Ingredients: 3 to 12 per recipe, drawn with Zipf-like weights
+    weights = 1 / np.arange(1, n_ingredients + 1)
+    weights /= weights.sum()
+    lengths = rng.integers(3, 13, size=n_recipes)
+    picks = names[rng.choice(n_ingredients, size=lengths.sum(), p=weights)]
+    ingredient_lists = np.split(picks, np.cumsum(lengths)[:-1])
+
+    # Nutrition: [calories, fat, sugar, sodium, protein, saturated_fat, carbs]
+    protein = rng.gamma(2.0, 8.0, n_recipes).round(1)
+    fat = rng.gamma(2.0, 9.0, n_recipes).round(1)
+    carbs = rng.gamma(2.5, 15.0, n_recipes).round(1)
+    calories = (protein * 4 + carbs * 4 + fat * 9).round(1)
+    sugar = (carbs * rng.uniform(0, 0.5, n_recipes)).round(1)
+    sodium = rng.gamma(1.5, 2.0, n_recipes).round(1)
+    saturated_fat = (fat * rng.uniform(0, 0.6, n_recipes)).round(1)
+    columns = [calories, fat, sugar, sodium, protein, saturated_fat, carbs]
+    nutrition = "[" + pd.Series(columns[0]).astype(str)
+    for values in columns[1:]:
+        nutrition = nutrition + ", " + pd.Series(values).astype(str)
+    nutrition = nutrition + "]"
+
+    return pd.DataFrame(
+        {
+            "id": np.arange(1, n_recipes + 1),
+            "name": [f"recipe {i}" for i in range(n_recipes)],
+            "ingredient_PP": [str(list(x)) for x in ingredient_lists],
+            "nutrition": nutrition,
+            "steps": "['mix everything', 'cook', 'serve']",
+            "avg_date": rng.uniform(0, 12, n_recipes).round(2),
+        }
+    )
+
+
+def generate_fridges(n_fridges: int, n_ingredients: int = 1200, seed: int = 0) -> list:
+    """
+    Generate random fridge contents, i.e. ingredient selections.
+
+    Parameters:
+    ----------
+    n_fridges : int
+        Number of selections to generate.
+    n_ingredients : int, optional
+        Size of the ingredient vocabulary (default is 1200).
+    seed : int, optional
+        Seed of the random generator (default is 0).
+
+    Returns:
+    -------
+    list
+        Lists of 5 to 30 ingredient names, biased towards common ones.
+    """
+    rng = np.random.default_rng(seed)
+    names = generate_ingredient_names(n_ingredients)
+    popular = min(n_ingredients, max(n_ingredients // 10, 30))
+    return [
+        [names[i] for i in rng.choice(popular, rng.integers(5, 31), replace=False)]
+        for _ in range(n_fridges)
+    ]
@@ -1,29 +1,62 @@
 import os
 import logging
+import sys
 import zipfile
+import numpy as np
 import pandas as pd
-import streamlit as st
 import ast
-from src.metrics import calculate_mtm_score
+from src.dataset_cache import DatasetCache
+from src.ingredient_index import IngredientIndex
+from src.ingredient_search import IngredientSearch
+from src.instrumentation import instrument
+from src.interaction_index import InteractionIndex
+from src.metrics import calculate_mtm_scores
+from src.nutrition import NUTRITION_COLUMNS, parse_nutrition
 
 # Create a logger for this module
 logger = logging.getLogger(__name__)
 
+# Number of rows parsed at once when streaming a CSV file out of a ZIP archive
+CSV_CHUNK_SIZE = 100_000
+
+# Maximum share of distinct values for a string column to become categorical
+CATEGORY_MAX_RATIO = 0.5
+
 
 class DataLoader:
     """
     A class for loading, extracting, and processing data files
     for a Streamlit application.
+
+    Parsed results are kept on disk by ``DatasetCache``; keeping them in
+    memory once per process is the job of ``src.dataset.get_dataset``.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self, cache_dir: str = "dataset/.cache", stream_zip: bool = True
+    ) -> None:
         """
         Initialize the DataLoader class.
+
+        Parameters:
+        ----------
+        cache_dir : str, optional
+            Directory of the on-disk cache of parsed datasets
+            (default is "dataset/.cache"). None disables the cache.
+        stream_zip : bool, optional
+            Read CSV files straight out of ZIP archives (default is True).
+            If False, archives are extracted next to the dataset first.
         """
+        self.cache = DatasetCache(cache_dir) if cache_dir else None
+        self.stream_zip = stream_zip
+        # Recipe x ingredient matrix, ingredient ids (name to id) and
+        # ingredient options of the last parsed recipes
+        self.ingredient_index = None
+        self.ingredient_ids = None
+        self.ingredient_search = None
         logger.info("DataLoader initialized.")
 
-    @st.cache_data
-    def unzip_data(_self, file_name: str) -> list:
+    def unzip_data(self, file_name: str) -> list:
         """
         Extract a ZIP file to a new directory.
 
@@ -63,8 +96,7 @@ class DataLoader:
             logger.error("Error while extracting %s: %s", file_name, str(e))
             raise
 
-    @st.cache_data
-    def load_data(_self, file_name: str) -> pd.DataFrame:
+    def load_data(self, file_name: str) -> pd.DataFrame:
         """
         Load data from a CSV or ZIP file into a pandas DataFrame.
 
@@ -90,8 +122,11 @@ class DataLoader:
                 df = pd.read_csv(file_name)
                 logger.info("Loaded CSV file: %s", file_name)
 
+            elif file_name.endswith(".zip") and self.stream_zip:
+                df = self.read_zip_csv(file_name)
+
             elif file_name.endswith(".zip"):
-                extracted_files = _self.unzip_data(file_name)
+                extracted_files = self.unzip_data(file_name)
                 csv_file = next(
                     (f for f in extracted_files if f.endswith(".csv")), None
                 )
@@ -111,11 +146,67 @@ class DataLoader:
             logger.error("Error while loading data from %s: %s", file_name, str(e))
             raise
 
-    @st.cache_data
-    def load_and_parse_data(_self, file_name: str) -> tuple:
+    def read_zip_csv(
+        self, file_name: str, chunksize: int = CSV_CHUNK_SIZE
+    ) -> pd.DataFrame:
+        """
+        Read the CSV file of a ZIP archive as a stream, without extracting it.
+
+        Resource-fork entries ("__MACOSX/" and "._*" files) are skipped and
+        the CSV member is parsed in chunks straight from the archive.
+
+        Parameters:
+        ----------
+        file_name : str
+            Path to the ZIP file.
+        chunksize : int, optional
+            Number of rows parsed per chunk (default is CSV_CHUNK_SIZE).
+
+        Returns:
+        -------
+        pd.DataFrame
+            Loaded data.
+
+        Raises:
+        ------
+        ValueError:
+            If the archive holds no CSV file.
+        """
+        with zipfile.ZipFile(file_name, "r") as zip_ref:
+            csv_member = next(
+                (
+                    member
+                    for member in zip_ref.namelist()
+                    if member.endswith(".csv")
+                    and not member.startswith("__MACOSX/")
+                    and not os.path.basename(member).startswith("._")
+                ),
+                None,
+            )
+
+            if not csv_member:
+                raise ValueError(f"No CSV file found in {file_name}")
+
+            with zip_ref.open(csv_member) as stream:
+                chunks = pd.read_csv(stream, chunksize=chunksize)
+                df = pd.concat(chunks, ignore_index=True)
+
+        logger.info("Streamed CSV from ZIP: %s (%s)", file_name, csv_member)
+        return df
+
+    @instrument(
+        "data_loader.load_and_parse_data",
+        rows_out=lambda result, *args, **kwargs: len(result[0]),
+    )
+    def load_and_parse_data(self, file_name: str) -> tuple:
         """
         Load and parse data, calculating additional metrics and parsing columns.
 
+        The parsed result is read from the on-disk cache when it matches the
+        source file, and stored there otherwise. The recipe x ingredient
+        matrix and the ingredient ids (name to id) are also kept in the
+        ``ingredient_index`` and ``ingredient_ids`` attributes.
+
         Parameters:
         ----------
         file_name : str
@@ -125,8 +216,11 @@ class DataLoader:
         -------
         tuple
             A tuple containing:
-            - Processed DataFrame.
-            - Set of unique ingredients across all rows.
+            - Processed DataFrame, with the nutrition values stored in the
+              float32 columns listed in ``NUTRITION_COLUMNS``.
+            - Tuple of the unique ingredients across all rows, most common
+              first. Their search index is kept in ``ingredient_search``.
+            - IngredientIndex of the "ingredient_PP" column, in row order.
 
         Raises:
         ------
@@ -134,37 +228,235 @@ class DataLoader:
             For any data loading or processing errors.
         """
         try:
-            df = _self.load_data(file_name)
+            cached = self.cache.load(file_name) if self.cache else None
 
-            # Parse "nutrition" column
-            df["nutrition"] = df["nutrition"].apply(
-                lambda x: (
-                    [float(i) for i in ast.literal_eval(x)] if isinstance(x, str) else x
+            if cached:
+                frames, arrays = cached
+                df = self.optimize_memory(frames["recipes"], "recipes")
+                ingredient_index = IngredientIndex.from_arrays(
+                    arrays["ingredient_index"]
                 )
+            else:
+                df, ingredient_index = self.parse_recipes(self.load_data(file_name))
+                df = self.optimize_memory(df, "recipes")
+                if self.cache and os.path.exists(file_name):
+                    self.cache.save(
+                        file_name,
+                        {"recipes": df},
+                        {"ingredient_index": ingredient_index.to_arrays()},
+                    )
+
+            self.ingredient_index = ingredient_index
+            self.ingredient_ids = ingredient_index.ingredient_ids
+
+            # Generate the ingredient options, most common first
+            self.ingredient_search = IngredientSearch(ingredient_index)
+            ingredient_list = self.ingredient_search.options
+            logger.info(
+                "Generated ingredient list with %d unique ingredients.",
+                len(ingredient_list),
             )
 
-            # Parse "ingredient_PP" column
-            df["ingredient_PP"] = df["ingredient_PP"].apply(
-                lambda x: ast.literal_eval(x) if isinstance(x, str) else x
+            return df, ingredient_list, ingredient_index
+
+        except Exception as e:
+            logger.error(
+                "Error while loading and parsing data from %s: %s", file_name, str(e)
             )
+            raise
+
+    def parse_recipes(self, df: pd.DataFrame) -> tuple:
+        """
+        Parse the raw recipes columns and calculate the MTM scores.
+
+        Parameters:
+        ----------
+        df : pd.DataFrame
+            Raw recipes data, as read from the CSV file.
+
+        Returns:
+        -------
+        tuple
+            A tuple containing:
+            - Processed DataFrame.
+            - IngredientIndex of the "ingredient_PP" column, in row order.
+        """
+        # Parse "nutrition" column into one typed column per nutrient
+        nutrition = parse_nutrition(df["nutrition"], dtype="float64")
+
+        # Parse "ingredient_PP" column
+        df["ingredient_PP"] = df["ingredient_PP"].apply(
+            lambda x: ast.literal_eval(x) if isinstance(x, str) else x
+        )
 
-            # Calculate MTM score
-            df["mtm_score"] = df["nutrition"].apply(calculate_mtm_score)
-            logger.info("Calculated MTM scores for %d recipes.", len(df))
+        # Calculate MTM score on the full precision values
+        df["mtm_score"] = calculate_mtm_scores(nutrition)
+        logger.info("Calculated MTM scores for %d recipes.", len(df))
 
-            # Generate unique ingredient list
-            ingredient_list = {
-                ingredient for sublist in df["ingredient_PP"] for ingredient in sublist
-            }
+        # Store the nutrients as float32 columns instead of a list column
+        df = df.drop(columns="nutrition")
+        df[NUTRITION_COLUMNS] = nutrition.astype("float32")
+
+        # Build the inverted ingredient index
+        ingredient_index = IngredientIndex(df["ingredient_PP"])
+
+        return df, ingredient_index
+
+    @instrument(
+        "data_loader.optimize_memory",
+        rows_in=lambda self, df, *args, **kwargs: len(df),
+    )
+    def optimize_memory(self, df: pd.DataFrame, name: str) -> pd.DataFrame:
+        """
+        Reduce the memory used by a loaded DataFrame, keeping its values.
+
+        Integer columns are downcast to the smallest type holding their
+        values, and float columns to float32 when that loses no precision.
+        String columns with few distinct values become categorical, and the
+        strings of list columns (e.g. "ingredient_PP") are interned, so that
+        every occurrence of an ingredient is the same object. Columns that
+        need no change are kept as they are, so memory-mapped columns stay
+        shared. The memory of each column, as given by
+        ``memory_usage(deep=True)``, is logged before and after.
+
+        Parameters:
+        ----------
+        df : pd.DataFrame
+            The DataFrame, modified in place.
+        name : str
+            Name of the DataFrame in the logs.
+
+        Returns:
+        -------
+        pd.DataFrame
+            The optimized DataFrame.
+        """
+        before = df.memory_usage(deep=True, index=False)
+
+        for column in df.columns:
+            values = df[column]
+            if isinstance(values.dtype, np.dtype) and values.dtype.kind == "i":
+                optimized = pd.to_numeric(values, downcast="integer")
+                changed = optimized.dtype != values.dtype
+            elif isinstance(values.dtype, np.dtype) and values.dtype.kind == "f":
+                optimized = pd.to_numeric(values, downcast="float")
+                # Only keep float32 when every value survives the round trip
+                changed = optimized.dtype != values.dtype and np.array_equal(
+                    optimized.to_numpy().astype(values.dtype),
+                    values.to_numpy(),
+                    equal_nan=True,
+                )
+            elif values.dtype == object:
+                optimized = self.optimize_objects(values)
+                changed = optimized is not values
+            else:
+                continue
+            if changed:
+                df[column] = optimized
+
+        after = df.memory_usage(deep=True, index=False)
+        for column in df.columns:
             logger.info(
-                "Generated ingredient list with %d unique ingredients.",
-                len(ingredient_list),
+                "Memory of %s[%s]: %.1f MB -> %.1f MB (%s).",
+                name,
+                column,
+                before[column] / 1e6,
+                after[column] / 1e6,
+                df[column].dtype,
+            )
+        logger.info(
+            "Memory of %s: %.1f MB -> %.1f MB.",
+            name,
+            before.sum() / 1e6,
+            after.sum() / 1e6,
+        )
+        return df
+
+    @staticmethod
+    def optimize_objects(values: pd.Series) -> pd.Series:
+        """
+        Convert a column of Python objects to a more compact form.
+
+        Parameters:
+        ----------
+        values : pd.Series
+            A column of strings, or of lists of strings.
+
+        Returns:
+        -------
+        pd.Series
+            A categorical column for repetitive strings, a column of lists
+            of interned strings for lists, or ``values`` itself otherwise.
+        """
+        non_null = values.dropna()
+        if non_null.empty:
+            return values
+
+        if isinstance(non_null.iloc[0], list):
+            return values.map(
+                lambda items: (
+                    [sys.intern(x) if isinstance(x, str) else x for x in items]
+                    if isinstance(items, list)
+                    else items
+                )
             )
 
-            return df, ingredient_list
+        if pd.api.types.infer_dtype(
+            non_null, skipna=False
+        ) == "string" and non_null.nunique() <= CATEGORY_MAX_RATIO * len(values):
+            return values.astype("category")
+        return values
+
+    def load_interactions(self, file_name: str) -> tuple:
+        """
+        Load the interactions data with parsed dates.
+
+        The parsed result is read from the on-disk cache when it matches the
+        source file, and stored there otherwise.
+
+        Parameters:
+        ----------
+        file_name : str
+            Path to the file.
+
+        Returns:
+        -------
+        tuple
+            A tuple containing:
+            - Interactions data, with the "date" column as datetimes.
+            - InteractionIndex of the daily interaction counts per recipe.
+
+        Raises:
+        ------
+        Exception:
+            For any data loading or processing errors.
+        """
+        try:
+            cached = self.cache.load(file_name) if self.cache else None
+
+            if cached:
+                frames, arrays = cached
+                df = self.optimize_memory(frames["interactions"], "interactions")
+                interaction_index = InteractionIndex.from_arrays(
+                    arrays["interaction_index"]
+                )
+            else:
+                df = self.load_data(file_name)
+                df["date"] = pd.to_datetime(df["date"])
+                df = self.optimize_memory(df, "interactions")
+                interaction_index = InteractionIndex(df)
+                if self.cache and os.path.exists(file_name):
+                    self.cache.save(
+                        file_name,
+                        {"interactions": df},
+                        {"interaction_index": interaction_index.to_arrays()},
+                    )
+
+            logger.info("Loaded %d interactions.", len(df))
+            return df, interaction_index
 
         except Exception as e:
             logger.error(
-                "Error while loading and parsing data from %s: %s", file_name, str(e)
+                "Error while loading interactions from %s: %s", file_name, str(e)
             )
             raise
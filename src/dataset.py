@@ -0,0 +1,238 @@
+import logging
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import streamlit as st
+from src.data_loader import DataLoader
+from src.ingredient_index import IngredientIndex
+from src.ingredient_search import IngredientSearch
+from src.interaction_index import InteractionIndex
+from src.seasonality import SeasonIndex
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+RECIPES_FILE = "dataset/PP_recipes_final.csv.zip"
+INTERACTIONS_FILE = "dataset/PP_interactions_final.csv.zip"
+
+# Loads the secondary datasets in the background, one at a time
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dataset-loader")
+
+
+def freeze_arrays(*indexes) -> None:
+    """
+    Make the NumPy arrays held by indexes read-only.
+
+    Parameters:
+    ----------
+    *indexes
+        Index objects, e.g. IngredientIndex. None values are skipped.
+    """
+    for index in indexes:
+        if index is None:
+            continue
+        for value in vars(index).values():
+            if isinstance(value, np.ndarray):
+                value.flags.writeable = False
+
+
+class RecipeDataset:
+    """
+    The parsed datasets of the application, shared by every session.
+
+    Besides the data and indexes loaded by ``DataLoader``, it holds the
+    season index of the recipes, built once here, and a ``version`` token
+    unique to this instance, used to key caches derived from the data.
+
+    The interactions are only needed by the popularity chart. They are
+    handed over as a ``Future``, so that they can load in the background;
+    ``interactions_df`` and ``interaction_index`` wait for them.
+
+    One instance is built per server process by ``get_dataset`` and handed
+    out as is, without copies. It must be treated as read-only: the arrays
+    of the indexes are frozen, and the DataFrames must not be modified in
+    place.
+    """
+
+    def __init__(
+        self,
+        recipes_df: pd.DataFrame,
+        ingredient_list: tuple,
+        ingredient_index: IngredientIndex,
+        interactions: Future,
+        ingredient_search: IngredientSearch = None,
+    ) -> None:
+        """
+        Initialize the dataset and freeze the arrays of its indexes.
+
+        Parameters:
+        ----------
+        recipes_df : pd.DataFrame
+            Parsed recipes data.
+        ingredient_list : tuple
+            Unique ingredients across all recipes, most common first.
+        ingredient_index : IngredientIndex
+            Inverted index of the recipe ingredients.
+        interactions : Future
+            Future of the interactions data, with the "date" column as
+            datetimes, and of its InteractionIndex, as a tuple.
+        ingredient_search : IngredientSearch, optional
+            Search index of the ingredient options. Built from
+            ``ingredient_index`` if not provided.
+        """
+        self.version = uuid.uuid4().hex
+        self.recipes_df = recipes_df
+        self.ingredient_list = tuple(ingredient_list)
+        if ingredient_search is None:
+            ingredient_search = IngredientSearch(ingredient_index)
+        self.ingredient_search = ingredient_search
+        self.ingredient_index = ingredient_index
+        self.interactions = interactions
+
+        # Hash index of the recipe ids, built once for O(1) lookups
+        self.recipe_ids = pd.Index(recipes_df["id"])
+        if not self.recipe_ids.is_unique:
+            logger.warning("Recipe ids are not unique; lookups return the first.")
+        self.season_index = (
+            SeasonIndex(recipes_df["avg_date"])
+            if "avg_date" in recipes_df.columns
+            else None
+        )
+
+        freeze_arrays(ingredient_index, self.season_index, self.ingredient_search)
+        interactions.add_done_callback(self.on_interactions_loaded)
+
+        logger.info("RecipeDataset ready with %d recipes.", len(recipes_df))
+
+    def get_recipe_position(self, recipe_id: int) -> int:
+        """
+        Get the row position of a recipe.
+
+        Parameters:
+        ----------
+        recipe_id : int
+            Id of the recipe.
+
+        Returns:
+        -------
+        int
+            Row position of the recipe in ``recipes_df``.
+
+        Raises:
+        ------
+        KeyError:
+            If no recipe has this id.
+        """
+        positions = self.recipe_ids.get_indexer_for([recipe_id])
+        if positions[0] < 0:
+            raise KeyError(f"Unknown recipe id: {recipe_id}")
+        return int(positions[0])
+
+    def get_recipe(self, recipe_id: int) -> pd.Series:
+        """
+        Get a recipe by id.
+
+        Parameters:
+        ----------
+        recipe_id : int
+            Id of the recipe.
+
+        Returns:
+        -------
+        pd.Series
+            The recipe row.
+
+        Raises:
+        ------
+        KeyError:
+            If no recipe has this id.
+        """
+        return self.recipes_df.iloc[self.get_recipe_position(recipe_id)]
+
+    def get_recipes(self, recipe_ids: list) -> pd.DataFrame:
+        """
+        Get recipes by id, in the order of the ids.
+
+        Parameters:
+        ----------
+        recipe_ids : list
+            Ids of the recipes. Unknown ids are skipped.
+
+        Returns:
+        -------
+        pd.DataFrame
+            The recipe rows.
+        """
+        positions = self.recipe_ids.get_indexer_for(recipe_ids)
+        return self.recipes_df.take(positions[positions >= 0])
+
+    @staticmethod
+    def on_interactions_loaded(future: Future) -> None:
+        """
+        Freeze the interaction index once loaded, or log the loading error.
+
+        Parameters:
+        ----------
+        future : Future
+            The completed future of the interactions.
+        """
+        if future.exception() is not None:
+            logger.error("Failed to load interactions: %s", future.exception())
+            return
+        interactions_df, interaction_index = future.result()
+        freeze_arrays(interaction_index)
+        logger.info("Interactions ready with %d rows.", len(interactions_df))
+
+    @property
+    def interactions_df(self) -> pd.DataFrame:
+        """
+        The interactions data, waiting for it if it is still loading.
+        """
+        return self.interactions.result()[0]
+
+    @property
+    def interaction_index(self) -> InteractionIndex:
+        """
+        The daily interaction counts, waiting for them if still loading.
+        """
+        return self.interactions.result()[1]
+
+
+@st.cache_resource
+def get_dataset(
+    recipes_file: str = RECIPES_FILE, interactions_file: str = INTERACTIONS_FILE
+) -> RecipeDataset:
+    """
+    Get the dataset shared by every session of the server process.
+
+    The data is loaded on the first call only. Later calls, from any
+    session, return the same object without copying or deserializing it.
+    The recipes are loaded before returning; the interactions keep loading
+    on a background thread.
+
+    Parameters:
+    ----------
+    recipes_file : str, optional
+        Path to the recipes file (default is RECIPES_FILE).
+    interactions_file : str, optional
+        Path to the interactions file (default is INTERACTIONS_FILE).
+
+    Returns:
+    -------
+    RecipeDataset
+        The shared, read-only dataset.
+    """
+    logger.info("Loading the shared dataset...")
+    data_loader = DataLoader()
+    recipes_df, ingredient_list, ingredient_index = data_loader.load_and_parse_data(
+        recipes_file
+    )
+    interactions = _executor.submit(DataLoader().load_interactions, interactions_file)
+    return RecipeDataset(
+        recipes_df,
+        ingredient_list,
+        ingredient_index,
+        interactions,
+        data_loader.ingredient_search,
+    )
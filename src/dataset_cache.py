@@ -0,0 +1,320 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of the cached data changes
+CACHE_VERSION = 5
+
+# Name of the Parquet file holding the non-numeric columns of a frame
+OBJECTS_FILE = "objects.parquet"
+
+# Name of the JSON file listing the columns of a frame
+COLUMNS_FILE = "columns.json"
+
+
+class DatasetCache:
+    """
+    A persistent on-disk cache of parsed datasets.
+
+    Each source file gets one entry directory. NumPy arrays and the numeric
+    and datetime columns of DataFrames are stored as ``.npy`` files, and
+    the other columns as a Parquet file. Each entry records the size,
+    modification time and SHA-256 hash of its source and is invalidated
+    automatically when the source changes.
+
+    The ``.npy`` files are memory-mapped read-only when loaded, so that the
+    server processes of a host share one copy of them in the OS page cache
+    instead of holding one copy each.
+    """
+
+    def __init__(self, cache_dir: str = "dataset/.cache", mmap_mode: str = "r") -> None:
+        """
+        Initialize the cache.
+
+        Parameters:
+        ----------
+        cache_dir : str, optional
+            Directory holding the cache entries (default is "dataset/.cache").
+        mmap_mode : str, optional
+            Mode in which the ``.npy`` files are memory-mapped (default is
+            "r", read-only). None reads them into memory instead.
+        """
+        self.cache_dir = cache_dir
+        self.mmap_mode = mmap_mode
+        logger.info("DatasetCache initialized in %s.", cache_dir)
+
+    def get_entry_dir(self, file_name: str) -> str:
+        """
+        Get the directory of the cache entry of a source file.
+
+        Parameters:
+        ----------
+        file_name : str
+            Path to the source file.
+
+        Returns:
+        -------
+        str
+            Path to the entry directory.
+        """
+        return os.path.join(self.cache_dir, os.path.basename(file_name))
+
+    @staticmethod
+    def get_file_hash(file_name: str) -> str:
+        """
+        Compute the SHA-256 hash of a file.
+
+        Parameters:
+        ----------
+        file_name : str
+            Path to the file.
+
+        Returns:
+        -------
+        str
+            Hexadecimal digest of the file content.
+        """
+        digest = hashlib.sha256()
+        with open(file_name, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def is_valid(self, file_name: str) -> bool:
+        """
+        Check whether the cache entry of a source file is up to date.
+
+        The size and modification time are compared first. If they differ,
+        the hash decides, so that a touched but unchanged file keeps its
+        entry.
+
+        Parameters:
+        ----------
+        file_name : str
+            Path to the source file.
+
+        Returns:
+        -------
+        bool
+            True if the entry exists and matches the source file.
+        """
+        meta_file = os.path.join(self.get_entry_dir(file_name), "meta.json")
+        if not (os.path.exists(file_name) and os.path.exists(meta_file)):
+            return False
+
+        with open(meta_file, "r") as f:
+            meta = json.load(f)
+        if meta.get("version") != CACHE_VERSION:
+            return False
+
+        stat = os.stat(file_name)
+        if meta["size"] == stat.st_size and meta["mtime_ns"] == stat.st_mtime_ns:
+            return True
+        if meta["size"] != stat.st_size:
+            return False
+        return meta["sha256"] == self.get_file_hash(file_name)
+
+    def load(self, file_name: str) -> tuple:
+        """
+        Load the cached data of a source file.
+
+        Parameters:
+        ----------
+        file_name : str
+            Path to the source file.
+
+        Returns:
+        -------
+        tuple
+            A tuple ``(frames, arrays)`` of dictionaries of DataFrames and
+            NumPy arrays, or None if there is no valid entry.
+        """
+        try:
+            if not self.is_valid(file_name):
+                logger.info("No valid cache entry for %s.", file_name)
+                return None
+
+            entry_dir = self.get_entry_dir(file_name)
+            frames = {
+                name: self.read_frame(os.path.join(entry_dir, "frames", name))
+                for name in sorted(os.listdir(os.path.join(entry_dir, "frames")))
+            }
+            arrays = {
+                name: self.read_arrays(os.path.join(entry_dir, "arrays", name))
+                for name in sorted(os.listdir(os.path.join(entry_dir, "arrays")))
+            }
+
+            logger.info("Loaded %s from cache %s.", file_name, entry_dir)
+            return frames, arrays
+
+        except Exception as e:
+            logger.warning("Ignoring unreadable cache for %s: %s", file_name, str(e))
+            return None
+
+    def save(self, file_name: str, frames: dict, arrays: dict = None) -> None:
+        """
+        Store the parsed data of a source file, replacing any previous entry.
+
+        Failures are logged and ignored, so that a read-only file system only
+        disables the cache.
+
+        Parameters:
+        ----------
+        file_name : str
+            Path to the source file.
+        frames : dict
+            DataFrames to store, by name.
+        arrays : dict, optional
+            Groups of NumPy arrays to store, by name.
+        """
+        entry_dir = self.get_entry_dir(file_name)
+        # One temporary directory per process, as several may write at once
+        tmp_dir = f"{entry_dir}.tmp{os.getpid()}"
+        try:
+            stat = os.stat(file_name)
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            os.makedirs(os.path.join(tmp_dir, "frames"))
+            os.makedirs(os.path.join(tmp_dir, "arrays"))
+
+            for name, df in frames.items():
+                self.write_frame(df, os.path.join(tmp_dir, "frames", name))
+            for name, group in (arrays or {}).items():
+                self.write_arrays(group, os.path.join(tmp_dir, "arrays", name))
+
+            meta = {
+                "version": CACHE_VERSION,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "sha256": self.get_file_hash(file_name),
+            }
+            with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+                json.dump(meta, f)
+
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(tmp_dir, entry_dir)
+            logger.info("Cached %s in %s.", file_name, entry_dir)
+
+        except Exception as e:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            logger.warning("Could not cache %s: %s", file_name, str(e))
+
+    @staticmethod
+    def write_arrays(arrays: dict, path: str) -> None:
+        """
+        Write a group of NumPy arrays as ``.npy`` files in a new directory.
+
+        Parameters:
+        ----------
+        arrays : dict
+            Mapping of array names to NumPy arrays, of any non-object dtype.
+        path : str
+            Path of the directory.
+        """
+        os.makedirs(path)
+        for name, array in arrays.items():
+            np.save(os.path.join(path, name + ".npy"), array, allow_pickle=False)
+
+    def read_arrays(self, path: str) -> dict:
+        """
+        Read a group of NumPy arrays written by ``write_arrays``.
+
+        Parameters:
+        ----------
+        path : str
+            Path of the directory.
+
+        Returns:
+        -------
+        dict
+            Mapping of array names to NumPy arrays, memory-mapped in the
+            ``mmap_mode`` of the cache.
+        """
+        arrays = {}
+        for entry in sorted(os.listdir(path)):
+            name, extension = os.path.splitext(entry)
+            if extension == ".npy":
+                array = np.load(os.path.join(path, entry), mmap_mode=self.mmap_mode)
+                # Plain arrays sharing the mapping, not np.memmap objects
+                arrays[name] = array.view(np.ndarray)
+        return arrays
+
+    def write_frame(self, df: pd.DataFrame, path: str) -> None:
+        """
+        Write a DataFrame in a new directory.
+
+        Numeric, boolean and datetime columns are written as ``.npy`` files
+        named after their position, the other columns as one Parquet file.
+
+        Parameters:
+        ----------
+        df : pd.DataFrame
+            The DataFrame, with unique column names.
+        path : str
+            Path of the directory.
+        """
+        columns = [str(name) for name in df.columns]
+        numeric = {
+            str(i): df[name].to_numpy()
+            for i, name in enumerate(df.columns)
+            if isinstance(df[name].dtype, np.dtype) and df[name].dtype.kind in "biufmM"
+        }
+        self.write_arrays(numeric, path)
+
+        others = [name for i, name in enumerate(df.columns) if str(i) not in numeric]
+        if others:
+            table = pa.Table.from_pandas(df[others], preserve_index=False)
+            pq.write_table(table, os.path.join(path, OBJECTS_FILE))
+        with open(os.path.join(path, COLUMNS_FILE), "w") as f:
+            json.dump(columns, f)
+
+    def read_frame(self, path: str) -> pd.DataFrame:
+        """
+        Read a DataFrame written by ``write_frame``.
+
+        The numeric columns wrap the memory-mapped arrays without copying
+        them, so they are read-only when the cache maps files read-only.
+        List columns are restored as Python lists.
+
+        Parameters:
+        ----------
+        path : str
+            Path of the directory.
+
+        Returns:
+        -------
+        pd.DataFrame
+            The stored DataFrame.
+        """
+        with open(os.path.join(path, COLUMNS_FILE), "r") as f:
+            columns = json.load(f)
+        numeric = self.read_arrays(path)
+
+        objects = {}
+        objects_file = os.path.join(path, OBJECTS_FILE)
+        if os.path.exists(objects_file):
+            table = pq.read_table(objects_file)
+            list_columns = [
+                field.name for field in table.schema if pa.types.is_list(field.type)
+            ]
+            df = table.drop_columns(list_columns).to_pandas()
+            for name in list_columns:
+                df[name] = pd.Series(table.column(name).to_pylist(), dtype=object)
+            objects = {name: df[name] for name in df.columns}
+
+        # copy=False keeps one block per array instead of consolidating them
+        return pd.DataFrame(
+            {
+                name: numeric[str(i)] if str(i) in numeric else objects[name]
+                for i, name in enumerate(columns)
+            },
+            copy=False,
+        )
@@ -1,53 +1,204 @@
 import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+import numpy as np
 import pandas as pd
+from src.ingredient_index import IngredientIndex
+from src.instrumentation import instrument
+from src.nutrition import (
+    NUTRITION_COLUMNS,
+    get_nutrition_matrix,
+    has_nutrition_columns,
+)
 
 # Create a logger for the RecipeFilter class
 logger = logging.getLogger(__name__)
 
+# Maximum number of queries kept by the shared filter cache
+FILTER_CACHE_SIZE = 1024
+
+# Slider values leaving the nutrition filter inactive
+DEFAULT_PROTEIN_MIN = 0
+DEFAULT_CARBS_MIN = 0
+DEFAULT_FAT_MAX = 150
+
+
+class FilterCache:
+    """
+    A bounded, thread-safe LRU cache of filter results.
+
+    Results are stored as read-only arrays of row positions rather than
+    DataFrames, so that an entry costs 4 bytes per matching recipe and can
+    be shared by every session. Keys are canonical queries, as built by
+    ``RecipeFilter.get_query_key``.
+    """
+
+    def __init__(self, maxsize: int = FILTER_CACHE_SIZE) -> None:
+        """
+        Initialize the cache.
+
+        Parameters:
+        ----------
+        maxsize : int, optional
+            Maximum number of results to keep (default is FILTER_CACHE_SIZE).
+        """
+        self.maxsize = maxsize
+        self.selections = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        """
+        Return the number of cached results.
+        """
+        return len(self.selections)
+
+    def get_selection(
+        self, key: Hashable, compute: Callable[[], np.ndarray]
+    ) -> np.ndarray:
+        """
+        Get a result from the cache, computing and storing it on a miss.
+
+        Parameters:
+        ----------
+        key : Hashable
+            Canonical key of the query.
+        compute : Callable[[], np.ndarray]
+            Function computing the row positions when they are not cached.
+
+        Returns:
+        -------
+        np.ndarray
+            Read-only, sorted array of the positions of the matching recipes.
+        """
+        with self.lock:
+            selection = self.selections.get(key)
+            if selection is not None:
+                self.selections.move_to_end(key)
+                self.hits += 1
+                return selection
+            self.misses += 1
+
+        selection = np.asarray(compute(), dtype=np.int32)
+        selection.setflags(write=False)
+        with self.lock:
+            self.selections[key] = selection
+            self.selections.move_to_end(key)
+            while len(self.selections) > self.maxsize:
+                self.selections.popitem(last=False)
+                self.evictions += 1
+        return selection
+
+    def get_stats(self) -> dict:
+        """
+        Get the counters of the cache.
+
+        Returns:
+        -------
+        dict
+            The keys "size", "hits", "misses", "evictions" and "nbytes", the
+            memory used by the cached arrays.
+        """
+        with self.lock:
+            return {
+                "size": len(self.selections),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "nbytes": sum(s.nbytes for s in self.selections.values()),
+            }
+
+    def clear(self) -> None:
+        """
+        Remove every result and reset the counters.
+        """
+        with self.lock:
+            self.selections.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+
+# Filter cache shared by every session of the server process
+filter_cache = FilterCache()
+
 
 class RecipeFilter:
     """
     A class to filter recipes based on ingredients and nutritional values.
+
+    The recipes DataFrame is shared, never copied: the filter only keeps the
+    row positions of the selected recipes and builds a DataFrame from them
+    in ``get_filtered_recipes``.
     """
 
-    def __init__(self, recipes_df: pd.DataFrame) -> None:
+    def __init__(
+        self, recipes_df: pd.DataFrame, ingredient_index: IngredientIndex = None
+    ) -> None:
         """
         Initialize the RecipeFilter with the original DataFrame.
 
         Parameters:
         ----------
         recipes_df : pd.DataFrame
-            DataFrame containing the recipes data.
+            DataFrame containing the recipes data. It is read but never
+            modified.
+        ingredient_index : IngredientIndex, optional
+            Prebuilt index of the "ingredient_PP" column of ``recipes_df``.
+            Built on first use if not provided.
         """
-        self.recipes_df = recipes_df.copy()
-        self.filtered_recipes = recipes_df.copy()
+        self.recipes_df = recipes_df
+        self.selection = np.arange(len(recipes_df))
+        self.ingredient_index = ingredient_index
+        self.nutrition_matrix = None
+        # Ingredient ids and matching positions, for incremental updates
+        self.ingredient_match = None
         logger.info("RecipeFilter initialized with %d recipes.", len(recipes_df))
 
     def check_empty(self) -> bool:
         """
-        Check if the filtered DataFrame is empty.
+        Check if the current selection is empty.
 
         Returns:
         -------
         bool
-            True if the DataFrame is empty, otherwise False.
+            True if no recipes are selected, otherwise False.
         """
-        if self.filtered_recipes.empty:
+        if len(self.selection) == 0:
             logger.warning("No rows left after filtering!")
             return True
         return False
 
-    def filter_by_ingredients(self, selected_ingredients: list) -> None:
+    @instrument(
+        "filter.by_ingredients",
+        rows_in=lambda self, *args, **kwargs: len(self.selection),
+        rows_out=lambda result, self, *args, **kwargs: len(self.selection),
+    )
+    def filter_by_ingredients(
+        self, selected_ingredients: list, previous_match: tuple = None
+    ) -> None:
         """
         Filter recipes based on the selected ingredients.
 
+        When the filter starts from every recipe, its result is kept in
+        ``ingredient_match``. Passing the match of a previous filter then
+        lets a later filter only read the posting lists of the ingredients
+        added or removed since, instead of every selected ingredient.
+
         Parameters:
         ----------
         selected_ingredients : list
             List of ingredients to filter recipes by. A recipe is returned
             only if all its ingredients are in the selected list.
+        previous_match : tuple, optional
+            The ``ingredient_match`` of a previous filter of the same
+            recipes, as ``(ingredient ids, matching positions)``.
         """
-        if self.filtered_recipes.empty:
+        if len(self.selection) == 0:
             logger.info("Skipping ingredient filtering; no recipes available.")
             return
 
@@ -56,40 +207,56 @@ class RecipeFilter:
             return  # Keep all recipes if no ingredients are selected
 
         if "ingredient_PP" in self.recipes_df.columns:
+            if self.ingredient_index is None:
+                self.ingredient_index = IngredientIndex(
+                    self.recipes_df["ingredient_PP"]
+                )
+
+            unfiltered = len(self.selection) == len(self.recipes_df)
+            if unfiltered and previous_match is not None:
+                matching_positions = self.ingredient_index.update_subset_recipes(
+                    *previous_match, selected_ingredients
+                )
+            else:
+                matching_positions = self.ingredient_index.find_subset_recipes(
+                    selected_ingredients
+                )
 
-            def recipe_matches(recipe_ingredients: list) -> bool:
-                """
-                Check if all recipe ingredients are in the selected ingredients.
-
-                Parameters:
-                ----------
-                recipe_ingredients : list
-                    List of ingredients in the recipe.
-
-                Returns:
-                -------
-                bool
-                    True if all recipe ingredients are in the selected ingredients.
-                """
-                return set(recipe_ingredients).issubset(set(selected_ingredients))
-
-            self.filtered_recipes = self.filtered_recipes[
-                self.filtered_recipes["ingredient_PP"].apply(recipe_matches)
-            ]
+            if unfiltered:
+                self.ingredient_match = (
+                    self.ingredient_index.encode(selected_ingredients),
+                    matching_positions,
+                )
+                self.selection = matching_positions
+            else:
+                self.selection = np.intersect1d(
+                    self.selection, matching_positions, assume_unique=True
+                )
             logger.info(
-                "Filtered by ingredients; %d recipes remain.",
-                len(self.filtered_recipes),
+                "Filtered by ingredients; %d recipes remain.", len(self.selection)
             )
         else:
-            self.filtered_recipes = self.filtered_recipes.iloc[0:0]  # Empty DataFrame
-            logger.warning("No 'ingredient_PP' column found; reset to empty DataFrame.")
+            self.selection = self.selection[:0]  # Empty selection
+            logger.warning("No 'ingredient_PP' column found; reset to empty selection.")
 
+    @instrument(
+        "filter.by_nutrition",
+        rows_in=lambda self, *args, **kwargs: len(self.selection),
+        rows_out=lambda result, self, *args, **kwargs: len(self.selection),
+    )
     def filter_by_nutrition(
-        self, protein_min: int = 0, carbs_min: int = 0, fat_max: int = 150
+        self,
+        protein_min: int = DEFAULT_PROTEIN_MIN,
+        carbs_min: int = DEFAULT_CARBS_MIN,
+        fat_max: int = DEFAULT_FAT_MAX,
+        bounds: dict = None,
     ) -> None:
         """
         Filter recipes by nutritional values.
 
+        All the bounds are combined into a single boolean mask over the
+        nutrient values, which is applied to the recipes once.
+
         Parameters:
         ----------
         protein_min : int, optional
@@ -98,79 +265,227 @@ class RecipeFilter:
             Minimum carbs value (default is 0).
         fat_max : int, optional
             Maximum fat value (default is 150).
+        bounds : dict, optional
+            Additional bounds as ``{nutrient: (min, max)}`` for any of the
+            nutrients of ``NUTRITION_COLUMNS``. Either end can be None to
+            leave it open.
+
+        Raises:
+        ------
+        ValueError:
+            If a bound refers to an unknown nutrient.
         """
-        if self.filtered_recipes.empty:
+        if len(self.selection) == 0:
             logger.info("Skipping nutrition filtering; no recipes available.")
             return
 
-        if "nutrition" in self.recipes_df.columns:
-            # Filter by protein
-            if protein_min > 0:
-                self.filtered_recipes = self.filtered_recipes[
-                    self.filtered_recipes["nutrition"].apply(
-                        lambda x: (
-                            isinstance(x, (list, tuple))
-                            and len(x) > 4
-                            and x[4] >= protein_min
-                        )
-                    )
-                ]
-                logger.info(
-                    "Filtered by protein (min %d); %d recipes remain.",
-                    protein_min,
-                    len(self.filtered_recipes),
-                )
-                if self.check_empty():
-                    return
-
-            # Filter by carbs
-            if carbs_min > 0:
-                self.filtered_recipes = self.filtered_recipes[
-                    self.filtered_recipes["nutrition"].apply(
-                        lambda x: (
-                            isinstance(x, (list, tuple))
-                            and len(x) > 6
-                            and x[6] >= carbs_min
-                        )
-                    )
-                ]
-                logger.info(
-                    "Filtered by carbs (min %d); %d recipes remain.",
-                    carbs_min,
-                    len(self.filtered_recipes),
-                )
-                if self.check_empty():
-                    return
-
-            # Filter by fat
-            if fat_max < 150:
-                self.filtered_recipes = self.filtered_recipes[
-                    self.filtered_recipes["nutrition"].apply(
-                        lambda x: (
-                            isinstance(x, (list, tuple))
-                            and len(x) > 1
-                            and x[1] <= fat_max
-                        )
-                    )
-                ]
-                logger.info(
-                    "Filtered by fat (max %d); %d recipes remain.",
-                    fat_max,
-                    len(self.filtered_recipes),
-                )
-                if self.check_empty():
-                    return
-        else:
+        if not (
+            has_nutrition_columns(self.recipes_df)
+            or "nutrition" in self.recipes_df.columns
+        ):
             logger.warning("No 'nutrition' column found; skipping nutrition filtering.")
+            return
+
+        constraints = self.get_constraints(protein_min, carbs_min, fat_max, bounds)
+        if not constraints:
+            logger.info("No nutrition bounds set; keeping all recipes.")
+            return
+
+        # Build one mask over the selected nutrient values and apply it once
+        mask = np.ones(len(self.selection), dtype=bool)
+        for nutrient, low, high in constraints:
+            column = self.get_nutrient_values(nutrient)
+            if low is not None:
+                mask &= column >= np.asarray(low, dtype=column.dtype)
+            if high is not None:
+                mask &= column <= np.asarray(high, dtype=column.dtype)
+
+        self.selection = self.selection[mask]
+        logger.info(
+            "Filtered by nutrition %s; %d recipes remain.",
+            constraints,
+            len(self.selection),
+        )
+        self.check_empty()
+
+    @staticmethod
+    def get_constraints(
+        protein_min: int = DEFAULT_PROTEIN_MIN,
+        carbs_min: int = DEFAULT_CARBS_MIN,
+        fat_max: int = DEFAULT_FAT_MAX,
+        bounds: dict = None,
+    ) -> list:
+        """
+        Collect the active nutrition bounds.
+
+        Parameters:
+        ----------
+        protein_min : int, optional
+            Minimum protein value (default is DEFAULT_PROTEIN_MIN).
+        carbs_min : int, optional
+            Minimum carbs value (default is DEFAULT_CARBS_MIN).
+        fat_max : int, optional
+            Maximum fat value (default is DEFAULT_FAT_MAX).
+        bounds : dict, optional
+            Additional bounds as ``{nutrient: (min, max)}``.
+
+        Returns:
+        -------
+        list
+            The active bounds as ``(nutrient, min, max)`` tuples.
+
+        Raises:
+        ------
+        ValueError:
+            If a bound refers to an unknown nutrient.
+        """
+        constraints = []
+        if protein_min > DEFAULT_PROTEIN_MIN:
+            constraints.append(("protein", protein_min, None))
+        if carbs_min > DEFAULT_CARBS_MIN:
+            constraints.append(("carbs", carbs_min, None))
+        if fat_max < DEFAULT_FAT_MAX:
+            constraints.append(("fat", None, fat_max))
+        for nutrient, (low, high) in (bounds or {}).items():
+            if nutrient not in NUTRITION_COLUMNS:
+                raise ValueError(f"Unknown nutrient: {nutrient}")
+            constraints.append((nutrient, low, high))
+        return constraints
+
+    def get_query_key(
+        self,
+        selected_ingredients: list,
+        protein_min: int = DEFAULT_PROTEIN_MIN,
+        carbs_min: int = DEFAULT_CARBS_MIN,
+        fat_max: int = DEFAULT_FAT_MAX,
+        bounds: dict = None,
+    ) -> tuple:
+        """
+        Build the canonical key of a query, for the filter cache.
+
+        Queries with the same result get the same key: the order and
+        duplicates of the ingredients, and the ingredients no recipe uses,
+        do not matter, nor do the bounds left at their defaults.
+
+        Parameters:
+        ----------
+        selected_ingredients : list
+            Ingredients selected by the user.
+        protein_min, carbs_min, fat_max : int, optional
+            Nutrition bounds, as for ``filter_by_nutrition``.
+        bounds : dict, optional
+            Additional nutrition bounds, as for ``filter_by_nutrition``.
+
+        Returns:
+        -------
+        tuple
+            The frozenset of the selected ingredient ids, or None when no
+            ingredient is selected, then the sorted active bounds.
+        """
+        ingredient_ids = None
+        if selected_ingredients:
+            if self.ingredient_index is None:
+                self.ingredient_index = IngredientIndex(
+                    self.recipes_df["ingredient_PP"]
+                )
+            ingredient_ids = frozenset(
+                self.ingredient_index.encode(selected_ingredients).tolist()
+            )
+        constraints = self.get_constraints(protein_min, carbs_min, fat_max, bounds)
+        return ingredient_ids, tuple(sorted(constraints, key=repr))
+
+    def apply_query(
+        self,
+        selected_ingredients: list,
+        protein_min: int = DEFAULT_PROTEIN_MIN,
+        carbs_min: int = DEFAULT_CARBS_MIN,
+        fat_max: int = DEFAULT_FAT_MAX,
+        bounds: dict = None,
+        cache: FilterCache = None,
+        cache_version: Hashable = None,
+        previous_match: tuple = None,
+    ) -> None:
+        """
+        Filter the recipes by ingredients then by nutrition.
+
+        With a cache, the result of a query is computed once and reused by
+        every later filter of the same recipes. The cache is only used when
+        no recipe was filtered out yet, since the result depends on it.
+
+        Parameters:
+        ----------
+        selected_ingredients : list
+            Ingredients selected by the user.
+        protein_min, carbs_min, fat_max : int, optional
+            Nutrition bounds, as for ``filter_by_nutrition``.
+        bounds : dict, optional
+            Additional nutrition bounds, as for ``filter_by_nutrition``.
+        cache : FilterCache, optional
+            Cache of the results.
+        cache_version : Hashable, optional
+            Version of the recipes, added to the cache keys so that results
+            of other data are never returned.
+        previous_match : tuple, optional
+            Match of a previous filter, as for ``filter_by_ingredients``.
+        """
+
+        def compute() -> np.ndarray:
+            self.filter_by_ingredients(selected_ingredients, previous_match)
+            self.filter_by_nutrition(protein_min, carbs_min, fat_max, bounds)
+            return self.selection
+
+        if (
+            cache is None
+            or len(self.selection) != len(self.recipes_df)
+            or "ingredient_PP" not in self.recipes_df.columns
+        ):
+            compute()
+            return
+
+        key = self.get_query_key(
+            selected_ingredients, protein_min, carbs_min, fat_max, bounds
+        )
+        self.selection = cache.get_selection((cache_version, key), compute)
+        logger.info("Applied query %s; %d recipes remain.", key, len(self.selection))
+
+    def get_nutrient_values(self, nutrient: str) -> np.ndarray:
+        """
+        Get the values of a nutrient for the selected recipes.
+
+        Typed nutrient columns are read in place; the legacy "nutrition"
+        list column is converted once into a cached matrix.
+
+        Parameters:
+        ----------
+        nutrient : str
+            One of the nutrients of ``NUTRITION_COLUMNS``.
+
+        Returns:
+        -------
+        np.ndarray
+            The nutrient values, aligned with the current selection.
+        """
+        if has_nutrition_columns(self.recipes_df):
+            return self.recipes_df[nutrient].to_numpy()[self.selection]
+
+        if self.nutrition_matrix is None:
+            self.nutrition_matrix = get_nutrition_matrix(self.recipes_df)
+        column = NUTRITION_COLUMNS.index(nutrient)
+        return self.nutrition_matrix[self.selection, column]
 
     def get_filtered_recipes(self) -> pd.DataFrame:
         """
         Get the filtered DataFrame.
 
+        The rows are only materialized here. When no recipe was filtered out,
+        the shared DataFrame itself is returned.
+
         Returns:
         -------
         pd.DataFrame
             The DataFrame containing the filtered recipes.
         """
-        logger.info("Returning %d filtered recipes.", len(self.filtered_recipes))
-        return self.filtered_recipes
+        logger.info("Returning %d filtered recipes.", len(self.selection))
+        if len(self.selection) == len(self.recipes_df):
+            return self.recipes_df
+        return self.recipes_df.take(self.selection)
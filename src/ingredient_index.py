@@ -0,0 +1,438 @@
+import itertools
+import logging
+import numpy as np
+import pandas as pd
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+# Arrays holding the index, besides the vocabulary
+ARRAY_NAMES = (
+    "recipe_sizes",
+    "recipe_indptr",
+    "recipe_indices",
+    "posting_indptr",
+    "posting_indices",
+    "empty_recipes",
+)
+
+
+class IngredientIndex:
+    """
+    An inverted index of the ingredients used by each recipe.
+
+    Ingredients are mapped to integer ids. The ingredients of each recipe are
+    stored as sorted id arrays (CSR layout: ``recipe_indptr`` and
+    ``recipe_indices``) and every ingredient has a posting list of the recipe
+    positions that use it (``posting_indptr`` and ``posting_indices``).
+    Recipe positions refer to the row order of the indexed DataFrame.
+
+    The CSR arrays are the recipe x ingredient incidence matrix, so overlap
+    counts and co-occurrence statistics are sparse matrix-vector products
+    (``matvec`` and ``rmatvec``). ``to_scipy`` converts it to a
+    ``scipy.sparse.csr_matrix`` when SciPy is installed.
+    """
+
+    def __init__(self, ingredient_lists: pd.Series) -> None:
+        """
+        Build the index from a column of ingredient lists.
+
+        Parameters:
+        ----------
+        ingredient_lists : pd.Series
+            Series of ingredient lists, one per recipe (e.g. "ingredient_PP").
+            Missing values are treated as recipes without ingredients.
+        """
+        lists = [x if isinstance(x, (list, tuple)) else [] for x in ingredient_lists]
+        lengths = np.fromiter((len(x) for x in lists), dtype=np.int64, count=len(lists))
+        n_recipes = len(lists)
+
+        # Map ingredient names to integer ids, sorted alphabetically
+        codes, vocabulary = pd.factorize(
+            pd.Series(list(itertools.chain.from_iterable(lists)), dtype=object),
+            sort=True,
+        )
+        self.vocabulary = tuple(vocabulary)
+        self.ingredient_ids = {name: i for i, name in enumerate(self.vocabulary)}
+        n_ingredients = len(self.vocabulary)
+
+        # Deduplicate (recipe, ingredient) pairs; the keys sort in CSR order
+        stride = max(n_ingredients, 1)
+        positions = np.repeat(np.arange(n_recipes, dtype=np.int64), lengths)
+        keys = np.unique(positions * stride + codes)
+        recipe_of_pair = keys // stride
+        ingredient_of_pair = keys % stride
+
+        # Sorted ingredient ids per recipe
+        self.recipe_sizes = np.bincount(recipe_of_pair, minlength=n_recipes)
+        self.recipe_indptr = np.concatenate(([0], np.cumsum(self.recipe_sizes)))
+        self.recipe_indices = ingredient_of_pair.astype(np.int32)
+
+        # Posting list of recipe positions per ingredient
+        order = np.argsort(ingredient_of_pair, kind="stable")
+        posting_sizes = np.bincount(ingredient_of_pair, minlength=n_ingredients)
+        self.posting_indptr = np.concatenate(([0], np.cumsum(posting_sizes)))
+        self.posting_indices = recipe_of_pair[order].astype(np.int32)
+
+        # Recipes without ingredients are a subset of any selection
+        self.empty_recipes = np.flatnonzero(self.recipe_sizes == 0).astype(np.int32)
+
+        logger.info(
+            "Built ingredient index for %d recipes and %d ingredients.",
+            n_recipes,
+            n_ingredients,
+        )
+
+    @classmethod
+    def from_arrays(cls, arrays: dict) -> "IngredientIndex":
+        """
+        Rebuild an index from the arrays returned by ``to_arrays``.
+
+        Parameters:
+        ----------
+        arrays : dict
+            Mapping of array names to NumPy arrays.
+
+        Returns:
+        -------
+        IngredientIndex
+            The rebuilt index.
+        """
+        index = cls.__new__(cls)
+        index.vocabulary = tuple(arrays["vocabulary"].tolist())
+        index.ingredient_ids = {name: i for i, name in enumerate(index.vocabulary)}
+        for name in ARRAY_NAMES:
+            setattr(index, name, arrays[name])
+        logger.info("Loaded ingredient index for %d recipes.", len(index))
+        return index
+
+    def to_arrays(self) -> dict:
+        """
+        Export the index as plain NumPy arrays, e.g. to store it on disk.
+
+        Returns:
+        -------
+        dict
+            Mapping of array names to NumPy arrays.
+        """
+        arrays = {name: getattr(self, name) for name in ARRAY_NAMES}
+        arrays["vocabulary"] = np.asarray(self.vocabulary, dtype=str)
+        return arrays
+
+    def __len__(self) -> int:
+        """
+        Return the number of indexed recipes.
+        """
+        return len(self.recipe_sizes)
+
+    @property
+    def shape(self) -> tuple:
+        """
+        Return the shape of the recipe x ingredient matrix.
+        """
+        return len(self.recipe_sizes), len(self.vocabulary)
+
+    def encode(self, ingredients: list) -> np.ndarray:
+        """
+        Convert ingredient names to their sorted, unique integer ids.
+
+        Parameters:
+        ----------
+        ingredients : list
+            Ingredient names. Names missing from the vocabulary are ignored.
+
+        Returns:
+        -------
+        np.ndarray
+            Sorted array of ingredient ids.
+        """
+        ids = [self.ingredient_ids[x] for x in ingredients if x in self.ingredient_ids]
+        return np.unique(np.asarray(ids, dtype=np.int32))
+
+    def decode(self, ingredient_ids: np.ndarray) -> list:
+        """
+        Convert integer ids back to ingredient names.
+
+        Parameters:
+        ----------
+        ingredient_ids : np.ndarray
+            Ingredient ids.
+
+        Returns:
+        -------
+        list
+            Ingredient names, in the order of the ids.
+        """
+        return [self.vocabulary[i] for i in ingredient_ids]
+
+    def get_recipe_ingredients(self, position: int) -> np.ndarray:
+        """
+        Return the sorted ingredient ids of a recipe.
+
+        Parameters:
+        ----------
+        position : int
+            Row position of the recipe in the indexed DataFrame.
+
+        Returns:
+        -------
+        np.ndarray
+            Sorted array of ingredient ids.
+        """
+        start, end = self.recipe_indptr[position], self.recipe_indptr[position + 1]
+        return self.recipe_indices[start:end]
+
+    def get_postings(self, ingredient_id: int) -> np.ndarray:
+        """
+        Return the positions of the recipes using an ingredient.
+
+        Parameters:
+        ----------
+        ingredient_id : int
+            Integer id of the ingredient.
+
+        Returns:
+        -------
+        np.ndarray
+            Sorted array of recipe positions.
+        """
+        start = self.posting_indptr[ingredient_id]
+        end = self.posting_indptr[ingredient_id + 1]
+        return self.posting_indices[start:end]
+
+    def find_subset_recipes(self, selected_ingredients: list) -> np.ndarray:
+        """
+        Find the recipes whose ingredients are all in the selected ingredients.
+
+        Only the posting lists of the selected ingredients are read: a recipe
+        matches when it appears in as many of them as it has ingredients.
+
+        Parameters:
+        ----------
+        selected_ingredients : list
+            Ingredient names available to the user.
+
+        Returns:
+        -------
+        np.ndarray
+            Sorted array of the positions of the matching recipes.
+        """
+        selected_ids = self.encode(selected_ingredients)
+        if len(selected_ids) == 0:
+            return self.empty_recipes
+
+        candidates = np.concatenate([self.get_postings(i) for i in selected_ids])
+        candidates, hits = np.unique(candidates, return_counts=True)
+        matches = candidates[hits == self.recipe_sizes[candidates]]
+
+        if len(self.empty_recipes):
+            matches = np.union1d(matches, self.empty_recipes)
+        return matches.astype(np.int32)
+
+    def is_subset(self, positions: np.ndarray, selected_ids: np.ndarray) -> np.ndarray:
+        """
+        Check which recipes use only selected ingredients.
+
+        Only the ingredients of the given recipes are read.
+
+        Parameters:
+        ----------
+        positions : np.ndarray
+            Positions of the recipes to check.
+        selected_ids : np.ndarray
+            Ids of the selected ingredients.
+
+        Returns:
+        -------
+        np.ndarray
+            Boolean mask over ``positions``.
+        """
+        sizes = self.recipe_sizes[positions]
+        indptr = np.concatenate(([0], np.cumsum(sizes)))
+        offsets = np.arange(indptr[-1]) - np.repeat(indptr[:-1], sizes)
+        pairs = np.repeat(self.recipe_indptr[positions], sizes) + offsets
+        selected = np.isin(self.recipe_indices[pairs], selected_ids)
+        return self.sum_segments(selected, indptr) == sizes
+
+    def update_subset_recipes(
+        self,
+        previous_ids: np.ndarray,
+        previous_matches: np.ndarray,
+        selected_ingredients: list,
+    ) -> np.ndarray:
+        """
+        Update the result of ``find_subset_recipes`` after a change of the
+        selected ingredients.
+
+        Removing an ingredient can only drop the recipes using it, and adding
+        one can only add recipes using it, so only the posting lists of the
+        changed ingredients are read.
+
+        Parameters:
+        ----------
+        previous_ids : np.ndarray
+            Ids of the previously selected ingredients.
+        previous_matches : np.ndarray
+            Result of ``find_subset_recipes`` for them.
+        selected_ingredients : list
+            Ingredient names now available to the user.
+
+        Returns:
+        -------
+        np.ndarray
+            Sorted array of the positions of the matching recipes.
+        """
+        selected_ids = self.encode(selected_ingredients)
+        removed = np.setdiff1d(previous_ids, selected_ids, assume_unique=True)
+        added = np.setdiff1d(selected_ids, previous_ids, assume_unique=True)
+
+        matches = previous_matches
+        if len(removed):
+            dropped = np.concatenate([self.get_postings(i) for i in removed])
+            matches = np.setdiff1d(matches, dropped)
+        if len(added):
+            candidates = np.unique(
+                np.concatenate([self.get_postings(i) for i in added])
+            )
+            candidates = candidates[self.is_subset(candidates, selected_ids)]
+            matches = np.union1d(matches, candidates)
+        return matches.astype(np.int32)
+
+    @staticmethod
+    def sum_segments(values: np.ndarray, indptr: np.ndarray) -> np.ndarray:
+        """
+        Sum consecutive segments of an array, as delimited by a CSR ``indptr``.
+
+        Parameters:
+        ----------
+        values : np.ndarray
+            Values to sum, one per stored entry.
+        indptr : np.ndarray
+            Segment boundaries, of length ``n_segments + 1``.
+
+        Returns:
+        -------
+        np.ndarray
+            The sum of each segment, 0 for empty segments.
+        """
+        cumsum = np.concatenate(([0], np.cumsum(values)))
+        return cumsum[indptr[1:]] - cumsum[indptr[:-1]]
+
+    def matvec(self, vector: np.ndarray) -> np.ndarray:
+        """
+        Multiply the recipe x ingredient matrix by an ingredient vector.
+
+        With the indicator vector of a selection, this gives the number of
+        selected ingredients used by each recipe.
+
+        Parameters:
+        ----------
+        vector : np.ndarray
+            One value per ingredient of the vocabulary.
+
+        Returns:
+        -------
+        np.ndarray
+            One value per recipe.
+        """
+        vector = np.asarray(vector)
+        if len(vector) != len(self.vocabulary):
+            raise ValueError(
+                f"Expected {len(self.vocabulary)} values, got {len(vector)}."
+            )
+        return self.sum_segments(vector[self.recipe_indices], self.recipe_indptr)
+
+    def rmatvec(self, vector: np.ndarray) -> np.ndarray:
+        """
+        Multiply the transposed matrix by a recipe vector.
+
+        With the indicator vector of a set of recipes, this gives the number
+        of those recipes using each ingredient.
+
+        Parameters:
+        ----------
+        vector : np.ndarray
+            One value per recipe.
+
+        Returns:
+        -------
+        np.ndarray
+            One value per ingredient of the vocabulary.
+        """
+        vector = np.asarray(vector)
+        if len(vector) != len(self.recipe_sizes):
+            raise ValueError(
+                f"Expected {len(self.recipe_sizes)} values, got {len(vector)}."
+            )
+        return self.sum_segments(vector[self.posting_indices], self.posting_indptr)
+
+    def count_matches(self, selected_ingredients: list) -> np.ndarray:
+        """
+        Count, for every recipe, how many of the selected ingredients it uses.
+
+        Parameters:
+        ----------
+        selected_ingredients : list
+            Ingredient names. Names missing from the vocabulary are ignored.
+
+        Returns:
+        -------
+        np.ndarray
+            Number of selected ingredients per recipe, in row order.
+        """
+        selection = np.zeros(len(self.vocabulary), dtype=np.int32)
+        selection[self.encode(selected_ingredients)] = 1
+        return self.matvec(selection)
+
+    def get_cooccurrence_counts(self, ingredient: str) -> pd.Series:
+        """
+        Count the recipes using each ingredient together with another one.
+
+        Parameters:
+        ----------
+        ingredient : str
+            Name of the ingredient.
+
+        Returns:
+        -------
+        pd.Series
+            Number of recipes shared with ``ingredient``, indexed by
+            ingredient name and sorted in descending order. The ingredient
+            itself and ingredients never used with it are left out.
+        """
+        if ingredient not in self.ingredient_ids:
+            return pd.Series(dtype=np.int64)
+
+        ingredient_id = self.ingredient_ids[ingredient]
+        recipes = np.zeros(len(self.recipe_sizes), dtype=np.int64)
+        recipes[self.get_postings(ingredient_id)] = 1
+        counts = self.rmatvec(recipes)
+        counts[ingredient_id] = 0
+
+        ids = np.flatnonzero(counts)
+        cooccurrences = pd.Series(counts[ids], index=self.decode(ids))
+        return cooccurrences.sort_values(ascending=False, kind="stable")
+
+    def to_scipy(self):
+        """
+        Convert the recipe x ingredient matrix to a SciPy sparse matrix.
+
+        SciPy is an optional dependency, only imported here.
+
+        Returns:
+        -------
+        scipy.sparse.csr_matrix
+            Matrix of 0/1 entries, one row per recipe and one column per
+            ingredient.
+
+        Raises:
+        ------
+        ImportError:
+            If SciPy is not installed.
+        """
+        from scipy.sparse import csr_matrix
+
+        data = np.ones(len(self.recipe_indices), dtype=np.int8)
+        return csr_matrix(
+            (data, self.recipe_indices, self.recipe_indptr), shape=self.shape
+        )
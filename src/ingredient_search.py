@@ -0,0 +1,175 @@
+import bisect
+import logging
+import numpy as np
+from src.ingredient_index import IngredientIndex
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+# Maximum number of options sent to the ingredient multiselect
+OPTION_LIMIT = 100
+
+# Minimum share of the query trigrams an ingredient must contain to match
+MIN_SIMILARITY = 0.3
+
+
+def get_trigrams(text: str) -> set:
+    """
+    Get the trigrams of a text, padded so that word starts weigh more.
+
+    Parameters:
+    ----------
+    text : str
+        The text to split.
+
+    Returns:
+    -------
+    set
+        The distinct trigrams of the lowercased text.
+    """
+    padded = f"  {text.lower().strip()} "
+    return {a + b + c for a, b, c in zip(padded, padded[1:], padded[2:])}
+
+
+class IngredientSearch:
+    """
+    The ingredient options of the sidebar, with a search index.
+
+    ``options`` holds every ingredient once, as an immutable tuple sorted by
+    number of recipes, most common first. Searches go through a prefix
+    index (the sorted lowercased names) and a trigram index, and return a
+    bounded number of options ranked by relevance.
+    """
+
+    def __init__(self, ingredient_index: IngredientIndex) -> None:
+        """
+        Build the options and the search indexes.
+
+        Parameters:
+        ----------
+        ingredient_index : IngredientIndex
+            Index of the recipe ingredients, giving the vocabulary and the
+            number of recipes using each ingredient.
+        """
+        frequencies = np.diff(ingredient_index.posting_indptr)
+        # Most common first, alphabetical among ties
+        order = np.lexsort((np.arange(len(frequencies)), -frequencies))
+        self.options = tuple(ingredient_index.vocabulary[i] for i in order)
+
+        # Prefix index: lowercased names, sorted, with their option ranks
+        prefixes = sorted(
+            (name.lower(), rank) for rank, name in enumerate(self.options)
+        )
+        self.prefix_names = [name for name, _ in prefixes]
+        self.prefix_ranks = np.array([rank for _, rank in prefixes], dtype=np.int32)
+
+        # Trigram index: option ranks per trigram
+        postings = {}
+        for rank, name in enumerate(self.options):
+            for trigram in get_trigrams(name):
+                postings.setdefault(trigram, []).append(rank)
+        self.trigrams = {
+            trigram: np.array(ranks, dtype=np.int32)
+            for trigram, ranks in postings.items()
+        }
+
+        logger.info(
+            "Built ingredient search over %d options and %d trigrams.",
+            len(self.options),
+            len(self.trigrams),
+        )
+
+    def __len__(self) -> int:
+        """
+        Return the number of options.
+        """
+        return len(self.options)
+
+    def find_prefix(self, prefix: str) -> np.ndarray:
+        """
+        Find the options starting with a prefix, ignoring case.
+
+        Parameters:
+        ----------
+        prefix : str
+            The prefix to look for.
+
+        Returns:
+        -------
+        np.ndarray
+            Sorted ranks of the matching options, most common first.
+        """
+        prefix = prefix.lower()
+        start = bisect.bisect_left(self.prefix_names, prefix)
+        end = bisect.bisect_left(self.prefix_names, prefix + "\uffff", lo=start)
+        return np.sort(self.prefix_ranks[start:end])
+
+    def search(self, query: str, limit: int = OPTION_LIMIT) -> tuple:
+        """
+        Get the options matching a query, best first.
+
+        Options starting with the query come first, then the options sharing
+        enough trigrams with it, by decreasing similarity. Ties are broken by
+        frequency. An empty query gives the most common ingredients.
+
+        Parameters:
+        ----------
+        query : str
+            Text typed by the user.
+        limit : int, optional
+            Maximum number of options to return (default is OPTION_LIMIT).
+
+        Returns:
+        -------
+        tuple
+            The matching ingredient names.
+        """
+        query = query.strip()
+        if not query:
+            return self.options[:limit]
+
+        prefix_ranks = self.find_prefix(query)
+        ranks = prefix_ranks[:limit].tolist()
+
+        if len(ranks) < limit:
+            query_trigrams = get_trigrams(query)
+            postings = [self.trigrams[t] for t in query_trigrams if t in self.trigrams]
+            if postings:
+                shared = np.bincount(np.concatenate(postings), minlength=len(self))
+                shared[prefix_ranks] = 0
+                candidates = np.flatnonzero(
+                    shared >= MIN_SIMILARITY * len(query_trigrams)
+                )
+                # By decreasing number of shared trigrams, then by rank
+                order = np.lexsort((candidates, -shared[candidates]))
+                ranks += candidates[order][: limit - len(ranks)].tolist()
+
+        return tuple(self.options[rank] for rank in ranks)
+
+    def get_options(
+        self, query: str, selected: list, limit: int = OPTION_LIMIT
+    ) -> list:
+        """
+        Get the options to show in the multiselect.
+
+        The selected ingredients are always kept, so that the widget can
+        display them, followed by the results of the query.
+
+        Parameters:
+        ----------
+        query : str
+            Text typed by the user.
+        selected : list
+            Ingredients already selected.
+        limit : int, optional
+            Maximum number of search results (default is OPTION_LIMIT).
+
+        Returns:
+        -------
+        list
+            The options, without duplicates.
+        """
+        options = list(dict.fromkeys(selected))
+        kept = set(options)
+        options += [name for name in self.search(query, limit) if name not in kept]
+        return options
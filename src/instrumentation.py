@@ -0,0 +1,359 @@
+import atexit
+import bisect
+import functools
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+# Prefix of the exported metric names
+METRIC_PREFIX = "mangetamain_stage"
+
+# Upper bounds of the histogram buckets of each metric
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+ROW_BUCKETS = (0, 1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+BYTE_BUCKETS = tuple(2**i for i in range(10, 32, 2))  # 1 KiB to 1 GiB
+
+METRICS = {
+    "duration_seconds": ("Duration of the instrumented stages.", DURATION_BUCKETS),
+    "rows_in": ("Number of rows entering the instrumented stages.", ROW_BUCKETS),
+    "rows_out": ("Number of rows leaving the instrumented stages.", ROW_BUCKETS),
+    "peak_bytes": (
+        "Peak memory allocated during the instrumented stages.",
+        BYTE_BUCKETS,
+    ),
+}
+
+# Default path of the Prometheus exposition file
+METRICS_FILE = "src/logs/metrics.prom"
+
+# Environment variable enabling the memory tracing of the stages when "1"
+TRACE_MEMORY_VARIABLE = "MANGETAMAIN_TRACE_MEMORY"
+
+
+class Histogram:
+    """
+    A cumulative histogram with fixed bucket bounds, in the Prometheus style.
+    """
+
+    def __init__(self, buckets: tuple) -> None:
+        """
+        Initialize an empty histogram.
+
+        Parameters:
+        ----------
+        buckets : tuple
+            Sorted upper bounds of the buckets, +Inf excluded.
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """
+        Add a value to the histogram.
+
+        Parameters:
+        ----------
+        value : float
+            The observed value.
+        """
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.max = max(self.max, value)
+
+
+class MetricsRegistry:
+    """
+    An in-process, thread-safe registry of per-stage histograms.
+
+    Each stage gets a histogram for its duration, its rows in and out, and
+    the peak memory allocated while it runs. Memory is only measured while
+    ``tracemalloc`` is tracing, see ``start_memory_tracing``.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty, enabled registry.
+        """
+        self.enabled = True
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    def observe(self, metric: str, stage: str, value: float) -> None:
+        """
+        Record a value of a metric for a stage.
+
+        Parameters:
+        ----------
+        metric : str
+            One of the metrics of ``METRICS``.
+        stage : str
+            Name of the stage.
+        value : float
+            The observed value.
+        """
+        with self.lock:
+            histogram = self.histograms.get((metric, stage))
+            if histogram is None:
+                histogram = Histogram(METRICS[metric][1])
+                self.histograms[(metric, stage)] = histogram
+            histogram.observe(value)
+
+    def clear(self) -> None:
+        """
+        Remove every recorded value.
+        """
+        with self.lock:
+            self.histograms.clear()
+
+    def get_summary(self) -> list:
+        """
+        Summarize the durations of each stage, slowest first.
+
+        Returns:
+        -------
+        list
+            One dictionary per stage, with the keys "stage", "calls",
+            "mean_ms", "max_ms" and "total_ms".
+        """
+        with self.lock:
+            durations = [
+                (stage, histogram.count, histogram.sum, histogram.max)
+                for (metric, stage), histogram in self.histograms.items()
+                if metric == "duration_seconds"
+            ]
+        summary = [
+            {
+                "stage": stage,
+                "calls": count,
+                "mean_ms": round(1000 * total / count, 3),
+                "max_ms": round(1000 * maximum, 3),
+                "total_ms": round(1000 * total, 3),
+            }
+            for stage, count, total, maximum in durations
+        ]
+        return sorted(summary, key=lambda row: row["total_ms"], reverse=True)
+
+    def to_prometheus(self) -> str:
+        """
+        Export the histograms in the Prometheus text exposition format.
+
+        Returns:
+        -------
+        str
+            The exposition text.
+        """
+        lines = []
+        with self.lock:
+            for metric, (description, _) in METRICS.items():
+                stages = sorted(s for m, s in self.histograms if m == metric)
+                if not stages:
+                    continue
+                name = f"{METRIC_PREFIX}_{metric}"
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} histogram")
+                for stage in stages:
+                    histogram = self.histograms[(metric, stage)]
+                    label = f'stage="{stage}"'
+                    cumulative = 0
+                    bounds = [f"{b:g}" for b in histogram.buckets] + ["+Inf"]
+                    for bound, count in zip(bounds, histogram.counts):
+                        cumulative += count
+                        lines.append(
+                            f'{name}_bucket{{{label},le="{bound}"}} {cumulative}'
+                        )
+                    lines.append(f"{name}_sum{{{label}}} {histogram.sum:g}")
+                    lines.append(f"{name}_count{{{label}}} {histogram.count}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def write(self, path: str = METRICS_FILE) -> None:
+        """
+        Write the metrics to a Prometheus exposition file.
+
+        The file is replaced atomically, so that a scraper never reads a
+        partial file. Failures are logged and ignored.
+
+        Parameters:
+        ----------
+        path : str, optional
+            Path of the file (default is METRICS_FILE).
+        """
+        tmp_path = path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(tmp_path, "w") as f:
+                f.write(self.to_prometheus())
+            os.replace(tmp_path, path)
+            logger.info("Wrote metrics to %s.", path)
+        except OSError as e:
+            logger.warning("Could not write metrics to %s: %s", path, str(e))
+
+
+# Registry shared by the whole process
+registry = MetricsRegistry()
+
+# Memory measurements of the stages running in each thread
+_memory_stacks = threading.local()
+
+# Whether the metrics are written at exit
+_export_registered = False
+
+
+def export_metrics_at_exit(path: str = METRICS_FILE) -> None:
+    """
+    Write the metrics to a Prometheus exposition file when the process exits.
+
+    Calling it again has no effect, so that it can be called on every rerun.
+
+    Parameters:
+    ----------
+    path : str, optional
+        Path of the file (default is METRICS_FILE).
+    """
+    global _export_registered
+    if not _export_registered:
+        atexit.register(registry.write, path)
+        _export_registered = True
+
+
+def start_memory_tracing() -> None:
+    """
+    Start measuring the peak memory of the stages with ``tracemalloc``.
+
+    Tracing slows allocations down noticeably for the whole process; it is
+    meant for diagnosis sessions, not for normal use. The app only starts
+    it when the TRACE_MEMORY_VARIABLE environment variable is "1".
+    """
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+        logger.info("Started memory tracing of the instrumented stages.")
+
+
+class Stage:
+    """
+    The measurement of one run of a stage, as handed out by ``measure_stage``.
+
+    Set ``rows_out`` inside the block to record the number of rows produced.
+    """
+
+    def __init__(self, name: str, rows_in: int = None) -> None:
+        """
+        Initialize the measurement.
+
+        Parameters:
+        ----------
+        name : str
+            Name of the stage.
+        rows_in : int, optional
+            Number of rows entering the stage.
+        """
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.memory_start = 0
+        self.memory_peak = 0
+
+
+@contextmanager
+def measure_stage(name: str, rows_in: int = None):
+    """
+    Measure the duration, rows and peak memory of a block of code.
+
+    Nested stages are supported: the peak of an inner stage also counts for
+    the stages around it. Memory is process-wide, so stages running at the
+    same time in other threads add to each other's peaks.
+
+    Parameters:
+    ----------
+    name : str
+        Name of the stage, used as the "stage" label of the metrics.
+    rows_in : int, optional
+        Number of rows entering the stage.
+
+    Yields:
+    ------
+    Stage
+        The measurement, whose ``rows_out`` can be set by the block.
+    """
+    if not registry.enabled:
+        yield Stage(name, rows_in)
+        return
+
+    stage = Stage(name, rows_in)
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        stack = _memory_stacks.__dict__.setdefault("stack", [])
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            stack[-1].memory_peak = max(stack[-1].memory_peak, peak)
+        tracemalloc.reset_peak()
+        stage.memory_start = current
+        stack.append(stage)
+
+    start = time.perf_counter()
+    try:
+        yield stage
+    finally:
+        duration = time.perf_counter() - start
+        registry.observe("duration_seconds", name, duration)
+        if stage.rows_in is not None:
+            registry.observe("rows_in", name, stage.rows_in)
+        if stage.rows_out is not None:
+            registry.observe("rows_out", name, stage.rows_out)
+
+        if tracing and tracemalloc.is_tracing():
+            stack.pop()
+            peak = max(tracemalloc.get_traced_memory()[1], stage.memory_peak)
+            registry.observe("peak_bytes", name, max(peak - stage.memory_start, 0))
+            if stack:
+                stack[-1].memory_peak = max(stack[-1].memory_peak, peak)
+
+
+def instrument(
+    name: str, rows_in: Callable = None, rows_out: Callable = None
+) -> Callable:
+    """
+    Decorate a function so that each call is measured by ``measure_stage``.
+
+    Parameters:
+    ----------
+    name : str
+        Name of the stage.
+    rows_in : Callable, optional
+        Called with the arguments of the function, before the call, to get
+        the number of rows entering the stage.
+    rows_out : Callable, optional
+        Called with the result then the arguments of the function, after
+        the call, to get the number of rows leaving the stage.
+
+    Returns:
+    -------
+    Callable
+        The decorator.
+    """
+
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return function(*args, **kwargs)
+            count_in = rows_in(*args, **kwargs) if rows_in else None
+            with measure_stage(name, count_in) as stage:
+                result = function(*args, **kwargs)
+                if rows_out:
+                    stage.rows_out = rows_out(result, *args, **kwargs)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,107 @@
+import logging
+import numpy as np
+import pandas as pd
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+# Arrays holding the index
+ARRAY_NAMES = ("recipe_ids", "indptr", "dates", "counts")
+
+
+class InteractionIndex:
+    """
+    Daily interaction counts of every recipe, pre-aggregated at load time.
+
+    The counts are stored in CSR layout: ``recipe_ids`` holds the sorted
+    recipe ids and the counts of ``recipe_ids[i]`` are
+    ``dates[indptr[i]:indptr[i + 1]]`` and ``counts[indptr[i]:indptr[i + 1]]``,
+    sorted by date. Looking up a recipe is a binary search and a slice.
+    """
+
+    def __init__(self, interactions_df: pd.DataFrame) -> None:
+        """
+        Build the index from the interactions data.
+
+        Parameters:
+        ----------
+        interactions_df : pd.DataFrame
+            DataFrame with one row per interaction and the columns
+            "recipe_id" and "date".
+        """
+        daily_counts = interactions_df.groupby(["recipe_id", "date"]).size()
+        recipe_of_count = daily_counts.index.get_level_values("recipe_id").to_numpy()
+
+        self.recipe_ids, sizes = np.unique(recipe_of_count, return_counts=True)
+        self.indptr = np.concatenate(([0], np.cumsum(sizes)))
+        self.dates = daily_counts.index.get_level_values("date").to_numpy()
+        self.counts = daily_counts.to_numpy()
+
+        logger.info(
+            "Built interaction index for %d recipes and %d interactions.",
+            len(self.recipe_ids),
+            len(interactions_df),
+        )
+
+    @classmethod
+    def from_arrays(cls, arrays: dict) -> "InteractionIndex":
+        """
+        Rebuild an index from the arrays returned by ``to_arrays``.
+
+        Parameters:
+        ----------
+        arrays : dict
+            Mapping of array names to NumPy arrays.
+
+        Returns:
+        -------
+        InteractionIndex
+            The rebuilt index.
+        """
+        index = cls.__new__(cls)
+        for name in ARRAY_NAMES:
+            setattr(index, name, arrays[name])
+        logger.info("Loaded interaction index for %d recipes.", len(index))
+        return index
+
+    def to_arrays(self) -> dict:
+        """
+        Export the index as plain NumPy arrays, e.g. to store it on disk.
+
+        Returns:
+        -------
+        dict
+            Mapping of array names to NumPy arrays.
+        """
+        return {name: getattr(self, name) for name in ARRAY_NAMES}
+
+    def __len__(self) -> int:
+        """
+        Return the number of recipes with at least one interaction.
+        """
+        return len(self.recipe_ids)
+
+    def get_daily_counts(self, recipe_id: int) -> pd.DataFrame:
+        """
+        Get the number of interactions per day of a recipe.
+
+        Parameters:
+        ----------
+        recipe_id : int
+            Id of the recipe.
+
+        Returns:
+        -------
+        pd.DataFrame
+            DataFrame with the columns "date" and "Interactions", sorted by
+            date. Empty if the recipe has no interactions.
+        """
+        position = np.searchsorted(self.recipe_ids, recipe_id)
+        if position == len(self.recipe_ids) or self.recipe_ids[position] != recipe_id:
+            start = end = 0
+        else:
+            start, end = self.indptr[position], self.indptr[position + 1]
+
+        return pd.DataFrame(
+            {"date": self.dates[start:end], "Interactions": self.counts[start:end]}
+        )
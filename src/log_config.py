@@ -1,5 +1,19 @@
+import atexit
+import copy
 import logging
+import logging.handlers
 import os
+import queue
+import threading
+
+# Maximum number of log records waiting for the background writer
+LOG_QUEUE_SIZE = 10_000
+
+# Seconds an ERROR or CRITICAL record waits for room in a full queue
+ERROR_BLOCK_TIMEOUT = 1.0
+
+# Background writer of the queue mode, if started
+_listener = None
 
 
 class MaxLevelFilter(logging.Filter):
@@ -36,7 +50,149 @@ class MaxLevelFilter(logging.Filter):
         return record.levelno <= self.max_level
 
 
-def setup_logging() -> None:
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    A queue handler that never blocks the logging thread for long.
+
+    When the queue is full, records below ERROR are dropped and counted,
+    while ERROR and CRITICAL records wait up to ``error_timeout`` seconds
+    for room before being dropped as well.
+    """
+
+    def __init__(
+        self, log_queue: queue.Queue, error_timeout: float = ERROR_BLOCK_TIMEOUT
+    ) -> None:
+        """
+        Initialize the handler.
+
+        Parameters:
+        ----------
+        log_queue : queue.Queue
+            The bounded queue read by the background writer.
+        error_timeout : float, optional
+            Seconds an error waits for room (default is ERROR_BLOCK_TIMEOUT).
+        """
+        super().__init__(log_queue)
+        self.error_timeout = error_timeout
+        self.dropped = 0
+        self.dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Prepare a record for the queue.
+
+        Only the message arguments are merged, so that later changes to them
+        do not show in the log. Formatting, including tracebacks, is left to
+        the file handlers of the background thread.
+
+        Parameters:
+        ----------
+        record : logging.LogRecord
+            The record to enqueue.
+
+        Returns:
+        -------
+        logging.LogRecord
+            A copy of the record, with its message resolved.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """
+        Put a record in the queue, dropping it if the queue stays full.
+
+        Parameters:
+        ----------
+        record : logging.LogRecord
+            The prepared record.
+        """
+        try:
+            if record.levelno >= logging.ERROR:
+                self.queue.put(record, timeout=self.error_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            with self.dropped_lock:
+                self.dropped += 1
+
+
+class FlushingQueueListener(logging.handlers.QueueListener):
+    """
+    A queue listener whose stop waits for room in a full queue.
+
+    The default listener fails to stop when its queue is full; this one
+    waits for the writer thread to make room, then writes every record
+    enqueued before the stop.
+    """
+
+    def enqueue_sentinel(self) -> None:
+        """
+        Put the stop marker at the end of the queue, waiting if it is full.
+        """
+        self.queue.put(self._sentinel)
+
+
+def get_dropped_count() -> int:
+    """
+    Get the number of log records dropped because the queue was full.
+
+    Returns:
+    -------
+    int
+        The number of dropped records, 0 if the queue mode is not running.
+    """
+    if _listener is None:
+        return 0
+    return sum(
+        handler.dropped
+        for handler in logging.getLogger().handlers
+        if isinstance(handler, BoundedQueueHandler)
+    )
+
+
+def stop_logging() -> None:
+    """
+    Stop the background writer of the queue mode, if running.
+
+    The records still in the queue are written, a warning reports the
+    dropped records, and the file handlers are flushed and closed. The
+    queue handler is removed from the root logger.
+    """
+    global _listener
+    if _listener is None:
+        return
+
+    dropped = get_dropped_count()
+    listener, _listener = _listener, None
+    listener.stop()  # Writes the remaining records
+
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        if isinstance(handler, BoundedQueueHandler):
+            root_logger.removeHandler(handler)
+
+    if dropped:
+        record = logging.LogRecord(
+            __name__,
+            logging.WARNING,
+            __file__,
+            0,
+            "Dropped %d log records because the log queue was full.",
+            (dropped,),
+            None,
+        )
+        for handler in listener.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+    for handler in listener.handlers:
+        handler.flush()
+        handler.close()
+
+
+def setup_logging(use_queue: bool = False) -> None:
     """
     Configure global logging for the application, ensuring logs are written to files.
 
@@ -46,11 +202,21 @@ def setup_logging() -> None:
       2. `app_error.log` for ERROR and CRITICAL logs.
     - Suppresses unnecessary debug logs from external libraries like Pillow.
 
+    In queue mode, the root logger only puts records in a bounded queue, and
+    a background thread formats them and writes the files. The queue is
+    flushed by ``stop_logging``, which also runs at exit.
+
+    Parameters:
+    ----------
+    use_queue : bool, optional
+        Write the log files from a background thread (default is False).
+
     Raises:
     -------
     OSError
         If the log directory cannot be created.
     """
+    global _listener
     log_directory: str = "src/logs"
 
     # Create the log directory if it doesn't exist
@@ -84,9 +250,19 @@ def setup_logging() -> None:
             logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
         )
 
-        # Add handlers to the root logger
-        logger.addHandler(debug_handler)
-        logger.addHandler(error_handler)
+        if use_queue:
+            # Write the files from a background thread fed by a bounded queue
+            log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+            _listener = FlushingQueueListener(
+                log_queue, debug_handler, error_handler, respect_handler_level=True
+            )
+            _listener.start()
+            atexit.register(stop_logging)
+            logger.addHandler(BoundedQueueHandler(log_queue))
+        else:
+            # Add handlers to the root logger
+            logger.addHandler(debug_handler)
+            logger.addHandler(error_handler)
 
     # Suppress excessive debug logs from external libraries
     logging.getLogger("PIL").setLevel(logging.INFO)
@@ -1,183 +1,237 @@
-import logging
-import streamlit as st
-import pandas as pd
-
-from src.visualization.sidebar import get_sidebar_configurations
-from src.visualization.dashboard import RecipeVisualizer
-from src.visualization.front_page import render_front_page
-from src.data_loader import DataLoader
-from src.filter import RecipeFilter
-from src.log_config import setup_logging
-
-
-class RecipeApp:
-    """
-    Main application class for running the recipe filtering and visualization.
-    """
-
-    def __init__(self) -> None:
-        """
-        Initialize the application by setting up logging and loading data.
-        """
-        setup_logging()
-        self.logger = logging.getLogger(__name__)
-        self.logger.info("Initializing RecipeApp...")
-
-        # Load data
-        self.data_loader = DataLoader()
-        self.logger.info("Loading recipes and interactions data...")
-        self.recipes_df, self.ingredient_list = self.data_loader.load_and_parse_data(
-            "dataset/PP_recipes_final.csv.zip"
-        )
-        self.interactions_df = self.data_loader.load_data(
-            "dataset/PP_interactions_final.csv.zip"
-        )
-        self.interactions_df["date"] = pd.to_datetime(self.interactions_df["date"])
-        self.filtered_recipes = None
-
-    def run(self) -> None:
-        """
-        Main function to run the app logic, including sidebar interactions
-        and recipe filtering.
-        """
-        self.logger.info("Running RecipeApp...")
-        user_inputs = get_sidebar_configurations(self.recipes_df, self.ingredient_list)
-
-        # Check if any recipe button is clicked
-        self.check_recipe_buttons_in_main(user_inputs)
-
-        # Handle reset action
-        if user_inputs["reset_clicked"]:
-            self.logger.info("Reset button clicked.")
-            self.reset_session_state()
-
-        # Handle search action
-        if user_inputs["start_search"]:
-            if user_inputs["recipe_clicked"]:
-                self.filtered_recipes = st.session_state["filtered_recipes"]
-            else:
-                self.logger.info("Filtering recipes based on user inputs.")
-                self.filtered_recipes = self.filter_recipes(user_inputs)
-            self.display_results(user_inputs)
-        else:
-            self.filtered_recipes = st.session_state.get("filtered_recipes", None)
-            self.display_dashboard_or_message()
-
-    def reset_session_state(self) -> None:
-        """
-        Reset the app state and rerun the Streamlit app.
-        """
-        self.logger.info("Resetting session state.")
-        render_front_page()
-        st.session_state.clear()
-        st.rerun()
-
-    def filter_recipes(self, user_inputs: dict) -> pd.DataFrame:
-        """
-        Apply ingredient and nutritional filters to the recipes.
-
-        Parameters:
-        ----------
-        user_inputs : dict
-            Dictionary containing user-selected filters.
-
-        Returns:
-        -------
-        pd.DataFrame
-            Filtered recipes based on user inputs.
-        """
-        self.logger.debug("Applying filters: %s", user_inputs)
-        recipe_filter = RecipeFilter(self.recipes_df)
-        recipe_filter.filter_by_ingredients(user_inputs["selected_ingredients"])
-        recipe_filter.filter_by_nutrition(
-            protein_min=user_inputs["protein_min"],
-            carbs_min=user_inputs["carbs_min"],
-            fat_max=user_inputs["fat_max"],
-        )
-        filtered_recipes = recipe_filter.get_filtered_recipes()
-        st.session_state["filtered_recipes"] = filtered_recipes
-        st.session_state["current_recipe_index"] = 0
-        return filtered_recipes
-
-    def display_results(self, user_inputs: dict) -> None:
-        """
-        Display the results based on filtered recipes.
-
-        Parameters:
-        ----------
-        user_inputs : dict
-            Dictionary containing user-selected filters.
-        """
-        if self.filtered_recipes.empty:
-            self.logger.info("No recipes found. Showing suggestions.")
-            self.handle_no_recipes(user_inputs)
-        else:
-            st.session_state["no_recipes_message"] = ""
-            self.render_dashboard()
-
-    def handle_no_recipes(self, user_inputs: dict) -> None:
-        """
-        Display suggestions when no recipes match the filters.
-
-        Parameters:
-        ----------
-        user_inputs : dict
-            Dictionary containing user-selected filters.
-        """
-        selected_ingredients = user_inputs["selected_ingredients"]
-        visualizer = RecipeVisualizer(self.recipes_df, self.interactions_df)
-        visualizer.render_no_recipes_suggestions(selected_ingredients)
-
-    def display_dashboard_or_message(self) -> None:
-        """
-        Display the front page or the filtered recipes dashboard.
-        """
-        if self.filtered_recipes is None or self.filtered_recipes.empty:
-            self.logger.info("Displaying the front page.")
-            render_front_page()
-        else:
-            self.render_dashboard()
-
-    def render_dashboard(self) -> None:
-        """
-        Render the dashboard for the filtered recipes.
-        """
-        self.logger.info("Rendering dashboard.")
-        visualizer = RecipeVisualizer(self.recipes_df, self.interactions_df)
-        visualizer.render_dashboard(self.filtered_recipes)
-
-    def check_recipe_buttons_in_main(self, user_inputs: dict) -> None:
-        """
-        Check if any recipe button is clicked and update session state.
-
-        Parameters:
-        ----------
-        user_inputs : dict
-            Dictionary containing user-selected filters.
-        """
-        for recipe_id_key in st.session_state.keys():
-            if recipe_id_key.startswith("recipe_") and st.session_state[recipe_id_key]:
-                self.logger.info("Recipe button clicked: %s", recipe_id_key)
-
-                recipe_id = int(recipe_id_key.split("_")[1])
-                clicked_recipe = self.recipes_df[
-                    self.recipes_df["id"] == recipe_id
-                ].iloc[0]
-
-                user_inputs["start_search"] = True
-                user_inputs["selected_ingredients"] = clicked_recipe["ingredient_PP"]
-                user_inputs["recipe_clicked"] = True
-
-                st.session_state["filtered_recipes"] = self.recipes_df[
-                    self.recipes_df["id"] == recipe_id
-                ]
-
-                for key in st.session_state.keys():
-                    if key.startswith("recipe_"):
-                        st.session_state[key] = False
-                break
-
-
-if __name__ == "__main__":
-    app = RecipeApp()
-    app.run()
+import logging
+import os
+import streamlit as st
+import pandas as pd
+
+from src.visualization.sidebar import get_sidebar_configurations, render_metrics_panel
+from src.visualization.front_page import render_front_page
+from src.dataset import get_dataset
+from src.filter import RecipeFilter, filter_cache
+from src.log_config import setup_logging
+from src.instrumentation import (
+    TRACE_MEMORY_VARIABLE,
+    export_metrics_at_exit,
+    start_memory_tracing,
+)
+from src.session_keys import CLICKED_RECIPE_KEY, INGREDIENT_MATCH_KEY
+
+
+class RecipeApp:
+    """
+    Main application class for running the recipe filtering and visualization.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the application by setting up logging and loading data.
+        """
+        setup_logging(use_queue=True)
+        export_metrics_at_exit()
+        self.logger = logging.getLogger(__name__)
+        self.logger.info("Initializing RecipeApp...")
+
+        # Memory tracing slows down every session; the server must opt in
+        if os.environ.get(TRACE_MEMORY_VARIABLE) == "1":
+            start_memory_tracing()
+
+        # Get the dataset shared by every session of the server process
+        self.logger.info("Getting recipes data; interactions load in the background...")
+        self.dataset = get_dataset()
+        self.recipes_df = self.dataset.recipes_df
+        self.ingredient_list = self.dataset.ingredient_list
+        self.ingredient_index = self.dataset.ingredient_index
+        self.season_index = self.dataset.season_index
+        self.filtered_recipes = None
+
+    def run(self) -> None:
+        """
+        Main function to run the app logic, including sidebar interactions
+        and recipe filtering.
+        """
+        self.logger.info("Running RecipeApp...")
+
+        user_inputs = get_sidebar_configurations(
+            self.recipes_df, self.ingredient_list, self.dataset.ingredient_search
+        )
+
+        # Show the stage metrics with ?debug=1 in the URL
+        if st.query_params.get("debug") == "1":
+            render_metrics_panel()
+
+        # Check if any recipe button is clicked
+        self.check_recipe_buttons_in_main(user_inputs)
+
+        # Handle reset action
+        if user_inputs["reset_clicked"]:
+            self.logger.info("Reset button clicked.")
+            self.reset_session_state()
+
+        # Handle search action
+        if user_inputs["start_search"]:
+            if user_inputs["recipe_clicked"]:
+                self.filtered_recipes = st.session_state["filtered_recipes"]
+            else:
+                self.logger.info("Filtering recipes based on user inputs.")
+                self.filtered_recipes = self.filter_recipes(user_inputs)
+            self.display_results(user_inputs)
+        else:
+            self.filtered_recipes = st.session_state.get("filtered_recipes", None)
+            self.display_dashboard_or_message()
+
+    def reset_session_state(self) -> None:
+        """
+        Reset the app state and rerun the Streamlit app.
+        """
+        self.logger.info("Resetting session state.")
+        render_front_page()
+        st.session_state.clear()
+        st.rerun()
+
+    def filter_recipes(self, user_inputs: dict) -> pd.DataFrame:
+        """
+        Apply ingredient and nutritional filters to the recipes.
+
+        Parameters:
+        ----------
+        user_inputs : dict
+            Dictionary containing user-selected filters.
+
+        Returns:
+        -------
+        pd.DataFrame
+            Filtered recipes based on user inputs.
+        """
+        self.logger.debug("Applying filters: %s", user_inputs)
+        recipe_filter = RecipeFilter(self.recipes_df, self.ingredient_index)
+        recipe_filter.apply_query(
+            user_inputs["selected_ingredients"],
+            protein_min=user_inputs["protein_min"],
+            carbs_min=user_inputs["carbs_min"],
+            fat_max=user_inputs["fat_max"],
+            cache=filter_cache,
+            cache_version=self.dataset.version,
+            previous_match=self.get_previous_match(),
+        )
+        if recipe_filter.ingredient_match is not None:
+            st.session_state[INGREDIENT_MATCH_KEY] = (
+                self.dataset.version,
+                recipe_filter.ingredient_match,
+            )
+        filtered_recipes = recipe_filter.get_filtered_recipes()
+        st.session_state["filtered_recipes"] = filtered_recipes
+        st.session_state["current_recipe_index"] = 0
+        return filtered_recipes
+
+    def get_previous_match(self) -> tuple:
+        """
+        Get the ingredient match of the last filter of this session.
+
+        Returns:
+        -------
+        tuple
+            The ``(ingredient ids, matching positions)`` of the last filter,
+            or None if there is none for the current dataset.
+        """
+        version, match = st.session_state.get(INGREDIENT_MATCH_KEY, (None, None))
+        return match if version == self.dataset.version else None
+
+    def display_results(self, user_inputs: dict) -> None:
+        """
+        Display the results based on filtered recipes.
+
+        Parameters:
+        ----------
+        user_inputs : dict
+            Dictionary containing user-selected filters.
+        """
+        if self.filtered_recipes.empty:
+            self.logger.info("No recipes found. Showing suggestions.")
+            self.handle_no_recipes(user_inputs)
+        else:
+            st.session_state["no_recipes_message"] = ""
+            self.render_dashboard()
+
+    def handle_no_recipes(self, user_inputs: dict) -> None:
+        """
+        Display suggestions when no recipes match the filters.
+
+        Parameters:
+        ----------
+        user_inputs : dict
+            Dictionary containing user-selected filters.
+        """
+        selected_ingredients = user_inputs["selected_ingredients"]
+        visualizer = self.get_visualizer()
+        visualizer.render_no_recipes_suggestions(selected_ingredients)
+
+    def get_visualizer(self):
+        """
+        Create the visualizer of the shared dataset.
+
+        The dashboard module, and the Plotly code behind it, is only imported
+        here, so that the front page renders without loading it.
+
+        Returns:
+        -------
+        RecipeVisualizer
+            The visualizer.
+        """
+        from src.visualization.dashboard import RecipeVisualizer
+
+        return RecipeVisualizer(
+            self.recipes_df,
+            None,
+            ingredient_index=self.ingredient_index,
+            season_index=self.season_index,
+            data_version=self.dataset.version,
+            pending_interactions=self.dataset.interactions,
+        )
+
+    def display_dashboard_or_message(self) -> None:
+        """
+        Display the front page or the filtered recipes dashboard.
+        """
+        if self.filtered_recipes is None or self.filtered_recipes.empty:
+            self.logger.info("Displaying the front page.")
+            render_front_page()
+        else:
+            self.render_dashboard()
+
+    def render_dashboard(self) -> None:
+        """
+        Render the dashboard for the filtered recipes.
+        """
+        self.logger.info("Rendering dashboard.")
+        visualizer = self.get_visualizer()
+        visualizer.render_dashboard(self.filtered_recipes)
+
+    def check_recipe_buttons_in_main(self, user_inputs: dict) -> None:
+        """
+        Check if any recipe button is clicked and update session state.
+
+        Parameters:
+        ----------
+        user_inputs : dict
+            Dictionary containing user-selected filters.
+        """
+        recipe_id = st.session_state.pop(CLICKED_RECIPE_KEY, None)
+        if recipe_id is None:
+            return
+        self.logger.info("Recipe button clicked: %s", recipe_id)
+
+        try:
+            clicked_recipe = self.dataset.get_recipe(recipe_id)
+        except KeyError:
+            self.logger.warning("Ignoring click on unknown recipe: %s", recipe_id)
+            return
+
+        user_inputs["start_search"] = True
+        user_inputs["selected_ingredients"] = clicked_recipe["ingredient_PP"]
+        user_inputs["recipe_clicked"] = True
+
+        st.session_state["filtered_recipes"] = self.dataset.get_recipes([recipe_id])
+
+
+if __name__ == "__main__":
+    app = RecipeApp()
+    app.run()
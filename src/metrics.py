@@ -1,4 +1,7 @@
 import logging
+import numpy as np
+import pandas as pd
+from src.nutrition import NUTRITION_COLUMNS
 
 # Create a logger for this module
 logger = logging.getLogger(__name__)
@@ -58,3 +61,77 @@ def calculate_mtm_score(nutrition: list) -> float:
     final_score = max(0, min(100, score))  # Keep score within bounds
 
     return final_score
+
+
+def calculate_mtm_scores(nutrition) -> np.ndarray:
+    """
+    Calculate the MTM scores of many recipes at once.
+
+    Batch counterpart of ``calculate_mtm_score``: the same rules are applied
+    with NumPy boolean masks over whole nutrient columns. Rows with missing
+    values are invalid and score 0.0, like invalid rows of the scalar
+    function.
+
+    Parameters:
+    ----------
+    nutrition : pd.DataFrame or np.ndarray
+        Either a DataFrame holding the columns of ``NUTRITION_COLUMNS`` or an
+        array of shape (n_recipes, 7) in the format:
+        [calories, fat, sugar, sodium, protein, saturated_fat, carbs].
+
+    Returns:
+    -------
+    np.ndarray
+        The MTM scores (0 to 100) as a float64 array of length n_recipes.
+
+    Raises:
+    ------
+    ValueError:
+        If the input does not hold seven nutritional values per recipe.
+    """
+    if isinstance(nutrition, pd.DataFrame):
+        values = nutrition[NUTRITION_COLUMNS].to_numpy(dtype=np.float64)
+    else:
+        values = np.asarray(nutrition, dtype=np.float64)
+
+    if values.ndim != 2 or values.shape[1] != len(NUTRITION_COLUMNS):
+        raise ValueError(
+            f"Expected nutrition values of shape (n, 7), got {values.shape}"
+        )
+
+    calories, fat, sugar, sodium, protein, saturated_fat, carbs = values.T
+    valid = ~np.isnan(values).any(axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        carbs_ratio = carbs / (calories / 4) * 100
+
+    score = np.zeros(len(values), dtype=np.float64)
+
+    # Boost score for high protein and balanced carbs
+    score += np.where(protein > 8, 30, 0)
+    score += np.where((35 <= carbs_ratio) & (carbs_ratio <= 75), 30, 0)
+    score += np.where((protein > 10) & (35 <= carbs_ratio) & (carbs_ratio <= 65), 15, 0)
+
+    # Penalize for unhealthy factors
+    score -= np.where(saturated_fat > 15, 10, 0)
+    score -= np.where(fat > 35, 5, 0)
+    score -= np.where(sugar > 35, 5, 0)
+    score -= np.where(sodium > 5, 5, 0)
+
+    # Reward moderate calorie range
+    score += np.where(
+        (200 <= calories) & (calories <= 900), 25, np.where(calories > 1500, -5, 0)
+    )
+
+    # Reward balanced fat and protein
+    score += np.where(
+        (15 <= fat) & (fat <= 25) & (10 <= protein) & (protein <= 20), 10, 0
+    )
+
+    final_scores = np.clip(score, 0, 100)  # Keep scores within bounds
+    final_scores[~valid] = 0.0
+
+    if not valid.all():
+        logger.warning("Invalid nutrition data for %d recipes.", (~valid).sum())
+
+    return final_scores
@@ -0,0 +1,157 @@
+import logging
+import numpy as np
+import pandas as pd
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+# Order of the values stored in the raw "nutrition" column of the dataset
+NUTRITION_COLUMNS = [
+    "calories",
+    "fat",
+    "sugar",
+    "sodium",
+    "protein",
+    "saturated_fat",
+    "carbs",
+]
+
+
+def parse_nutrition(nutrition: pd.Series, dtype: str = "float32") -> pd.DataFrame:
+    """
+    Expand the raw "nutrition" column into one typed column per nutrient.
+
+    The strings are parsed with a vectorized split instead of a per-row
+    ``ast.literal_eval``. Missing values and rows with fewer than seven
+    values produce NaN in the corresponding columns.
+
+    Parameters:
+    ----------
+    nutrition : pd.Series
+        Series of strings (or lists) in the format
+        "[calories, fat, sugar, sodium, protein, saturated_fat, carbs]".
+    dtype : str, optional
+        Floating point type of the resulting columns (default is "float32").
+
+    Returns:
+    -------
+    pd.DataFrame
+        DataFrame with the columns of ``NUTRITION_COLUMNS``, sharing the
+        index of ``nutrition``.
+    """
+    values = (
+        nutrition.astype(str)
+        .str.strip("[]() ")
+        .str.split(",", expand=True)
+        .reindex(columns=range(len(NUTRITION_COLUMNS)))
+    )
+    values.columns = NUTRITION_COLUMNS
+
+    parsed = pd.DataFrame(
+        {
+            column: pd.to_numeric(values[column], errors="coerce").astype(dtype)
+            for column in NUTRITION_COLUMNS
+        },
+        index=nutrition.index,
+    )
+    logger.info("Parsed nutrition values for %d recipes.", len(parsed))
+    return parsed
+
+
+def has_nutrition_columns(recipes_df: pd.DataFrame) -> bool:
+    """
+    Check whether a DataFrame carries the typed nutrient columns.
+
+    Parameters:
+    ----------
+    recipes_df : pd.DataFrame
+        DataFrame containing recipe data.
+
+    Returns:
+    -------
+    bool
+        True if every column of ``NUTRITION_COLUMNS`` is present.
+    """
+    return set(NUTRITION_COLUMNS).issubset(recipes_df.columns)
+
+
+def get_nutrition(recipe: pd.Series) -> list:
+    """
+    Return the nutrition values of a single recipe as a list.
+
+    Compatibility accessor for code that still expects the legacy list
+    format. Works with both the typed nutrient columns and the legacy
+    "nutrition" list column.
+
+    Parameters:
+    ----------
+    recipe : pd.Series
+        A row of the recipes DataFrame.
+
+    Returns:
+    -------
+    list
+        Nutritional values in the format:
+        [calories, fat, sugar, sodium, protein, saturated_fat, carbs].
+    """
+    if all(column in recipe.index for column in NUTRITION_COLUMNS):
+        # Go through the shortest repr so that a stored 15.1 stays 15.1
+        return [float(str(recipe[column])) for column in NUTRITION_COLUMNS]
+    return list(recipe["nutrition"])
+
+
+def get_nutrition_lists(recipes_df: pd.DataFrame) -> pd.Series:
+    """
+    Return the nutrition values of every recipe as a Series of lists.
+
+    Compatibility accessor for code that still expects the legacy list
+    column. The lists are built on demand and are not stored in the frame.
+    Rows with missing values are returned as None.
+
+    Parameters:
+    ----------
+    recipes_df : pd.DataFrame
+        DataFrame containing either the typed nutrient columns or the
+        legacy "nutrition" list column.
+
+    Returns:
+    -------
+    pd.Series
+        Series of nutrition lists sharing the index of ``recipes_df``.
+    """
+    if not has_nutrition_columns(recipes_df):
+        return recipes_df["nutrition"]
+
+    values = recipes_df[NUTRITION_COLUMNS].astype(str).astype("float64")
+    lists = pd.Series(values.values.tolist(), index=recipes_df.index, dtype=object)
+    return lists.where(values.notna().all(axis=1), None)
+
+
+def get_nutrition_matrix(recipes_df: pd.DataFrame) -> np.ndarray:
+    """
+    Return the nutrition values of every recipe as a 2D NumPy array.
+
+    Works with both the typed nutrient columns and the legacy "nutrition"
+    list column. Missing values and short lists are filled with NaN.
+
+    Parameters:
+    ----------
+    recipes_df : pd.DataFrame
+        DataFrame containing recipe data.
+
+    Returns:
+    -------
+    np.ndarray
+        Array of shape (n_recipes, 7) with the columns of
+        ``NUTRITION_COLUMNS``.
+    """
+    if has_nutrition_columns(recipes_df):
+        return recipes_df[NUTRITION_COLUMNS].to_numpy()
+
+    width = len(NUTRITION_COLUMNS)
+    matrix = np.full((len(recipes_df), width), np.nan)
+    for row, values in enumerate(recipes_df["nutrition"]):
+        if isinstance(values, (list, tuple)):
+            values = values[:width]
+            matrix[row, : len(values)] = values
+    return matrix
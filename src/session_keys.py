@@ -0,0 +1,12 @@
+"""
+Keys of the values the app keeps in ``st.session_state``.
+
+Modules that write and read the same value share its key from here, so
+that it can be looked up directly instead of by scanning every key.
+"""
+
+# Id of the recipe whose suggestion button was clicked, until handled
+CLICKED_RECIPE_KEY = "clicked_recipe_id"
+
+# Dataset version, ingredient ids and matching recipes of the last filter
+INGREDIENT_MATCH_KEY = "ingredient_match"
@@ -0,0 +1,113 @@
+import logging
+import numpy as np
+import pandas as pd
+from src.ingredient_index import IngredientIndex
+
+# Create a logger for this module
+logger = logging.getLogger(__name__)
+
+
+class SuggestionEngine:
+    """
+    Rank recipes by how close they are to the content of the user's fridge.
+
+    Every recipe sharing at least one ingredient with the selection is
+    scored from the posting lists of the inverted ingredient index:
+    matched count, missing count and Jaccard similarity. The best ones are
+    picked with a partial sort.
+    """
+
+    def __init__(
+        self, recipes_df: pd.DataFrame, ingredient_index: IngredientIndex
+    ) -> None:
+        """
+        Initialize the engine.
+
+        Parameters:
+        ----------
+        recipes_df : pd.DataFrame
+            DataFrame containing recipe data, with a "mtm_score" column.
+        ingredient_index : IngredientIndex
+            Index of the "ingredient_PP" column of ``recipes_df``.
+        """
+        self.recipes_df = recipes_df
+        self.ingredient_index = ingredient_index
+        self.mtm_scores = recipes_df["mtm_score"].to_numpy()
+
+    def score(self, selected_ingredients: list) -> tuple:
+        """
+        Score the recipes sharing ingredients with the selection.
+
+        Parameters:
+        ----------
+        selected_ingredients : list
+            List of ingredients selected by the user.
+
+        Returns:
+        -------
+        tuple
+            Arrays of the same length:
+            - positions of the candidate recipes,
+            - number of selected ingredients they use (matched count),
+            - number of their ingredients not selected (missing count),
+            - Jaccard similarity between their ingredients and the selection.
+        """
+        selected_ids = self.ingredient_index.encode(selected_ingredients)
+        if len(selected_ids) == 0:
+            empty = np.array([], dtype=np.int64)
+            return empty, empty, empty, np.array([], dtype=np.float64)
+
+        postings = [self.ingredient_index.get_postings(i) for i in selected_ids]
+        positions, matched = np.unique(np.concatenate(postings), return_counts=True)
+        sizes = self.ingredient_index.recipe_sizes[positions]
+        missing = sizes - matched
+        jaccard = matched / (sizes + len(selected_ids) - matched)
+        return positions, matched, missing, jaccard
+
+    def suggest(self, selected_ingredients: list, k: int = 5) -> pd.DataFrame:
+        """
+        Get the k recipes closest to the selection.
+
+        Recipes are ranked by Jaccard similarity, ties being broken by MTM
+        score. Without any known selected ingredient, the recipes with the
+        highest MTM scores are returned.
+
+        Parameters:
+        ----------
+        selected_ingredients : list
+            List of ingredients selected by the user.
+        k : int, optional
+            Maximum number of recipes to return (default is 5).
+
+        Returns:
+        -------
+        pd.DataFrame
+            The suggested recipes, best first, with the extra columns
+            "matched_count", "missing_count" and "jaccard".
+        """
+        positions, matched, missing, jaccard = self.score(selected_ingredients)
+
+        if len(positions) == 0:
+            positions = np.arange(len(self.recipes_df))
+            if len(positions) > k > 0:
+                positions = np.sort(np.argpartition(-self.mtm_scores, k - 1)[:k])
+            matched = np.zeros(len(positions), dtype=np.int64)
+            missing = self.ingredient_index.recipe_sizes[positions]
+            jaccard = np.zeros(len(positions), dtype=np.float64)
+
+        # Keep every candidate tied with the k-th best before the final sort
+        if len(positions) > k > 0:
+            kth_best = np.partition(jaccard, len(jaccard) - k)[len(jaccard) - k]
+            kept = np.flatnonzero(jaccard >= kth_best)
+        else:
+            kept = np.arange(len(positions))
+        order = np.lexsort((-self.mtm_scores[positions[kept]], -jaccard[kept]))
+        best = kept[order[:k]]
+
+        suggestions = self.recipes_df.take(positions[best]).assign(
+            matched_count=matched[best],
+            missing_count=missing[best],
+            jaccard=jaccard[best],
+        )
+        logger.info("Found %d suggestions.", len(suggestions))
+        return suggestions
@@ -1,10 +1,112 @@
 import logging
-import plotly.express as px
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+import pandas as pd
 import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.colors import sequential
+from src.instrumentation import instrument
 
 # Create a logger for the ChartFactory module
 logger = logging.getLogger(__name__)
 
+# Maximum number of figures kept by the shared figure cache
+FIGURE_CACHE_SIZE = 512
+
+
+class FigureCache:
+    """
+    A bounded, thread-safe LRU cache of Plotly figures.
+
+    The built figures are stored and shared as they are, so that a hit
+    costs a dictionary lookup. Callers must treat them as read-only:
+    ``st.plotly_chart`` only serializes the figure it is given.
+    """
+
+    def __init__(self, maxsize: int = FIGURE_CACHE_SIZE) -> None:
+        """
+        Initialize the cache.
+
+        Parameters:
+        ----------
+        maxsize : int, optional
+            Maximum number of figures to keep (default is FIGURE_CACHE_SIZE).
+        """
+        self.maxsize = maxsize
+        self.figures = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """
+        Return the number of cached figures.
+        """
+        return len(self.figures)
+
+    def get_figure(self, key: Hashable, build: Callable[[], go.Figure]) -> go.Figure:
+        """
+        Get a figure from the cache, building and storing it on a miss.
+
+        Parameters:
+        ----------
+        key : Hashable
+            Key of the figure, e.g. ``(chart type, recipe id, data version)``.
+        build : Callable[[], go.Figure]
+            Function building the figure when it is not cached.
+
+        Returns:
+        -------
+        go.Figure
+            The cached figure, shared with every caller. It must not be
+            modified.
+        """
+        with self.lock:
+            figure = self.figures.get(key)
+            if figure is not None:
+                self.figures.move_to_end(key)
+                self.hits += 1
+                return figure
+            self.misses += 1
+
+        figure = build()
+        with self.lock:
+            self.figures[key] = figure
+            self.figures.move_to_end(key)
+            while len(self.figures) > self.maxsize:
+                self.figures.popitem(last=False)
+        logger.info("Cached figure %s.", key)
+        return figure
+
+    def clear(self) -> None:
+        """
+        Remove every figure and reset the counters.
+        """
+        with self.lock:
+            self.figures.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Figure cache shared by every session of the server process
+figure_cache = FigureCache()
+
+# Colors of the pie chart slices, darkest first
+PIE_COLORS = sequential.Blues[::-1]
+
+# Color of the popularity line when the template has no colorway
+LINE_COLOR = "#636efa"
+
+# Layouts of the graph_objects charts, matching the Plotly Express ones
+PIE_LAYOUT = dict(legend=dict(tracegroupgap=0), piecolorway=PIE_COLORS)
+LINE_LAYOUT = dict(
+    xaxis=dict(anchor="y", domain=[0.0, 1.0]),
+    yaxis=dict(anchor="x", domain=[0.0, 1.0]),
+    legend=dict(tracegroupgap=0),
+)
+
 
 class ChartFactory:
     """
@@ -12,12 +114,19 @@ class ChartFactory:
     """
 
     @staticmethod
+    @instrument("charts.pie_chart")
     def pie_chart(
-        labels: list, values: list, title: str = "Nutritional Breakdown"
+        labels: list,
+        values: list,
+        title: str = "Nutritional Breakdown",
+        use_express: bool = False,
     ) -> go.Figure:
         """
         Generate a pie chart for nutritional data.
 
+        By default the figure is built directly with ``go.Pie``, which gives
+        the same chart as Plotly Express without its DataFrame setup.
+
         Parameters:
         ----------
         labels : list
@@ -26,6 +135,8 @@ class ChartFactory:
             Corresponding values for the labels.
         title : str, optional
             Title of the chart (default is "Nutritional Breakdown").
+        use_express : bool, optional
+            Build the chart with Plotly Express instead (default is False).
 
         Returns:
         -------
@@ -33,15 +144,44 @@ class ChartFactory:
             A Plotly pie chart figure.
         """
         try:
-            fig = px.pie(
-                names=labels,
-                values=values,
-                title=title,
-                color=values,
-                color_discrete_sequence=px.colors.sequential.Blues[::-1],
-                hole=0.7,  # Donut chart
-            )
-            fig.update_layout(title=dict(text=title, font=dict(size=18)))
+            if use_express:
+                import plotly.express as px  # Heavy, only loaded when used
+
+                fig = px.pie(
+                    names=labels,
+                    values=values,
+                    title=title,
+                    color=values,
+                    color_discrete_sequence=PIE_COLORS,
+                    hole=0.7,  # Donut chart
+                )
+                fig.update_layout(title=dict(text=title, font=dict(size=18)))
+            else:
+                # One color per distinct value, in order of appearance
+                value_colors = {}
+                for value in values:
+                    value_colors.setdefault(
+                        value, PIE_COLORS[len(value_colors) % len(PIE_COLORS)]
+                    )
+                pie = go.Pie(
+                    labels=labels,
+                    values=values,
+                    customdata=[[value] for value in values],
+                    marker=dict(colors=[value_colors[value] for value in values]),
+                    hole=0.7,  # Donut chart
+                    domain=dict(x=[0.0, 1.0], y=[0.0, 1.0]),
+                    hovertemplate=(
+                        "label=%{label}<br>value=%{value}<br>"
+                        "color=%{customdata[0]}<extra></extra>"
+                    ),
+                    legendgroup="",
+                    name="",
+                    showlegend=True,
+                )
+                fig = go.Figure(
+                    data=[pie],
+                    layout=dict(PIE_LAYOUT, title=dict(text=title, font=dict(size=18))),
+                )
             logger.info("Generated pie chart with title '%s'.", title)
             return fig
         except Exception as e:
@@ -49,8 +189,9 @@ class ChartFactory:
             raise
 
     @staticmethod
+    @instrument("charts.bar_chart", rows_in=lambda data, *args, **kwargs: len(data))
     def bar_chart(
-        data: px.data,
+        data: pd.DataFrame,
         x_col: str,
         y_col: str,
         color_col: str,
@@ -62,7 +203,7 @@ class ChartFactory:
 
         Parameters:
         ----------
-        data : px.data
+        data : pd.DataFrame
             Data source for the chart.
         x_col : str
             Column name for the x-axis.
@@ -81,6 +222,8 @@ class ChartFactory:
             A Plotly bar chart figure.
         """
         try:
+            import plotly.express as px  # Heavy, only loaded when used
+
             fig = px.bar(
                 data,
                 x=x_col,
@@ -107,15 +250,25 @@ class ChartFactory:
             raise
 
     @staticmethod
+    @instrument(
+        "charts.popularity_chart", rows_in=lambda data, *args, **kwargs: len(data)
+    )
     def popularity_chart(
-        data: px.data, x_col: str, y_col: str, title: str = "Popularity Over Time"
+        data: pd.DataFrame,
+        x_col: str,
+        y_col: str,
+        title: str = "Popularity Over Time",
+        use_express: bool = False,
     ) -> go.Figure:
         """
         Generate a line chart for recipe popularity over time.
 
+        By default the figure is built directly with ``go.Scatter``, which
+        gives the same chart as Plotly Express without its DataFrame setup.
+
         Parameters:
         ----------
-        data : px.data
+        data : pd.DataFrame
             Data source for the chart.
         x_col : str
             Column name for the x-axis.
@@ -123,6 +276,8 @@ class ChartFactory:
             Column name for the y-axis.
         title : str, optional
             Title of the chart (default is "Popularity Over Time").
+        use_express : bool, optional
+            Build the chart with Plotly Express instead (default is False).
 
         Returns:
         -------
@@ -130,13 +285,39 @@ class ChartFactory:
             A Plotly line chart figure.
         """
         try:
-            fig = px.line(
-                data,
-                x=x_col,
-                y=y_col,
-                title=title,
-                labels={"x": "Date", "y": "Number of Interactions"},
-            )
+            if use_express:
+                import plotly.express as px  # Heavy, only loaded when used
+
+                fig = px.line(
+                    data,
+                    x=x_col,
+                    y=y_col,
+                    title=title,
+                    labels={"x": "Date", "y": "Number of Interactions"},
+                )
+            else:
+                # Plotly Express draws the line with the first template color
+                colorway = pio.templates[pio.templates.default].layout.colorway
+                line = go.Scatter(
+                    x=data[x_col],
+                    y=data[y_col],
+                    mode="lines",
+                    line=dict(color=(colorway or [LINE_COLOR])[0], dash="solid"),
+                    marker=dict(symbol="circle"),
+                    hovertemplate=(f"{x_col}=%{{x}}<br>{y_col}=%{{y}}<extra></extra>"),
+                    legendgroup="",
+                    name="",
+                    orientation="v",
+                    showlegend=False,
+                    xaxis="x",
+                    yaxis="y",
+                )
+                layout = dict(
+                    LINE_LAYOUT, template=pio.templates.default, title=dict(text=title)
+                )
+                layout["xaxis"] = dict(layout["xaxis"], title=dict(text=x_col))
+                layout["yaxis"] = dict(layout["yaxis"], title=dict(text=y_col))
+                fig = go.Figure(data=[line], layout=layout)
             logger.info("Generated popularity chart with title '%s'.", title)
             return fig
         except Exception as e:
@@ -144,6 +325,7 @@ class ChartFactory:
             raise
 
     @staticmethod
+    @instrument("charts.score_display")
     def score_display(mtm_score: int, nutrition: list) -> go.Figure:
         """
         Display a table with the MTM score and nutrition details.
@@ -220,7 +402,7 @@ class ChartFactory:
             fig.add_annotation(
                 text=(
                     "<b>Healthiness Score<br>"
-                    f"<span style='color: {score_color};'>{mtm_score}/100</span>"
+                    f"<span style='color: {score_color};'>{mtm_score:g}/100</span>"
                     "</b>"
                 ),
                 x=0.5,  # Centered across the table
@@ -1,22 +1,55 @@
 import ast
-import datetime
-import gc
 import logging
+from concurrent.futures import Future
+from typing import Callable
 
+import numpy as np
 import pandas as pd
+import plotly.graph_objects as go
 import streamlit as st
-from src.visualization.charts import ChartFactory
+from src.ingredient_index import IngredientIndex
+from src.instrumentation import instrument
+from src.interaction_index import InteractionIndex
+from src.nutrition import get_nutrition
+from src.seasonality import SeasonIndex, get_month_position, get_season_mask
+from src.session_keys import CLICKED_RECIPE_KEY
+from src.suggestions import SuggestionEngine
+from src.visualization.charts import ChartFactory, figure_cache
 
 # Create a logger for the RecipeVisualizer module
 logger = logging.getLogger(__name__)
 
 
+def select_recipe(recipe_id: int) -> None:
+    """
+    Remember the recipe whose suggestion button was clicked.
+
+    Used as the ``on_click`` callback of the buttons: it runs before the
+    rerun, so that the app finds the id under a single session key.
+
+    Parameters:
+    ----------
+    recipe_id : int
+        Id of the clicked recipe.
+    """
+    st.session_state[CLICKED_RECIPE_KEY] = recipe_id
+
+
 class RecipeVisualizer:
     """
     A class for visualizing recipes and related data in the Streamlit app.
     """
 
-    def __init__(self, recipes_df: pd.DataFrame, interactions_df: pd.DataFrame) -> None:
+    def __init__(
+        self,
+        recipes_df: pd.DataFrame,
+        interactions_df: pd.DataFrame,
+        interaction_index: InteractionIndex = None,
+        ingredient_index: IngredientIndex = None,
+        season_index: SeasonIndex = None,
+        data_version: str = None,
+        pending_interactions: Future = None,
+    ) -> None:
         """
         Initialize the visualizer with recipe and interaction data.
 
@@ -26,15 +59,73 @@ class RecipeVisualizer:
             DataFrame containing recipe data.
         interactions_df : pd.DataFrame
             DataFrame containing user interaction data.
+        interaction_index : InteractionIndex, optional
+            Prebuilt daily interaction counts of ``interactions_df``.
+            Built on first use if not provided.
+        ingredient_index : IngredientIndex, optional
+            Prebuilt index of the "ingredient_PP" column of ``recipes_df``.
+            Built on first use if not provided.
+        season_index : SeasonIndex, optional
+            Prebuilt index of the "avg_date" column of ``recipes_df``.
+            Built on first use if not provided.
+        data_version : str, optional
+            Version of the data, e.g. ``RecipeDataset.version``. When given,
+            the charts of each recipe are stored in the shared figure cache
+            under this version.
+        pending_interactions : Future, optional
+            Future of the interactions data and its InteractionIndex, as a
+            tuple, still loading in the background. Used by the popularity
+            chart in place of ``interactions_df`` and ``interaction_index``.
         """
         self.recipes_df = recipes_df
         self.interactions_df = interactions_df
+        self.interaction_index = interaction_index
+        self.ingredient_index = ingredient_index
+        self.season_index = season_index
+        self.data_version = data_version
+        self.pending_interactions = pending_interactions
         logger.info("RecipeVisualizer initialized with recipes and interactions data.")
 
+    def get_in_season_positions(self, filtered_recipes: pd.DataFrame) -> np.ndarray:
+        """
+        Get the recipes in season at the date of the user.
+
+        The season index of the full recipes data is built once and used
+        when nothing was filtered out; filtered recipes are checked with a
+        vectorized mask. No DataFrame is copied.
+
+        Parameters:
+        ----------
+        filtered_recipes : pd.DataFrame
+            DataFrame containing filtered recipes.
+
+        Returns:
+        -------
+        np.ndarray
+            Sorted row positions, in ``filtered_recipes``, of the recipes in
+            season.
+        """
+        if "avg_date" not in filtered_recipes.columns:
+            return np.arange(len(filtered_recipes))
+
+        month = get_month_position()
+        if filtered_recipes is self.recipes_df:
+            if self.season_index is None:
+                self.season_index = SeasonIndex(self.recipes_df["avg_date"])
+            return self.season_index.get_in_season(month)
+
+        months = filtered_recipes["avg_date"].to_numpy(dtype=np.float64)
+        return np.flatnonzero(get_season_mask(months, month))
+
+    @instrument(
+        "dashboard.render_navigation",
+        rows_in=lambda self, filtered_recipes, *args, **kwargs: len(filtered_recipes),
+    )
     def render_navigation(self, filtered_recipes: pd.DataFrame) -> pd.Series:
         """
         Render navigation arrows and display the recipe title.
-        Selects recipes based on the date of the user.
+        Only the recipes in season at the date of the user are browsed, or
+        all of them if none is in season.
 
         Parameters:
         ----------
@@ -47,29 +138,10 @@ class RecipeVisualizer:
             The current recipe being displayed.
         """
 
-        # Select recipes based on the date of the user
-        current_date = int(datetime.date.today().month)
-        current_date += int(datetime.date.today().day) / 30 - 1
-        # Obtain trough the data analysis
-        std_dev = 1.54
-        # Sets the filter for the recipes
-        season_min = (current_date - std_dev) % 12
-        season_max = (current_date + std_dev) % 12
-        final = filtered_recipes.copy()
-        # Conditions to limits requires some special care
-        if season_min < 0:
-            final[(final.avg_date > 12 + season_min) & (final.avg_date < season_max)]
-        if season_max > 12:
-            final[(final.avg_date > season_min) | (final.avg_date < season_max - 12)]
-        else:
-            final[(final.avg_date > season_min) & (final.avg_date < season_max)]
-        # The case where no recipes are available
-        if not final.empty:
-            filtered_recipes = final
-        # Freeing memory
-        else:
-            del final
-            gc.collect()
+        # Only browse the recipes in season, if there are any
+        in_season = self.get_in_season_positions(filtered_recipes)
+        if len(in_season) == 0:
+            in_season = np.arange(len(filtered_recipes))
 
         try:
             left_arrow_box, title, right_arrow_box = st.columns([1, 6, 1])
@@ -81,7 +153,7 @@ class RecipeVisualizer:
                 if st.button("", key="prev_arrow", icon=":material/arrow_circle_left:"):
                     st.session_state["current_recipe_index"] = (
                         st.session_state["current_recipe_index"] - 1
-                    ) % len(filtered_recipes)
+                    ) % len(in_season)
 
             with right_arrow_box:
                 if st.button(
@@ -89,11 +161,12 @@ class RecipeVisualizer:
                 ):
                     st.session_state["current_recipe_index"] = (
                         st.session_state["current_recipe_index"] + 1
-                    ) % len(filtered_recipes)
+                    ) % len(in_season)
 
-            current_recipe = filtered_recipes.iloc[
-                st.session_state["current_recipe_index"]
+            position = in_season[
+                st.session_state["current_recipe_index"] % len(in_season)
             ]
+            current_recipe = filtered_recipes.iloc[position]
             with title:
                 st.markdown(
                     f"<h3 style='text-align: center;'>{current_recipe['name']}</h3>",
@@ -105,6 +178,33 @@ class RecipeVisualizer:
             logger.error("Failed to render navigation: %s", str(e))
             raise
 
+    def get_figure(
+        self, chart_type: str, recipe_id: int, build: Callable[[], go.Figure]
+    ) -> go.Figure:
+        """
+        Get a chart of a recipe from the shared figure cache.
+
+        Parameters:
+        ----------
+        chart_type : str
+            Name of the chart (e.g. "pie").
+        recipe_id : int
+            Id of the recipe.
+        build : Callable[[], go.Figure]
+            Function building the chart on a cache miss.
+
+        Returns:
+        -------
+        go.Figure
+            The chart. It is built directly when no data version is set.
+        """
+        if self.data_version is None:
+            return build()
+        return figure_cache.get_figure(
+            (chart_type, int(recipe_id), self.data_version), build
+        )
+
+    @instrument("dashboard.render_pie_chart")
     def render_pie_chart(self, selected_recipe: pd.Series) -> None:
         """
         Render a pie chart for the selected recipe's macronutrient breakdown.
@@ -115,15 +215,22 @@ class RecipeVisualizer:
             The selected recipe data.
         """
         try:
-            macronutrient_values = [
-                selected_recipe["nutrition"][1] * 9,  # Fat
-                selected_recipe["nutrition"][4] * 4,  # Protein
-                selected_recipe["nutrition"][6] * 4,  # Carbs
-            ]
-            macronutrient_labels = ["Fat", "Protein", "Carbs"]
-            pie_fig = ChartFactory.pie_chart(
-                macronutrient_labels, macronutrient_values, "Macronutrient Breakdown"
-            )
+
+            def build_pie_chart() -> go.Figure:
+                nutrition = get_nutrition(selected_recipe)
+                macronutrient_values = [
+                    nutrition[1] * 9,  # Fat
+                    nutrition[4] * 4,  # Protein
+                    nutrition[6] * 4,  # Carbs
+                ]
+                macronutrient_labels = ["Fat", "Protein", "Carbs"]
+                return ChartFactory.pie_chart(
+                    macronutrient_labels,
+                    macronutrient_values,
+                    "Macronutrient Breakdown",
+                )
+
+            pie_fig = self.get_figure("pie", selected_recipe["id"], build_pie_chart)
             st.plotly_chart(
                 pie_fig, use_container_width=True, config={"displayModeBar": False}
             )
@@ -132,6 +239,7 @@ class RecipeVisualizer:
             logger.error("Failed to render pie chart: %s", str(e))
             raise
 
+    @instrument("dashboard.render_popularity_chart")
     def render_popularity_chart(self, selected_recipe: pd.Series) -> None:
         """
         Render a popularity chart for the selected recipe.
@@ -142,17 +250,34 @@ class RecipeVisualizer:
             The selected recipe data.
         """
         try:
-            recipe_interactions = self.interactions_df[
-                self.interactions_df["recipe_id"] == selected_recipe["id"]
-            ]
-            if not recipe_interactions.empty:
-                interactions_count = (
-                    recipe_interactions.groupby("date")
-                    .size()
-                    .reset_index(name="Interactions")
+            if self.interaction_index is None and self.pending_interactions:
+                # Show a placeholder while the interactions finish loading
+                if not self.pending_interactions.done():
+                    with st.spinner("Loading the popularity data..."):
+                        self.pending_interactions.exception()
+                if self.pending_interactions.exception() is not None:
+                    st.info("Popularity data is not available.")
+                    logger.error(
+                        "Interactions failed to load: %s",
+                        self.pending_interactions.exception(),
+                    )
+                    return
+                self.interactions_df, self.interaction_index = (
+                    self.pending_interactions.result()
                 )
-                fig_popularity = ChartFactory.popularity_chart(
-                    interactions_count, "date", "Interactions"
+            if self.interaction_index is None:
+                self.interaction_index = InteractionIndex(self.interactions_df)
+
+            interactions_count = self.interaction_index.get_daily_counts(
+                selected_recipe["id"]
+            )
+            if not interactions_count.empty:
+                fig_popularity = self.get_figure(
+                    "popularity",
+                    selected_recipe["id"],
+                    lambda: ChartFactory.popularity_chart(
+                        interactions_count, "date", "Interactions"
+                    ),
                 )
                 st.plotly_chart(fig_popularity, use_container_width=True)
                 logger.info(
@@ -163,6 +288,7 @@ class RecipeVisualizer:
             logger.error("Failed to render popularity chart: %s", str(e))
             raise
 
+    @instrument("dashboard.render_score_chart")
     def render_score_chart(self, selected_recipe: pd.Series) -> None:
         """
         Render the MTM Score as a custom visualization.
@@ -173,8 +299,12 @@ class RecipeVisualizer:
             The selected recipe data.
         """
         try:
-            fig_score = ChartFactory.score_display(
-                selected_recipe["mtm_score"], selected_recipe["nutrition"]
+            fig_score = self.get_figure(
+                "score",
+                selected_recipe["id"],
+                lambda: ChartFactory.score_display(
+                    selected_recipe["mtm_score"], get_nutrition(selected_recipe)
+                ),
             )
             st.plotly_chart(
                 fig_score, use_container_width=True, config={"displayModeBar": False}
@@ -184,6 +314,10 @@ class RecipeVisualizer:
             logger.error("Failed to render score chart: %s", str(e))
             raise
 
+    @instrument(
+        "dashboard.render_dashboard",
+        rows_in=lambda self, filtered_recipes, *args, **kwargs: len(filtered_recipes),
+    )
     def render_dashboard(self, filtered_recipes: pd.DataFrame) -> None:
         """
         Render the complete dashboard for the selected recipe.
@@ -238,6 +372,32 @@ class RecipeVisualizer:
             logger.error("Failed to render dashboard: %s", str(e))
             raise
 
+    def get_suggested_recipes(
+        self, selected_ingredients: list, n: int = 5
+    ) -> pd.DataFrame:
+        """
+        Find the recipes closest to the selected ingredients.
+
+        Parameters:
+        ----------
+        selected_ingredients : list
+            List of ingredients selected by the user.
+        n : int, optional
+            Maximum number of recipes to return (default is 5).
+
+        Returns:
+        -------
+        pd.DataFrame
+            The best recipes by ingredient overlap, then MTM score, with the
+            columns added by ``SuggestionEngine.suggest``.
+        """
+        if self.ingredient_index is None:
+            self.ingredient_index = IngredientIndex(self.recipes_df["ingredient_PP"])
+
+        engine = SuggestionEngine(self.recipes_df, self.ingredient_index)
+        return engine.suggest(selected_ingredients, n)
+
+    @instrument("dashboard.render_no_recipes_suggestions")
     def render_no_recipes_suggestions(self, selected_ingredients: list) -> None:
         """
         Render suggestions when no recipes match the user's criteria.
@@ -254,14 +414,7 @@ class RecipeVisualizer:
                 "Consider adding the missing ingredients!"
             )
 
-            matching_recipes = self.recipes_df[
-                self.recipes_df["ingredient_PP"].apply(
-                    lambda ingredients: all(
-                        selected in ingredients for selected in selected_ingredients
-                    )
-                )
-            ]
-            top_recipes = matching_recipes.nlargest(5, "mtm_score")
+            top_recipes = self.get_suggested_recipes(selected_ingredients)
 
             st.markdown(
                 "<h2 style='color:#FF6347;'>"
@@ -272,10 +425,12 @@ class RecipeVisualizer:
 
             for _, recipe in top_recipes.iterrows():
                 with st.container():
-                    if st.button(
-                        f"View Recipe: {recipe['name']}", key=f"recipe_{recipe['id']}"
-                    ):
-                        st.session_state[f"recipe_{recipe['id']}"] = True
+                    st.button(
+                        f"View Recipe: {recipe['name']}",
+                        key=f"recipe_{recipe['id']}",
+                        on_click=select_recipe,
+                        args=(int(recipe["id"]),),
+                    )
 
                     mtm_score = recipe["mtm_score"]
                     score_color = (
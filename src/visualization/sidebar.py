@@ -1,11 +1,17 @@
 import logging
+import pandas as pd
 import streamlit as st
+from src.filter import filter_cache
+from src.ingredient_search import IngredientSearch
+from src.instrumentation import METRICS_FILE, registry
 
 # Create a logger for this module
 logger = logging.getLogger(__name__)
 
 
-def get_sidebar_configurations(recipes_df, ingredient_list) -> dict:
+def get_sidebar_configurations(
+    recipes_df, ingredient_list, ingredient_search: IngredientSearch = None
+) -> dict:
     """
     Define the sidebar configurations and return the user's inputs.
 
@@ -15,6 +21,10 @@ def get_sidebar_configurations(recipes_df, ingredient_list) -> dict:
         The DataFrame containing recipe data.
     ingredient_list : list
         The list of available ingredients for selection.
+    ingredient_search : IngredientSearch, optional
+        Search index of ``ingredient_list``. When given, the multiselect only
+        receives the selected ingredients and the best matches of the search
+        box, instead of every ingredient.
 
     Returns:
     -------
@@ -40,9 +50,21 @@ def get_sidebar_configurations(recipes_df, ingredient_list) -> dict:
             "What's in your fridge?",
             expanded=st.session_state.get("expand_ingredients", False),
         ):
+            if ingredient_search is not None:
+                query = st.text_input(
+                    "Search ingredients:",
+                    key="ingredient_query",
+                    placeholder="e.g. chicken",
+                )
+                options = ingredient_search.get_options(
+                    query, st.session_state.get("selected_ingredients", [])
+                )
+            else:
+                options = ingredient_list
+
             selected_ingredients = st.multiselect(
                 "Type to search ingredients:",
-                options=ingredient_list,
+                options=options,
                 default=st.session_state.get("selected_ingredients", []),
                 key="selected_ingredients",
                 help="Start typing to see suggestions for ingredients.",
@@ -121,3 +143,31 @@ def get_sidebar_configurations(recipes_df, ingredient_list) -> dict:
     except Exception as e:
         logger.error("Error while rendering sidebar: %s", str(e))
         raise
+
+
+def render_metrics_panel() -> None:
+    """
+    Render a debug panel in the sidebar with the timings of each stage.
+
+    The panel also shows the counters of the shared filter cache, writes
+    the metrics to the Prometheus exposition file and offers them for
+    download.
+    """
+    with st.sidebar.expander("Performance metrics"):
+        st.caption(
+            "Filter cache: {size} queries, {hits} hits, {misses} misses, "
+            "{evictions} evictions.".format(**filter_cache.get_stats())
+        )
+        summary = registry.get_summary()
+        if not summary:
+            st.caption("No stage measured yet.")
+            return
+
+        st.dataframe(pd.DataFrame(summary), hide_index=True)
+        registry.write(METRICS_FILE)
+        st.download_button(
+            "Download metrics",
+            registry.to_prometheus(),
+            file_name="metrics.prom",
+            mime="text/plain",
+        )
@@ -1,9 +1,11 @@
 import unittest
 from unittest.mock import patch, MagicMock
 import os
+import tempfile
 import zipfile
 import pandas as pd
 from src.data_loader import DataLoader
+from src.nutrition import NUTRITION_COLUMNS, get_nutrition_lists
 
 
 class TestDataLoader(unittest.TestCase):
@@ -13,7 +15,10 @@ class TestDataLoader(unittest.TestCase):
         """
         self.data_loader = DataLoader()
         self.sample_data = pd.DataFrame({
-            "nutrition": ["[1.0, 2.0, 3.0]", "[4.0, 5.0, 6.0]"],
+            "nutrition": [
+                "[400.0, 20.0, 10.0, 3.0, 15.0, 5.0, 50.0]",
+                "[2000.0, 50.0, 50.0, 10.0, 5.0, 20.0, 20.0]",
+            ],
             "ingredient_PP": ["['salt', 'sugar']", "['flour', 'water']"],
         })
 
@@ -69,13 +74,40 @@ class TestDataLoader(unittest.TestCase):
 
         # Test load_data
         file_name = "test.zip"
-        df = self.data_loader.load_data(file_name)
+        df = DataLoader(stream_zip=False).load_data(file_name)
 
         # Assertions
         pd.testing.assert_frame_equal(df, self.sample_data)
         mock_unzip_data.assert_called_once_with(file_name)
         mock_read_csv.assert_called_once_with("test_extracted/file1.csv")
 
+    def test_read_zip_csv(self):
+        """
+        Test streaming a CSV file out of a ZIP archive with a resource fork.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_name = os.path.join(tmp_dir, "test.zip")
+            with zipfile.ZipFile(file_name, "w") as zip_ref:
+                zip_ref.writestr("__MACOSX/._data.csv", "junk")
+                zip_ref.writestr("data.csv", "recipe_id,rating\n1,5\n2,4\n3,5\n")
+
+            df = self.data_loader.read_zip_csv(file_name, chunksize=2)
+
+            self.assertListEqual(df["recipe_id"].tolist(), [1, 2, 3])
+            self.assertListEqual(os.listdir(tmp_dir), ["test.zip"])
+
+    def test_read_zip_csv_without_csv(self):
+        """
+        Test that an archive without a CSV file is rejected.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_name = os.path.join(tmp_dir, "test.zip")
+            with zipfile.ZipFile(file_name, "w") as zip_ref:
+                zip_ref.writestr("__MACOSX/._data.csv", "junk")
+
+            with self.assertRaises(ValueError):
+                self.data_loader.read_zip_csv(file_name)
+
     @patch("src.data_loader.DataLoader.load_data")
     def test_load_and_parse_data(self, mock_load_data):
         """
@@ -86,12 +118,14 @@ class TestDataLoader(unittest.TestCase):
 
         # Test load_and_parse_data
         file_name = "test.csv"
-        df, ingredient_list = self.data_loader.load_and_parse_data(file_name)
+        df, ingredient_list, ingredient_index = self.data_loader.load_and_parse_data(
+            file_name
+        )
 
         # Expected results
         expected_nutrition = [
-            [1.0, 2.0, 3.0],
-            [4.0, 5.0, 6.0],
+            [400.0, 20.0, 10.0, 3.0, 15.0, 5.0, 50.0],
+            [2000.0, 50.0, 50.0, 10.0, 5.0, 20.0, 20.0],
         ]
         expected_ingredients = [
             ["salt", "sugar"],
@@ -99,11 +133,71 @@ class TestDataLoader(unittest.TestCase):
         ]
 
         # Assertions
-        self.assertEqual(df["nutrition"].tolist(), expected_nutrition)
+        self.assertNotIn("nutrition", df.columns)
+        for column in NUTRITION_COLUMNS:
+            self.assertEqual(df[column].dtype, "float32")
+        self.assertEqual(get_nutrition_lists(df).tolist(), expected_nutrition)
         self.assertEqual(df["ingredient_PP"].tolist(), expected_ingredients)
-        self.assertIn("mtm_score", df.columns)
+        self.assertEqual(df["mtm_score"].tolist(), [100, 0])
         expected_ingredient_set = {"salt", "sugar", "flour", "water"}
         self.assertEqual(set(ingredient_list), expected_ingredient_set)
+        self.assertIsInstance(ingredient_list, tuple)
+        self.assertEqual(self.data_loader.ingredient_search.options, ingredient_list)
+        self.assertEqual(len(ingredient_index), len(df))
+        self.assertListEqual(
+            ingredient_index.find_subset_recipes(["salt", "sugar"]).tolist(), [0]
+        )
+        self.assertIs(self.data_loader.ingredient_index, ingredient_index)
+        self.assertEqual(
+            self.data_loader.ingredient_ids["salt"],
+            ingredient_index.encode(["salt"])[0],
+        )
+
+    @patch("src.data_loader.DataLoader.load_data")
+    def test_load_interactions(self, mock_load_data):
+        """
+        Test that load_interactions parses the dates.
+        """
+        mock_load_data.return_value = pd.DataFrame({
+            "recipe_id": [1, 2],
+            "date": ["2023-01-01", "2023-01-02"],
+        })
+
+        df, interaction_index = DataLoader(cache_dir=None).load_interactions(
+            "interactions.csv"
+        )
+
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(df["date"]))
+        self.assertEqual(len(df), 2)
+        self.assertEqual(len(interaction_index), 2)
+
+    def test_optimize_memory(self):
+        """
+        Test that optimize_memory shrinks the columns and keeps their values.
+        """
+        df = pd.DataFrame({
+            "id": [1, 2, 3, 4],
+            "score": [1.5, 2.5, 3.5, 4.5],
+            "avg_date": [1.1, 2.2, 3.3, 4.4],
+            "tag": ["easy", "easy", "easy", "hard"],
+            "name": ["a", "b", "c", "d"],
+            "ingredient_PP": [["salt"], ["salt", "flour"], [], ["flour"]],
+        })
+        expected = df.copy()
+
+        with self.assertLogs("src.data_loader", level="INFO") as logs:
+            df = self.data_loader.optimize_memory(df, "recipes")
+
+        self.assertEqual(df["id"].dtype, "int8")
+        self.assertEqual(df["score"].dtype, "float32")
+        self.assertEqual(df["avg_date"].dtype, "float64")
+        self.assertIsInstance(df["tag"].dtype, pd.CategoricalDtype)
+        self.assertEqual(df["name"].dtype, object)
+        pd.testing.assert_frame_equal(
+            df.astype({"tag": object}), expected, check_dtype=False
+        )
+        self.assertIs(df["ingredient_PP"][0][0], df["ingredient_PP"][1][0])
+        self.assertTrue(any("recipes[tag]" in line for line in logs.output))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,136 @@
+import threading
+import unittest
+from concurrent.futures import Future
+from unittest.mock import patch
+import pandas as pd
+from src.dataset import RecipeDataset, get_dataset
+from src.ingredient_index import IngredientIndex
+from src.interaction_index import InteractionIndex
+
+
+class TestDataset(unittest.TestCase):
+    """
+    Unit tests for the shared dataset registry.
+    """
+
+    def setUp(self):
+        """
+        Set up sample data and clear the process-wide cache.
+        """
+        self.recipes_df = pd.DataFrame({
+            "id": [1, 2],
+            "ingredient_PP": [["salt", "sugar"], ["flour"]],
+            "avg_date": [1.5, 6.0],
+        })
+        self.interactions_df = pd.DataFrame({
+            "recipe_id": [1, 1, 2],
+            "date": pd.to_datetime(["2023-01-01", "2023-01-01", "2023-01-02"]),
+        })
+        self.ingredient_index = IngredientIndex(self.recipes_df["ingredient_PP"])
+        self.interaction_index = InteractionIndex(self.interactions_df)
+        get_dataset.clear()
+
+    def tearDown(self):
+        """
+        Clear the process-wide cache.
+        """
+        get_dataset.clear()
+
+    def get_interactions_future(self):
+        """
+        Get a completed future of the sample interactions.
+        """
+        future = Future()
+        future.set_result((self.interactions_df, self.interaction_index))
+        return future
+
+    @patch("src.data_loader.DataLoader.load_interactions")
+    @patch("src.data_loader.DataLoader.load_and_parse_data")
+    def test_get_dataset_loads_once(self, mock_load_recipes, mock_load_interactions):
+        """
+        Test that the dataset is loaded once and shared without copies.
+        """
+        mock_load_recipes.return_value = (
+            self.recipes_df,
+            ("salt", "sugar", "flour"),
+            self.ingredient_index,
+        )
+        mock_load_interactions.return_value = (
+            self.interactions_df,
+            self.interaction_index,
+        )
+
+        first = get_dataset("recipes.csv", "interactions.csv")
+        second = get_dataset("recipes.csv", "interactions.csv")
+
+        self.assertIs(first, second)
+        self.assertIs(first.recipes_df, self.recipes_df)
+        self.assertIs(first.interactions_df, self.interactions_df)
+        mock_load_recipes.assert_called_once_with("recipes.csv")
+        mock_load_interactions.assert_called_once_with("interactions.csv")
+
+    @patch("src.data_loader.DataLoader.load_interactions")
+    @patch("src.data_loader.DataLoader.load_and_parse_data")
+    def test_interactions_load_in_background(
+        self, mock_load_recipes, mock_load_interactions
+    ):
+        """
+        Test that the dataset is returned before the interactions are loaded.
+        """
+        release = threading.Event()
+
+        def load_interactions(file_name):
+            release.wait(timeout=5)
+            return self.interactions_df, self.interaction_index
+
+        mock_load_recipes.return_value = (
+            self.recipes_df,
+            ("salt", "sugar", "flour"),
+            self.ingredient_index,
+        )
+        mock_load_interactions.side_effect = load_interactions
+
+        dataset = get_dataset("recipes.csv", "interactions.csv")
+        self.assertFalse(dataset.interactions.done())
+
+        release.set()
+        self.assertIs(dataset.interaction_index, self.interaction_index)
+        self.assertTrue(dataset.interactions.done())
+
+    def test_index_arrays_are_read_only(self):
+        """
+        Test that the arrays of the shared indexes cannot be modified.
+        """
+        dataset = RecipeDataset(
+            self.recipes_df,
+            ("salt", "sugar", "flour"),
+            self.ingredient_index,
+            self.get_interactions_future(),
+        )
+        with self.assertRaises(ValueError):
+            dataset.ingredient_index.posting_indices[0] = 1
+        with self.assertRaises(ValueError):
+            dataset.interaction_index.counts[0] = 1
+        with self.assertRaises(ValueError):
+            dataset.season_index.months[0] = 1
+
+    def test_get_recipe_by_id(self):
+        """
+        Test that recipes are looked up by id through the id index.
+        """
+        dataset = RecipeDataset(
+            self.recipes_df,
+            ("salt", "sugar", "flour"),
+            self.ingredient_index,
+            self.get_interactions_future(),
+        )
+        self.assertEqual(dataset.get_recipe(2)["ingredient_PP"], ["flour"])
+        with self.assertRaises(KeyError):
+            dataset.get_recipe(3)
+
+        recipes = dataset.get_recipes([2, 3, 1])
+        self.assertEqual(recipes["id"].tolist(), [2, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from src.dataset_cache import DatasetCache
+
+
+class TestDatasetCache(unittest.TestCase):
+    """
+    Unit tests for the DatasetCache class.
+    """
+
+    def setUp(self):
+        """
+        Create a temporary source file and cache directory.
+        """
+        self.tmp_dir = tempfile.mkdtemp()
+        self.source = os.path.join(self.tmp_dir, "recipes.csv.zip")
+        with open(self.source, "wb") as f:
+            f.write(b"original content")
+        self.cache = DatasetCache(os.path.join(self.tmp_dir, "cache"))
+
+        self.df = pd.DataFrame({
+            "id": [1, 2],
+            "ingredient_PP": [["salt", "sugar"], ["flour"]],
+            "calories": np.array([400.5, 15.1], dtype="float32"),
+            "date": pd.to_datetime(["2023-01-01", "2023-02-01"]),
+        })
+        self.arrays = {"index": {"indptr": np.array([0, 2, 3])}}
+
+    def tearDown(self):
+        """
+        Remove the temporary files.
+        """
+        shutil.rmtree(self.tmp_dir)
+
+    def test_round_trip(self):
+        """
+        Test that frames and arrays are restored with their types.
+        """
+        self.cache.save(self.source, {"recipes": self.df}, self.arrays)
+        frames, arrays = self.cache.load(self.source)
+
+        pd.testing.assert_frame_equal(frames["recipes"], self.df)
+        self.assertIsInstance(frames["recipes"]["ingredient_PP"].iloc[0], list)
+        np.testing.assert_array_equal(arrays["index"]["indptr"], [0, 2, 3])
+
+    def test_arrays_are_memory_mapped(self):
+        """
+        Test that arrays and numeric columns are mapped read-only from disk.
+        """
+        self.cache.save(self.source, {"recipes": self.df}, self.arrays)
+        frames, arrays = self.cache.load(self.source)
+
+        indptr = arrays["index"]["indptr"]
+        self.assertIsInstance(indptr.base, np.memmap)
+        self.assertFalse(indptr.flags.writeable)
+        calories = frames["recipes"]["calories"].to_numpy()
+        self.assertFalse(calories.flags.writeable)
+        with self.assertRaises(ValueError):
+            calories[0] = 0
+
+        in_memory = DatasetCache(self.cache.cache_dir, mmap_mode=None)
+        frames, arrays = in_memory.load(self.source)
+        self.assertTrue(arrays["index"]["indptr"].flags.writeable)
+        pd.testing.assert_frame_equal(frames["recipes"], self.df)
+
+    def test_missing_entry(self):
+        """
+        Test that loading without an entry returns None.
+        """
+        self.assertIsNone(self.cache.load(self.source))
+
+    def test_invalidated_when_source_changes(self):
+        """
+        Test that a modified source file invalidates its entry.
+        """
+        self.cache.save(self.source, {"recipes": self.df})
+        with open(self.source, "wb") as f:
+            f.write(b"modified content")
+        self.assertFalse(self.cache.is_valid(self.source))
+        self.assertIsNone(self.cache.load(self.source))
+
+    def test_valid_when_source_is_touched(self):
+        """
+        Test that a new modification time with the same content keeps the entry.
+        """
+        self.cache.save(self.source, {"recipes": self.df})
+        stat = os.stat(self.source)
+        os.utime(self.source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertTrue(self.cache.is_valid(self.source))
+
+    def test_save_failure_is_ignored(self):
+        """
+        Test that a failing write leaves no entry behind.
+        """
+        self.cache.save(os.path.join(self.tmp_dir, "missing.zip"), {"recipes": self.df})
+        self.assertFalse(os.path.exists(self.cache.get_entry_dir("missing.zip")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 import pandas as pd
-from src.filter import RecipeFilter
+from src.filter import FilterCache, RecipeFilter
+from src.nutrition import NUTRITION_COLUMNS
 
 
 class TestRecipeFilter(unittest.TestCase):
@@ -51,6 +52,82 @@ class TestRecipeFilter(unittest.TestCase):
         filtered = self.recipe_filter.get_filtered_recipes()
         self.assertEqual(len(filtered), 0)
 
+    def test_filter_by_ingredients_from_previous_match(self):
+        """
+        Test that a filter can start from the match of a previous filter.
+        """
+        self.recipe_filter.filter_by_ingredients(["beef", "onion"])
+        previous_match = self.recipe_filter.ingredient_match
+        self.assertEqual(len(self.recipe_filter.get_filtered_recipes()), 0)
+
+        recipe_filter = RecipeFilter(self.sample_data)
+        recipe_filter.filter_by_ingredients(
+            ["beef", "onion", "garlic"], previous_match=previous_match
+        )
+        filtered = recipe_filter.get_filtered_recipes()
+        self.assertListEqual(filtered["name"].tolist(), ["Recipe 2"])
+        self.assertListEqual(recipe_filter.ingredient_match[1].tolist(), [1])
+
+    def test_filter_by_ingredients_after_removal(self):
+        """
+        Test that removing an ingredient from a previous match gives the same
+        result as filtering from scratch.
+        """
+        self.recipe_filter.filter_by_ingredients(
+            ["chicken", "salt", "pepper", "beef", "onion", "garlic"]
+        )
+        previous_match = self.recipe_filter.ingredient_match
+        self.assertEqual(len(self.recipe_filter.get_filtered_recipes()), 2)
+
+        fridge = ["chicken", "salt", "pepper", "beef", "onion"]
+        recipe_filter = RecipeFilter(self.sample_data)
+        recipe_filter.filter_by_ingredients(fridge, previous_match=previous_match)
+        from_scratch = RecipeFilter(self.sample_data)
+        from_scratch.filter_by_ingredients(fridge)
+
+        pd.testing.assert_frame_equal(
+            recipe_filter.get_filtered_recipes(), from_scratch.get_filtered_recipes()
+        )
+        self.assertListEqual(
+            recipe_filter.get_filtered_recipes()["name"].tolist(), ["Recipe 1"]
+        )
+
+    def test_query_key_is_canonical(self):
+        """
+        Test that queries with the same result share their cache key.
+        """
+        key = self.recipe_filter.get_query_key(["salt", "chicken"], fat_max=10)
+        self.assertEqual(
+            key,
+            self.recipe_filter.get_query_key(
+                ["chicken", "salt", "salt", "chocolate"], protein_min=0, fat_max=10
+            ),
+        )
+        self.assertNotEqual(key, self.recipe_filter.get_query_key(["chicken", "salt"]))
+        self.assertNotEqual(
+            self.recipe_filter.get_query_key([]),
+            self.recipe_filter.get_query_key(["chocolate"]),
+        )
+
+    def test_apply_query_uses_cache(self):
+        """
+        Test that repeated queries are served from the cache.
+        """
+        cache = FilterCache(maxsize=1)
+        for ingredients in (["beef", "onion", "garlic"], ["garlic", "onion", "beef"]):
+            recipe_filter = RecipeFilter(self.sample_data)
+            recipe_filter.apply_query(ingredients, protein_min=5, cache=cache)
+            filtered = recipe_filter.get_filtered_recipes()
+            self.assertListEqual(filtered["name"].tolist(), ["Recipe 2"])
+        self.assertEqual((cache.hits, cache.misses, cache.evictions), (1, 1, 0))
+
+        recipe_filter = RecipeFilter(self.sample_data)
+        recipe_filter.apply_query(["tofu"], cache=cache, cache_version="v2")
+        self.assertEqual(len(recipe_filter.get_filtered_recipes()), 0)
+        self.assertFalse(recipe_filter.selection.flags.writeable)
+        self.assertEqual(cache.get_stats()["evictions"], 1)
+        self.assertEqual(len(cache), 1)
+
     def test_filter_by_ingredients_empty_selection(self):
         """
         Test filtering by ingredients when no ingredients are selected.
@@ -104,6 +181,49 @@ class TestRecipeFilter(unittest.TestCase):
         self.assertEqual(len(filtered), 1)
         self.assertEqual(filtered.iloc[0]["name"], "Recipe 2")
 
+    def test_filter_by_nutrition_bounds(self):
+        """
+        Test filtering with min/max bounds on arbitrary nutrients.
+        """
+        self.recipe_filter.filter_by_nutrition(
+            bounds={"calories": (None, 300), "sodium": (20, 40)}
+        )
+        filtered = self.recipe_filter.get_filtered_recipes()
+        self.assertListEqual(filtered["name"].tolist(), ["Recipe 1"])
+
+    def test_filter_by_nutrition_unknown_nutrient(self):
+        """
+        Test that a bound on an unknown nutrient is rejected.
+        """
+        with self.assertRaises(ValueError):
+            self.recipe_filter.filter_by_nutrition(bounds={"fiber": (1, None)})
+
+    def test_filter_by_nutrition_typed_columns(self):
+        """
+        Test filtering a DataFrame holding typed nutrient columns.
+        """
+        nutrition = pd.DataFrame(
+            self.sample_data["nutrition"].tolist(), columns=NUTRITION_COLUMNS
+        ).astype("float32")
+        recipes = self.sample_data.drop(columns="nutrition").join(nutrition)
+        recipe_filter = RecipeFilter(recipes)
+        recipe_filter.filter_by_nutrition(protein_min=10, fat_max=15)
+        filtered = recipe_filter.get_filtered_recipes()
+        self.assertListEqual(filtered["name"].tolist(), ["Recipe 1"])
+
+    def test_recipes_are_not_copied(self):
+        """
+        Test that the filter shares the original DataFrame instead of copying it.
+        """
+        self.assertIs(self.recipe_filter.recipes_df, self.sample_data)
+        self.assertIs(self.recipe_filter.get_filtered_recipes(), self.sample_data)
+
+        self.recipe_filter.filter_by_nutrition(fat_max=10)
+        filtered = self.recipe_filter.get_filtered_recipes()
+        self.assertListEqual(self.recipe_filter.selection.tolist(), [0, 2])
+        self.assertListEqual(filtered.index.tolist(), [0, 2])
+        self.assertEqual(len(self.sample_data), 3)
+
     def test_no_recipes_left_after_filters(self):
         """
         Test when no recipes are left after applying filters.
@@ -0,0 +1,66 @@
+import os
+import subprocess
+import sys
+import unittest
+
+# Root of the repository, where "src" is importable from
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cold import budget of src.main, in seconds. About 0.9 s when written, most
+# of it in pandas and streamlit; the margin absorbs slower machines.
+IMPORT_TIME_BUDGET = 2.5
+
+# Modules that must only be loaded on first use
+DEFERRED_MODULES = (
+    "plotly.express",
+    "src.visualization.dashboard",
+    "src.visualization.charts",
+)
+
+
+def run_python(code: str, *options: str) -> subprocess.CompletedProcess:
+    """
+    Run Python code in a fresh interpreter, from the repository root.
+    """
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+class TestImportTime(unittest.TestCase):
+    """
+    Guards against regressions of the cold start of the app.
+    """
+
+    def test_heavy_modules_are_deferred(self):
+        """
+        Test that importing the app does not load the dashboard and Plotly Express.
+        """
+        result = run_python(
+            "import sys, src.main; "
+            f"print(','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+        )
+        self.assertEqual(result.stdout.strip(), "")
+
+    def test_import_time_budget(self):
+        """
+        Test that the cold import of the app stays within its budget.
+        """
+        result = run_python("import src.main", "-X", "importtime")
+        for line in result.stderr.splitlines():
+            fields = [field.strip() for field in line.split("|")]
+            if len(fields) == 3 and fields[2] == "src.main":
+                cumulative = int(fields[1]) / 1e6
+                break
+        else:
+            self.fail("src.main missing from the import time report")
+
+        self.assertLess(cumulative, IMPORT_TIME_BUDGET)
+
+
+if __name__ == "__main__":
+    unittest.main()
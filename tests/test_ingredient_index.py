@@ -0,0 +1,147 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.ingredient_index import IngredientIndex
+
+
+class TestIngredientIndex(unittest.TestCase):
+    """
+    Unit tests for the IngredientIndex class.
+    """
+
+    def setUp(self):
+        """
+        Set up sample data for testing.
+        """
+        self.ingredient_lists = pd.Series([
+            ["chicken", "salt", "pepper"],
+            ["beef", "onion", "garlic", "salt"],
+            ["tofu", "soy sauce", "ginger"],
+            ["salt", "salt"],
+        ])
+        self.index = IngredientIndex(self.ingredient_lists)
+
+    def test_vocabulary(self):
+        """
+        Test that every ingredient gets a unique, sorted integer id.
+        """
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(list(self.index.vocabulary), sorted(self.index.vocabulary))
+        self.assertEqual(len(self.index.vocabulary), 9)
+        self.assertEqual(self.index.vocabulary[self.index.ingredient_ids["salt"]], "salt")
+
+    def test_recipe_ingredients_are_sorted_and_unique(self):
+        """
+        Test the per-recipe id arrays.
+        """
+        ids = self.index.get_recipe_ingredients(3)
+        self.assertListEqual(ids.tolist(), [self.index.ingredient_ids["salt"]])
+        ids = self.index.get_recipe_ingredients(1)
+        self.assertListEqual(ids.tolist(), sorted(ids.tolist()))
+        self.assertEqual(len(ids), 4)
+
+    def test_postings(self):
+        """
+        Test the posting list of an ingredient.
+        """
+        postings = self.index.get_postings(self.index.ingredient_ids["salt"])
+        self.assertListEqual(postings.tolist(), [0, 1, 3])
+
+    def test_find_subset_recipes(self):
+        """
+        Test that only recipes fully covered by the selection are returned.
+        """
+        matches = self.index.find_subset_recipes(["chicken", "salt", "pepper", "rice"])
+        self.assertListEqual(matches.tolist(), [0, 3])
+
+    def test_find_subset_recipes_unknown_ingredients(self):
+        """
+        Test a selection made only of unknown ingredients.
+        """
+        self.assertEqual(len(self.index.find_subset_recipes(["chocolate"])), 0)
+
+    def test_find_subset_recipes_matches_set_semantics(self):
+        """
+        Test the index against the set-based definition on every selection.
+        """
+        selections = [["salt"], ["tofu", "soy sauce", "ginger"], ["beef", "onion"]]
+        for selection in selections:
+            expected = [
+                i
+                for i, ingredients in enumerate(self.ingredient_lists)
+                if set(ingredients).issubset(selection)
+            ]
+            self.assertListEqual(
+                self.index.find_subset_recipes(selection).tolist(), expected
+            )
+
+    def test_update_subset_recipes(self):
+        """
+        Test that adding and removing ingredients one at a time gives the same
+        result as filtering from scratch.
+        """
+        edits = [
+            ["salt"],
+            ["salt", "pepper"],
+            ["salt", "pepper", "chicken"],
+            ["salt", "pepper", "chicken", "chocolate"],
+            ["pepper", "chicken", "chocolate"],
+            ["pepper", "chicken", "tofu", "soy sauce", "ginger"],
+            ["tofu", "soy sauce", "ginger"],
+        ]
+        previous_ids = self.index.encode([])
+        previous_matches = self.index.find_subset_recipes([])
+        for selection in edits:
+            matches = self.index.update_subset_recipes(
+                previous_ids, previous_matches, selection
+            )
+            self.assertListEqual(
+                matches.tolist(), self.index.find_subset_recipes(selection).tolist()
+            )
+            previous_ids, previous_matches = self.index.encode(selection), matches
+
+    def test_count_matches(self):
+        """
+        Test the overlap counts computed with a matrix-vector product.
+        """
+        counts = self.index.count_matches(["salt", "pepper", "tofu", "rice"])
+        self.assertListEqual(counts.tolist(), [2, 1, 1, 1])
+
+    def test_matvec_and_rmatvec(self):
+        """
+        Test the products with the matrix and its transpose.
+        """
+        self.assertListEqual(
+            self.index.matvec(np.ones(9, dtype=int)).tolist(), [3, 4, 3, 1]
+        )
+        usage = self.index.rmatvec(np.ones(4, dtype=int))
+        self.assertEqual(usage[self.index.ingredient_ids["salt"]], 3)
+        self.assertEqual(usage.sum(), 11)
+        with self.assertRaises(ValueError):
+            self.index.matvec(np.ones(3))
+
+    def test_cooccurrence_counts(self):
+        """
+        Test the ingredients used together with another one.
+        """
+        cooccurrences = self.index.get_cooccurrence_counts("salt")
+        self.assertNotIn("salt", cooccurrences.index)
+        self.assertNotIn("tofu", cooccurrences.index)
+        self.assertEqual(cooccurrences["garlic"], 1)
+        self.assertEqual(len(cooccurrences), 5)
+        self.assertEqual(len(self.index.get_cooccurrence_counts("chocolate")), 0)
+
+    def test_array_round_trip(self):
+        """
+        Test that an index rebuilt from its arrays answers the same queries.
+        """
+        rebuilt = IngredientIndex.from_arrays(self.index.to_arrays())
+        self.assertEqual(rebuilt.vocabulary, self.index.vocabulary)
+        self.assertListEqual(
+            rebuilt.find_subset_recipes(["chicken", "salt", "pepper"]).tolist(),
+            [0, 3],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import pandas as pd
+from src.ingredient_index import IngredientIndex
+from src.ingredient_search import IngredientSearch, get_trigrams
+
+
+class TestIngredientSearch(unittest.TestCase):
+    """
+    Unit tests for the IngredientSearch class.
+    """
+
+    def setUp(self):
+        """
+        Set up sample data for testing.
+        """
+        ingredient_lists = pd.Series([
+            ["salt", "chicken breast", "pepper"],
+            ["salt", "chicken", "garlic"],
+            ["salt", "chicken", "soy sauce"],
+            ["salt", "sugar", "chickpeas"],
+        ])
+        self.search = IngredientSearch(IngredientIndex(ingredient_lists))
+
+    def test_options_are_sorted_by_frequency(self):
+        """
+        Test that the most common ingredients come first, then by name.
+        """
+        self.assertIsInstance(self.search.options, tuple)
+        self.assertEqual(self.search.options[:2], ("salt", "chicken"))
+        self.assertEqual(self.search.options[2:4], ("chicken breast", "chickpeas"))
+        self.assertEqual(len(self.search), 8)
+
+    def test_trigrams(self):
+        """
+        Test the padded trigrams of a text.
+        """
+        self.assertEqual(get_trigrams("Egg"), {"  e", " eg", "egg", "gg "})
+
+    def test_search_prefix_first(self):
+        """
+        Test that prefix matches come first, by frequency.
+        """
+        results = self.search.search("chick")
+        self.assertEqual(results[:3], ("chicken", "chicken breast", "chickpeas"))
+
+    def test_search_trigrams(self):
+        """
+        Test that a query matches inside names and with typos.
+        """
+        self.assertIn("chicken breast", self.search.search("breast"))
+        self.assertEqual(self.search.search("sause")[0], "soy sauce")
+        self.assertEqual(self.search.search("xyz"), ())
+
+    def test_search_limit(self):
+        """
+        Test that the number of options is bounded.
+        """
+        self.assertEqual(self.search.search("", limit=3), ("salt", "chicken", "chicken breast"))
+        self.assertEqual(len(self.search.search("chick", limit=2)), 2)
+
+    def test_get_options_keeps_selection(self):
+        """
+        Test that the selected ingredients are always part of the options.
+        """
+        options = self.search.get_options("sug", ["garlic", "sugar"])
+        self.assertEqual(options[:2], ["garlic", "sugar"])
+        self.assertEqual(options.count("sugar"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import os
+import tempfile
+import tracemalloc
+import unittest
+from src.instrumentation import (
+    Histogram,
+    instrument,
+    measure_stage,
+    registry,
+)
+
+
+class TestInstrumentation(unittest.TestCase):
+    """
+    Unit tests for the stage instrumentation.
+    """
+
+    def setUp(self):
+        """
+        Start every test with an empty registry.
+        """
+        registry.clear()
+
+    def tearDown(self):
+        """
+        Clear the registry and stop memory tracing.
+        """
+        registry.clear()
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def test_histogram(self):
+        """
+        Test that values land in the first bucket whose bound they do not exceed.
+        """
+        histogram = Histogram((1, 10))
+        for value in (0.5, 1, 5, 50):
+            histogram.observe(value)
+        self.assertListEqual(histogram.counts, [2, 1, 1])
+        self.assertEqual(histogram.count, 4)
+        self.assertEqual(histogram.sum, 56.5)
+
+    def test_measure_stage(self):
+        """
+        Test that a block records its duration and rows.
+        """
+        with measure_stage("test.block", rows_in=10) as stage:
+            stage.rows_out = 3
+
+        summary = registry.get_summary()
+        self.assertEqual(summary[0]["stage"], "test.block")
+        self.assertEqual(summary[0]["calls"], 1)
+        self.assertEqual(registry.histograms[("rows_in", "test.block")].sum, 10)
+        self.assertEqual(registry.histograms[("rows_out", "test.block")].sum, 3)
+        self.assertNotIn(("peak_bytes", "test.block"), registry.histograms)
+
+    def test_instrument_decorator(self):
+        """
+        Test that a decorated function is measured on every call, even if it fails.
+        """
+
+        @instrument(
+            "test.function",
+            rows_in=lambda values: len(values or []),
+            rows_out=lambda result, values: len(result),
+        )
+        def keep_even(values):
+            if values is None:
+                raise ValueError("No values")
+            return [v for v in values if v % 2 == 0]
+
+        self.assertListEqual(keep_even([1, 2, 3, 4]), [2, 4])
+        with self.assertRaises(ValueError):
+            keep_even(None)
+
+        self.assertEqual(registry.histograms[("duration_seconds", "test.function")].count, 2)
+        self.assertEqual(registry.histograms[("rows_out", "test.function")].sum, 2)
+        self.assertEqual(keep_even.__name__, "keep_even")
+
+    def test_peak_memory_of_nested_stages(self):
+        """
+        Test that the peak of an inner stage also counts for the outer one.
+        """
+        tracemalloc.start()
+        with measure_stage("test.outer"):
+            with measure_stage("test.inner"):
+                data = bytearray(4_000_000)
+            del data
+
+        inner = registry.histograms[("peak_bytes", "test.inner")].sum
+        outer = registry.histograms[("peak_bytes", "test.outer")].sum
+        self.assertGreaterEqual(inner, 4_000_000)
+        self.assertGreaterEqual(outer, inner)
+
+    def test_prometheus_export(self):
+        """
+        Test the Prometheus text exposition and the metrics file.
+        """
+        with measure_stage("test.export", rows_in=5):
+            pass
+
+        text = registry.to_prometheus()
+        self.assertIn("# TYPE mangetamain_stage_duration_seconds histogram", text)
+        self.assertIn('mangetamain_stage_rows_in_bucket{stage="test.export",le="10"} 1', text)
+        self.assertIn('mangetamain_stage_duration_seconds_count{stage="test.export"} 1', text)
+        self.assertIn('le="+Inf"', text)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "metrics.prom")
+            registry.write(path)
+            with open(path) as f:
+                self.assertEqual(f.read(), text)
+
+    def test_disabled_registry(self):
+        """
+        Test that nothing is recorded while the registry is disabled.
+        """
+        registry.enabled = False
+        try:
+            with measure_stage("test.disabled"):
+                pass
+        finally:
+            registry.enabled = True
+        self.assertEqual(registry.get_summary(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
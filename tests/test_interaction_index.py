@@ -0,0 +1,69 @@
+import unittest
+import pandas as pd
+from src.interaction_index import InteractionIndex
+
+
+class TestInteractionIndex(unittest.TestCase):
+    """
+    Unit tests for the InteractionIndex class.
+    """
+
+    def setUp(self):
+        """
+        Set up sample data for testing.
+        """
+        self.interactions_df = pd.DataFrame({
+            "recipe_id": [3, 1, 3, 1, 3, 2],
+            "date": pd.to_datetime([
+                "2023-01-05", "2023-01-01", "2023-01-04",
+                "2023-01-01", "2023-01-05", "2023-01-03",
+            ]),
+        })
+        self.index = InteractionIndex(self.interactions_df)
+
+    def test_daily_counts(self):
+        """
+        Test the per-day counts of a recipe, sorted by date.
+        """
+        counts = self.index.get_daily_counts(3)
+        self.assertListEqual(
+            counts["date"].dt.strftime("%Y-%m-%d").tolist(),
+            ["2023-01-04", "2023-01-05"],
+        )
+        self.assertListEqual(counts["Interactions"].tolist(), [1, 2])
+
+    def test_matches_groupby(self):
+        """
+        Test the index against a scan of the interactions.
+        """
+        for recipe_id in [1, 2, 3]:
+            expected = (
+                self.interactions_df[self.interactions_df["recipe_id"] == recipe_id]
+                .groupby("date")
+                .size()
+                .reset_index(name="Interactions")
+            )
+            pd.testing.assert_frame_equal(
+                self.index.get_daily_counts(recipe_id), expected
+            )
+
+    def test_unknown_recipe(self):
+        """
+        Test that a recipe without interactions gets an empty frame.
+        """
+        self.assertTrue(self.index.get_daily_counts(42).empty)
+        self.assertTrue(self.index.get_daily_counts(0).empty)
+
+    def test_array_round_trip(self):
+        """
+        Test that an index rebuilt from its arrays gives the same counts.
+        """
+        rebuilt = InteractionIndex.from_arrays(self.index.to_arrays())
+        self.assertEqual(len(rebuilt), 3)
+        pd.testing.assert_frame_equal(
+            rebuilt.get_daily_counts(1), self.index.get_daily_counts(1)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
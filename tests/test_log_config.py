@@ -2,7 +2,15 @@ import unittest
 from unittest.mock import patch, MagicMock
 import logging
 import os
-from src.log_config import setup_logging, MaxLevelFilter
+import queue
+import tempfile
+from src.log_config import (
+    setup_logging,
+    stop_logging,
+    get_dropped_count,
+    BoundedQueueHandler,
+    MaxLevelFilter,
+)
 
 
 class TestLogConfig(unittest.TestCase):
@@ -81,3 +89,50 @@ class TestLogConfig(unittest.TestCase):
         self.assertTrue(log_filter.filter(record_info))
         self.assertTrue(log_filter.filter(record_warning))
         self.assertFalse(log_filter.filter(record_error))
+
+    @patch("os.path.exists", return_value=True)
+    def test_setup_logging_queue_mode(self, mock_exists):
+        """
+        Test that the queue mode writes the same debug/error split at shutdown.
+        """
+        file_handler = logging.FileHandler
+        with tempfile.TemporaryDirectory() as log_directory:
+            with patch(
+                "logging.FileHandler",
+                side_effect=lambda path, mode: file_handler(
+                    os.path.join(log_directory, os.path.basename(path)), mode=mode
+                ),
+            ):
+                setup_logging(use_queue=True)
+
+            root_logger = logging.getLogger()
+            self.assertEqual(len(root_logger.handlers), 1)
+            self.assertIsInstance(root_logger.handlers[0], BoundedQueueHandler)
+
+            test_logger = logging.getLogger("test_queue")
+            test_logger.info("Info %d", 1)
+            test_logger.error("Error %d", 2)
+            stop_logging()
+
+            self.assertEqual(root_logger.handlers, [])
+            with open(os.path.join(log_directory, "app_debug.log")) as f:
+                debug_log = f.read()
+            with open(os.path.join(log_directory, "app_error.log")) as f:
+                error_log = f.read()
+            self.assertIn("Info 1", debug_log)
+            self.assertNotIn("Error 2", debug_log)
+            self.assertIn("Error 2", error_log)
+            self.assertNotIn("Info 1", error_log)
+        logging.getLogger().setLevel(logging.WARNING)
+
+    def test_bounded_queue_handler_drops_when_full(self):
+        """
+        Test that records are dropped and counted when the queue is full.
+        """
+        handler = BoundedQueueHandler(queue.Queue(maxsize=1), error_timeout=0.01)
+        for level in (logging.INFO, logging.INFO, logging.ERROR):
+            handler.handle(logging.LogRecord("test", level, __file__, 0, "msg", None, None))
+
+        self.assertEqual(handler.queue.qsize(), 1)
+        self.assertEqual(handler.dropped, 2)
+        self.assertEqual(get_dropped_count(), 0)  # The queue mode is not running
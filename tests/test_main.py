@@ -0,0 +1,118 @@
+import os
+import tracemalloc
+import unittest
+from unittest.mock import patch, MagicMock
+import pandas as pd
+from src.filter import filter_cache
+from src.ingredient_index import IngredientIndex
+from src.instrumentation import TRACE_MEMORY_VARIABLE, registry
+from src.main import RecipeApp
+from src.session_keys import CLICKED_RECIPE_KEY
+
+
+class TestRecipeApp(unittest.TestCase):
+    """
+    Unit tests for the RecipeApp class.
+    """
+
+    def setUp(self):
+        """
+        Set up an app over a small shared dataset.
+        """
+        recipes_df = pd.DataFrame({
+            "id": [1, 2],
+            "ingredient_PP": [["salt", "sugar"], ["flour"]],
+        })
+        self.dataset = MagicMock(
+            recipes_df=recipes_df,
+            ingredient_index=IngredientIndex(recipes_df["ingredient_PP"]),
+            version="v1",
+        )
+        with patch.dict(os.environ, {TRACE_MEMORY_VARIABLE: ""}):
+            self.app = self.create_app()
+        self.user_inputs = {
+            "selected_ingredients": ["salt", "sugar"],
+            "protein_min": 0,
+            "carbs_min": 0,
+            "fat_max": 150,
+            "start_search": True,
+            "reset_clicked": False,
+            "recipe_clicked": False,
+        }
+        registry.clear()
+        filter_cache.clear()
+
+    def create_app(self):
+        """
+        Create an app over the sample dataset, without logging to files.
+        """
+        with patch("src.main.setup_logging"), patch(
+            "src.main.export_metrics_at_exit"
+        ), patch("src.main.get_dataset", return_value=self.dataset):
+            return RecipeApp()
+
+    def tearDown(self):
+        """
+        Stop the memory tracing and clear the metrics and filter results.
+        """
+        tracemalloc.stop()
+        registry.clear()
+        filter_cache.clear()
+
+    @patch("src.main.RecipeApp.display_results")
+    @patch("src.main.get_sidebar_configurations")
+    @patch("streamlit.session_state", new_callable=dict)
+    @patch("streamlit.query_params", {})
+    def test_opt_in_records_peak_memory(
+        self, mock_session_state, mock_sidebar, mock_display
+    ):
+        """
+        Test that the server opt-in measures the stage memory.
+        """
+        with patch.dict(os.environ, {TRACE_MEMORY_VARIABLE: "1"}):
+            app = self.create_app()
+        mock_sidebar.return_value = self.user_inputs
+        app.run()
+
+        self.assertTrue(tracemalloc.is_tracing())
+        self.assertIn(("peak_bytes", "filter.by_ingredients"), registry.histograms)
+        self.assertEqual(len(app.filtered_recipes), 1)
+
+    @patch("src.main.RecipeApp.display_results")
+    @patch("src.main.render_metrics_panel")
+    @patch("src.main.get_sidebar_configurations")
+    @patch("streamlit.session_state", new_callable=dict)
+    @patch("streamlit.query_params", {"debug": "1"})
+    def test_debug_does_not_trace_memory(
+        self, mock_session_state, mock_sidebar, mock_panel, mock_display
+    ):
+        """
+        Test that ?debug=1 shows the metrics without tracing the memory.
+        """
+        mock_sidebar.return_value = self.user_inputs
+        self.app.run()
+
+        mock_panel.assert_called_once()
+        self.assertFalse(tracemalloc.is_tracing())
+        stage = "filter.by_ingredients"
+        self.assertIn(("duration_seconds", stage), registry.histograms)
+        self.assertNotIn(("peak_bytes", stage), registry.histograms)
+
+    @patch("streamlit.session_state", new_callable=dict)
+    def test_click_on_unknown_recipe_is_ignored(self, mock_session_state):
+        """
+        Test that a click on a recipe that no longer exists is dropped.
+        """
+        self.app.dataset.get_recipe.side_effect = KeyError("Unknown recipe id: 3")
+        mock_session_state[CLICKED_RECIPE_KEY] = 3
+        self.user_inputs["start_search"] = False
+
+        self.app.check_recipe_buttons_in_main(self.user_inputs)
+
+        self.assertNotIn(CLICKED_RECIPE_KEY, mock_session_state)
+        self.assertNotIn("filtered_recipes", mock_session_state)
+        self.assertFalse(self.user_inputs["start_search"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,13 @@
+import ast
+import os
 import unittest
-from src.metrics import calculate_mtm_score
+import numpy as np
+import pandas as pd
+from src.metrics import calculate_mtm_score, calculate_mtm_scores
+from src.nutrition import NUTRITION_COLUMNS, parse_nutrition
+
+RECIPES_FILE = "dataset/PP_recipes_final.csv.zip"
+
 
 class TestCalculateMTMScore(unittest.TestCase):
     """
@@ -10,7 +18,8 @@ class TestCalculateMTMScore(unittest.TestCase):
         """
         Test with valid nutrition values that yield a high MTM score.
         """
-        nutrition = [400, 20, 10, 3, 15, 5, 50]  # [calories, fat, sugar, sodium, protein, saturated_fat, carbs]
+        # [calories, fat, sugar, sodium, protein, saturated_fat, carbs]
+        nutrition = [400, 20, 10, 3, 15, 5, 50]
         score = calculate_mtm_score(nutrition)
         self.assertEqual(score, 100)  # Expect maximum score
 
@@ -18,7 +27,8 @@ class TestCalculateMTMScore(unittest.TestCase):
         """
         Test with valid nutrition values that yield a low MTM score.
         """
-        nutrition = [2000, 50, 50, 10, 5, 20, 20]  # [calories, fat, sugar, sodium, protein, saturated_fat, carbs]
+        # [calories, fat, sugar, sodium, protein, saturated_fat, carbs]
+        nutrition = [2000, 50, 50, 10, 5, 20, 20]
         score = calculate_mtm_score(nutrition)
         self.assertEqual(score, 0)  # Expect minimum score
 
@@ -52,7 +62,8 @@ class TestCalculateMTMScore(unittest.TestCase):
         """
         nutrition = [1501, 20, 10, 3, 15, 5, 50]  # Above the upper threshold
         score = calculate_mtm_score(nutrition)
-        self.assertGreater(score, 0)  # Still expect a positive score, but with a penalty
+        # Still expect a positive score, but with a penalty
+        self.assertGreater(score, 0)
 
     def test_balanced_nutrition_bonus(self):
         """
@@ -60,13 +71,15 @@ class TestCalculateMTMScore(unittest.TestCase):
         """
         nutrition = [400, 20, 10, 3, 15, 5, 50]  # Balanced fat and protein
         score = calculate_mtm_score(nutrition)
-        self.assertGreaterEqual(score, 70)  # Expect a boosted score due to balance bonus
+        # Expect a boosted score due to balance bonus
+        self.assertGreaterEqual(score, 70)
 
     def test_negative_factors(self):
         """
         Test with high values for negative factors to check for penalties.
         """
-        nutrition = [400, 40, 50, 6, 5, 20, 30]  # High fat, sugar, sodium, and saturated fat
+        # High fat, sugar, sodium, and saturated fat
+        nutrition = [400, 40, 50, 6, 5, 20, 30]
         score = calculate_mtm_score(nutrition)
         self.assertLess(score, 50)  # Expect penalties to lower the score
 
@@ -86,5 +99,81 @@ class TestCalculateMTMScore(unittest.TestCase):
         score = calculate_mtm_score(nutrition)
         self.assertEqual(score, 0)  # Score should be floored at 0
 
+
+class TestCalculateMTMScores(unittest.TestCase):
+    """
+    Unit tests for the batch calculate_mtm_scores function.
+    """
+
+    def assert_parity(self, values):
+        """
+        Check the batch scores against the scalar function row by row.
+        """
+        batch_scores = calculate_mtm_scores(values)
+        scalar_scores = [
+            calculate_mtm_score(row) if not np.isnan(row).any() else 0.0
+            for row in np.asarray(values, dtype=np.float64).tolist()
+        ]
+        np.testing.assert_array_equal(batch_scores, scalar_scores)
+
+    def test_known_values(self):
+        """
+        Test the batch scores of the scalar test cases.
+        """
+        values = np.array([
+            [400, 20, 10, 3, 15, 5, 50],
+            [2000, 50, 50, 10, 5, 20, 20],
+            [1501, 20, 10, 3, 15, 5, 50],
+        ])
+        np.testing.assert_array_equal(calculate_mtm_scores(values), [100, 0, 35])
+
+    def test_dataframe_input(self):
+        """
+        Test that a DataFrame of nutrient columns is accepted.
+        """
+        df = pd.DataFrame([[400, 20, 10, 3, 15, 5, 50]], columns=NUTRITION_COLUMNS)
+        np.testing.assert_array_equal(calculate_mtm_scores(df), [100])
+
+    def test_invalid_rows(self):
+        """
+        Test that rows with missing values score 0.
+        """
+        values = np.array([[400, 20, 10, 3, 15, 5, np.nan]])
+        np.testing.assert_array_equal(calculate_mtm_scores(values), [0.0])
+
+    def test_invalid_shape(self):
+        """
+        Test that an input without seven values per recipe is rejected.
+        """
+        with self.assertRaises(ValueError):
+            calculate_mtm_scores(np.array([[400, 20, 10]]))
+
+    def test_parity_on_thresholds(self):
+        """
+        Test parity with the scalar function around every rule threshold.
+        """
+        rng = np.random.default_rng(0)
+        thresholds = np.array([0, 5, 8, 10, 15, 20, 25, 35, 200, 900, 1500])
+        values = rng.choice(thresholds, size=(5000, 7)).astype(np.float64)
+        values += rng.choice([-0.1, 0, 0.1], size=values.shape)
+        values[:, 0] = rng.uniform(1, 2000, size=len(values))
+        values[:, 6] = values[:, 0] / 4 * rng.choice([0.35, 0.65, 0.75], len(values))
+        self.assert_parity(values)
+
+    @unittest.skipUnless(os.path.exists(RECIPES_FILE), "Recipes dataset not found.")
+    def test_parity_on_dataset(self):
+        """
+        Test parity with the original list-based path over the real recipes
+        dataset: each row parsed by ast.literal_eval and scored one at a time.
+        """
+        raw = pd.read_csv(RECIPES_FILE, usecols=["nutrition"])
+        nutrition = parse_nutrition(raw["nutrition"], dtype="float64")
+        scalar_scores = [
+            calculate_mtm_score([float(x) for x in ast.literal_eval(s)])
+            for s in raw["nutrition"]
+        ]
+        np.testing.assert_array_equal(calculate_mtm_scores(nutrition), scalar_scores)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.nutrition import (
+    NUTRITION_COLUMNS,
+    parse_nutrition,
+    get_nutrition,
+    get_nutrition_lists,
+    get_nutrition_matrix,
+)
+
+
+class TestNutrition(unittest.TestCase):
+    """
+    Unit tests for the nutrition parsing helpers.
+    """
+
+    def setUp(self):
+        """
+        Set up sample data for testing.
+        """
+        self.raw_nutrition = pd.Series([
+            "[51.5, 0.0, 13.0, 0.0, 2.0, 0.0, 4.0]",
+            "[400.0, 20.0, 10.0, 3.0, 15.1, 5.0, 50.0]",
+            "[1.0, 2.0, 3.0]",
+            np.nan,
+        ])
+
+    def test_parse_nutrition_columns(self):
+        """
+        Test that the raw strings are expanded into typed nutrient columns.
+        """
+        parsed = parse_nutrition(self.raw_nutrition)
+        self.assertListEqual(list(parsed.columns), NUTRITION_COLUMNS)
+        self.assertTrue((parsed.dtypes == "float32").all())
+        self.assertEqual(parsed.iloc[0]["calories"], np.float32(51.5))
+        self.assertEqual(parsed.iloc[1]["protein"], np.float32(15.1))
+
+    def test_parse_nutrition_invalid_rows(self):
+        """
+        Test that short and missing values produce NaN.
+        """
+        parsed = parse_nutrition(self.raw_nutrition)
+        self.assertEqual(parsed.iloc[2]["sugar"], 3.0)
+        self.assertTrue(np.isnan(parsed.iloc[2]["carbs"]))
+        self.assertTrue(parsed.iloc[3].isna().all())
+
+    def test_get_nutrition(self):
+        """
+        Test the single recipe accessor with both storage formats.
+        """
+        parsed = parse_nutrition(self.raw_nutrition)
+        self.assertEqual(
+            get_nutrition(parsed.iloc[1]), [400.0, 20.0, 10.0, 3.0, 15.1, 5.0, 50.0]
+        )
+        legacy = pd.Series({"nutrition": [1, 2, 3, 4, 5, 6, 7]})
+        self.assertEqual(get_nutrition(legacy), [1, 2, 3, 4, 5, 6, 7])
+
+    def test_get_nutrition_lists(self):
+        """
+        Test the DataFrame accessor returns lists and None for invalid rows.
+        """
+        lists = get_nutrition_lists(parse_nutrition(self.raw_nutrition))
+        self.assertEqual(lists.iloc[0], [51.5, 0.0, 13.0, 0.0, 2.0, 0.0, 4.0])
+        self.assertIsNone(lists.iloc[2])
+        self.assertIsNone(lists.iloc[3])
+
+    def test_get_nutrition_matrix_legacy(self):
+        """
+        Test the matrix accessor pads legacy lists with NaN.
+        """
+        legacy = pd.DataFrame({"nutrition": [[1, 2, 3, 4, 5, 6, 7], [1, 2], None]})
+        matrix = get_nutrition_matrix(legacy)
+        self.assertEqual(matrix.shape, (3, 7))
+        self.assertListEqual(matrix[0].tolist(), [1, 2, 3, 4, 5, 6, 7])
+        self.assertEqual(matrix[1, 1], 2)
+        self.assertTrue(np.isnan(matrix[1, 2:]).all())
+        self.assertTrue(np.isnan(matrix[2]).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import datetime
+import unittest
+import numpy as np
+import pandas as pd
+from src.seasonality import SeasonIndex, get_month_position, get_season_mask
+
+
+class TestSeasonality(unittest.TestCase):
+    """
+    Unit tests for the seasonal selection of recipes.
+    """
+
+    def setUp(self):
+        """
+        Set up sample data for testing.
+        """
+        self.avg_dates = pd.Series([1.5, 6.0, 11.2, np.nan, 0.1, 3.0])
+        self.index = SeasonIndex(self.avg_dates)
+
+    def test_month_position(self):
+        """
+        Test the conversion of dates to fractional months.
+        """
+        self.assertAlmostEqual(get_month_position(datetime.date(2024, 1, 15)), 0.5)
+        self.assertAlmostEqual(get_month_position(datetime.date(2024, 7, 3)), 6.1)
+        self.assertLess(get_month_position(datetime.date(2024, 12, 31)), 12)
+
+    def test_missing_dates_are_not_indexed(self):
+        """
+        Test that recipes without an average date are left out.
+        """
+        self.assertEqual(len(self.index), 5)
+
+    def test_in_season(self):
+        """
+        Test a window within the year.
+        """
+        self.assertListEqual(self.index.get_in_season(2.0).tolist(), [0, 5])
+        self.assertListEqual(self.index.get_in_season(6.0, width=0.5).tolist(), [1])
+
+    def test_in_season_wraps_around_the_year(self):
+        """
+        Test windows overlapping December and January.
+        """
+        self.assertListEqual(self.index.get_in_season(0.2).tolist(), [0, 2, 4])
+        self.assertListEqual(self.index.get_in_season(11.8).tolist(), [2, 4])
+
+    def test_mask_matches_index(self):
+        """
+        Test that the mask and the index select the same recipes.
+        """
+        rng = np.random.default_rng(0)
+        months = rng.uniform(0, 12, 500)
+        index = SeasonIndex(pd.Series(months))
+        for month in np.linspace(0, 12, 25):
+            expected = np.flatnonzero(get_season_mask(months, month))
+            self.assertListEqual(index.get_in_season(month).tolist(), expected.tolist())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import pandas as pd
+from src.ingredient_index import IngredientIndex
+from src.suggestions import SuggestionEngine
+
+
+class TestSuggestionEngine(unittest.TestCase):
+    """
+    Unit tests for the SuggestionEngine class.
+    """
+
+    def setUp(self):
+        """
+        Set up sample data for testing.
+        """
+        self.recipes_df = pd.DataFrame({
+            "id": [1, 2, 3, 4, 5],
+            "name": ["Recipe A", "Recipe B", "Recipe C", "Recipe D", "Recipe E"],
+            "ingredient_PP": [
+                ["chicken", "salt", "pepper"],
+                ["chicken", "salt", "pepper", "rice"],
+                ["chicken", "salt", "pepper", "lemon"],
+                ["tofu", "soy sauce", "ginger"],
+                ["beef", "salt"],
+            ],
+            "mtm_score": [40, 60, 90, 100, 10],
+        })
+        self.engine = SuggestionEngine(
+            self.recipes_df, IngredientIndex(self.recipes_df["ingredient_PP"])
+        )
+
+    def test_score(self):
+        """
+        Test the overlap scores of the candidate recipes.
+        """
+        positions, matched, missing, jaccard = self.engine.score(["chicken", "salt"])
+        self.assertListEqual(positions.tolist(), [0, 1, 2, 4])
+        self.assertListEqual(matched.tolist(), [2, 2, 2, 1])
+        self.assertListEqual(missing.tolist(), [1, 2, 2, 1])
+        self.assertAlmostEqual(jaccard[0], 2 / 3)
+        self.assertAlmostEqual(jaccard[3], 1 / 3)
+
+    def test_suggest_ranking(self):
+        """
+        Test that recipes are ranked by Jaccard, then by MTM score.
+        """
+        suggestions = self.engine.suggest(["chicken", "salt", "pepper"], k=3)
+        self.assertListEqual(
+            suggestions["name"].tolist(), ["Recipe A", "Recipe C", "Recipe B"]
+        )
+        self.assertListEqual(suggestions["matched_count"].tolist(), [3, 3, 3])
+        self.assertListEqual(suggestions["missing_count"].tolist(), [0, 1, 1])
+
+    def test_suggest_partial_matches(self):
+        """
+        Test that recipes sharing only part of the selection are suggested.
+        """
+        suggestions = self.engine.suggest(["chicken", "salt", "garlic"], k=5)
+        self.assertEqual(len(suggestions), 4)
+        self.assertNotIn("Recipe D", suggestions["name"].tolist())
+
+    def test_suggest_unknown_ingredients(self):
+        """
+        Test that the best MTM scores are returned without known ingredients.
+        """
+        suggestions = self.engine.suggest(["chocolate"], k=2)
+        self.assertListEqual(suggestions["name"].tolist(), ["Recipe D", "Recipe C"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,9 @@
+import json
 import unittest
 import pandas as pd
 from plotly.graph_objects import Figure
-from src.visualization.charts import ChartFactory
+from unittest.mock import MagicMock, patch
+from src.visualization.charts import ChartFactory, FigureCache
 
 
 class TestChartFactory(unittest.TestCase):
@@ -71,6 +73,28 @@ class TestChartFactory(unittest.TestCase):
         self.assertEqual(chart.data[0].type, "scatter")
         self.assertEqual(chart.data[0].mode, "lines")
 
+    def test_pie_chart_matches_express(self):
+        """
+        Test that the graph_objects pie chart is identical to the express one.
+        """
+        values = [40, 30, 40]
+        chart = ChartFactory.pie_chart(self.sample_labels, values, self.sample_title)
+        express_chart = ChartFactory.pie_chart(
+            self.sample_labels, values, self.sample_title, use_express=True
+        )
+        self.assertEqual(json.loads(chart.to_json()), json.loads(express_chart.to_json()))
+
+    def test_popularity_chart_matches_express(self):
+        """
+        Test that the graph_objects line chart is identical to the express one.
+        """
+        data = self.sample_data.assign(Date=pd.to_datetime(self.sample_data["Date"]))
+        chart = ChartFactory.popularity_chart(data, "Date", "Interactions")
+        express_chart = ChartFactory.popularity_chart(
+            data, "Date", "Interactions", use_express=True
+        )
+        self.assertEqual(json.loads(chart.to_json()), json.loads(express_chart.to_json()))
+
     def test_score_display(self):
         """
         Test the score_display method.
@@ -99,5 +123,70 @@ class TestChartFactory(unittest.TestCase):
         self.assertIn("green", chart.layout.annotations[0].text)
 
 
+class TestFigureCache(unittest.TestCase):
+    """
+    Unit tests for the FigureCache class.
+    """
+
+    def setUp(self):
+        """
+        Set up a small cache for testing.
+        """
+        self.cache = FigureCache(maxsize=2)
+        self.build = MagicMock(
+            side_effect=lambda: ChartFactory.score_display(75, [400, 20, 10, 3, 15, 5, 50])
+        )
+
+    def test_hit_does_not_rebuild(self):
+        """
+        Test that a cached figure is returned without calling the builder.
+        """
+        first = self.cache.get_figure(("score", 1, "v1"), self.build)
+        second = self.cache.get_figure(("score", 1, "v1"), self.build)
+
+        self.build.assert_called_once()
+        self.assertIsInstance(second, Figure)
+        self.assertIs(first, second)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_hit_does_not_serialize(self):
+        """
+        Test that a hit neither rebuilds nor serializes the figure.
+        """
+        build = MagicMock(
+            side_effect=lambda: ChartFactory.pie_chart(
+                ["Fat", "Protein"], [10, 20], "Pie"
+            )
+        )
+        with patch.object(Figure, "to_json") as mock_to_json:
+            first = self.cache.get_figure(("pie", 1, "v1"), build)
+            second = self.cache.get_figure(("pie", 1, "v1"), build)
+
+        build.assert_called_once()
+        mock_to_json.assert_not_called()
+        self.assertIs(first, second)
+
+    def test_data_version_is_part_of_the_key(self):
+        """
+        Test that a new data version rebuilds the figure.
+        """
+        self.cache.get_figure(("score", 1, "v1"), self.build)
+        self.cache.get_figure(("score", 1, "v2"), self.build)
+        self.assertEqual(self.build.call_count, 2)
+
+    def test_least_recently_used_is_evicted(self):
+        """
+        Test that the cache stays bounded and evicts the oldest figure.
+        """
+        self.cache.get_figure(("score", 1, "v1"), self.build)
+        self.cache.get_figure(("score", 2, "v1"), self.build)
+        self.cache.get_figure(("score", 1, "v1"), self.build)
+        self.cache.get_figure(("score", 3, "v1"), self.build)
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertIn(("score", 1, "v1"), self.cache.figures)
+        self.assertNotIn(("score", 2, "v1"), self.cache.figures)
+
+
 if __name__ == "__main__":
     unittest.main()
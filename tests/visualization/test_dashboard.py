@@ -1,8 +1,12 @@
+import threading
 import unittest
+from concurrent.futures import Future
 from unittest.mock import patch, MagicMock
 import pandas as pd
 import streamlit as st
-from src.visualization.dashboard import RecipeVisualizer
+from src.interaction_index import InteractionIndex
+from src.session_keys import CLICKED_RECIPE_KEY
+from src.visualization.dashboard import RecipeVisualizer, select_recipe
 
 
 class TestRecipeVisualizer(unittest.TestCase):
@@ -65,11 +69,20 @@ class TestRecipeVisualizer(unittest.TestCase):
             # Check if individual recipes were displayed
             self.assertTrue(mock_write.called)
 
+    def test_select_recipe(self):
+        """
+        Test that the suggestion button callback stores the clicked recipe id.
+        """
+        with patch("streamlit.session_state", {}) as session_state:
+            select_recipe(2)
+            self.assertEqual(session_state[CLICKED_RECIPE_KEY], 2)
+
+    @patch("src.visualization.dashboard.get_month_position", return_value=3.75)
     @patch("streamlit.columns")
     @patch("streamlit.session_state", {})
     @patch("streamlit.button")
     @patch("streamlit.markdown")
-    def test_render_navigation(self, mock_markdown, mock_button, mock_columns):
+    def test_render_navigation(self, mock_markdown, mock_button, mock_columns, mock_month):
         """
         Test the render_navigation method.
         """
@@ -88,6 +101,25 @@ class TestRecipeVisualizer(unittest.TestCase):
         current_recipe = self.visualizer.render_navigation(self.recipes_df)
         self.assertEqual(current_recipe["name"], "Recipe B")
 
+    @patch("src.visualization.dashboard.get_month_position", return_value=0.2)
+    @patch("streamlit.columns")
+    @patch("streamlit.session_state", {})
+    @patch("streamlit.button")
+    @patch("streamlit.markdown")
+    def test_render_navigation_in_season(self, mock_markdown, mock_button, mock_columns, mock_month):
+        """
+        Test that only the recipes in season are browsed, across the new year.
+        """
+        mock_columns.return_value = [MagicMock(), MagicMock(), MagicMock()]
+
+        for recipes_df in (self.recipes_df, self.recipes_df.take([0, 1, 2])):
+            st.session_state["current_recipe_index"] = 0
+            self.assertEqual(self.visualizer.render_navigation(recipes_df)["name"], "Recipe A")
+            st.session_state["current_recipe_index"] = 1
+            self.assertEqual(self.visualizer.render_navigation(recipes_df)["name"], "Recipe C")
+            st.session_state["current_recipe_index"] = 2
+            self.assertEqual(self.visualizer.render_navigation(recipes_df)["name"], "Recipe A")
+
     @patch("streamlit.plotly_chart")
     def test_render_pie_chart(self, mock_plotly_chart):
         """
@@ -110,6 +142,39 @@ class TestRecipeVisualizer(unittest.TestCase):
         # Assert that plotly_chart was called once
         mock_plotly_chart.assert_called_once()
 
+    @patch("streamlit.spinner")
+    @patch("streamlit.plotly_chart")
+    def test_render_popularity_chart_pending_interactions(self, mock_plotly_chart, mock_spinner):
+        """
+        Test that the popularity chart waits for interactions loading in the background.
+        """
+        pending = Future()
+        visualizer = RecipeVisualizer(self.recipes_df, None, pending_interactions=pending)
+        interactions_df = self.interactions_df.assign(date=pd.to_datetime(self.interactions_df["date"]))
+        timer = threading.Timer(0.05, pending.set_result, [(interactions_df, InteractionIndex(interactions_df))])
+        timer.start()
+
+        visualizer.render_popularity_chart(self.recipes_df.iloc[0])
+
+        mock_spinner.assert_called_once()
+        mock_plotly_chart.assert_called_once()
+        self.assertIs(visualizer.interactions_df, interactions_df)
+
+    @patch("streamlit.info")
+    @patch("streamlit.plotly_chart")
+    def test_render_popularity_chart_failed_interactions(self, mock_plotly_chart, mock_info):
+        """
+        Test that a placeholder is shown when the interactions failed to load.
+        """
+        pending = Future()
+        pending.set_exception(OSError("Missing file"))
+        visualizer = RecipeVisualizer(self.recipes_df, None, pending_interactions=pending)
+
+        visualizer.render_popularity_chart(self.recipes_df.iloc[0])
+
+        mock_info.assert_called_once()
+        mock_plotly_chart.assert_not_called()
+
     @patch("streamlit.plotly_chart")
     def test_render_score_chart(self, mock_plotly_chart):
         """